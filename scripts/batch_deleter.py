@@ -5,6 +5,7 @@ This script performs batch deletion using ID ranges for massive datasets.
 """
 
 import mysql.connector
+import mysql.connector.pooling
 import json
 import logging
 import time
@@ -13,16 +14,257 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import signal
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+try:
+    import orjson  # Optional C-accelerated JSON decoder
+except ImportError:
+    orjson = None
+
+# Retention periods (years) for each deletion category
+READING_RETENTION_YEARS = 2
+ACCOUNT_RETENTION_YEARS = 7
+
+# Connections shared by the main deleter and its table workers
+POOL_SIZE = 8
+
+# Non-billing readings in an ID range
+READING_DELETE_SQL = """
+    DELETE r FROM reading r
+    LEFT JOIN sm_usage su ON r.guid = su.guid
+    WHERE r.reading_id BETWEEN %s AND %s
+    AND r.reading_id <= %s
+    AND su.sm_usage_id IS NULL
+    AND r.date_imported < %s
+"""
+
+# Account-related deletes, keyed by table name
+ACCOUNT_DELETE_SQL = {
+    # Delete email attachments for inactive accounts
+    'email_attachment': """
+        DELETE ea FROM email_attachment ea
+        JOIN email e ON ea.email_id = e.email_id
+        JOIN tenant t ON t.contact_id = e.object_id
+        LEFT JOIN invoice inv ON inv.object_id = t.contact_id
+            AND inv.object_type_id = 1
+            AND inv.invoice_date >= %s
+        WHERE e.object_id BETWEEN %s AND %s
+        AND e.object_id <= %s
+        AND e.object_type_id = 1
+        AND t.to_date IS NOT NULL 
+        AND t.to_date < %s
+        AND inv.invoice_id IS NULL
+    """,
+    # Delete emails for inactive accounts
+    'email': """
+        DELETE e FROM email e
+        JOIN tenant t ON t.contact_id = e.object_id
+        LEFT JOIN invoice inv ON inv.object_id = t.contact_id
+            AND inv.object_type_id = 1
+            AND inv.invoice_date >= %s
+        WHERE e.object_id BETWEEN %s AND %s
+        AND e.object_id <= %s
+        AND e.object_type_id = 1
+        AND t.to_date IS NOT NULL 
+        AND t.to_date < %s
+        AND inv.invoice_id IS NULL
+    """,
+    # Delete invoice details for inactive accounts
+    'invoice_detail': """
+        DELETE id FROM invoice_detail id
+        JOIN invoice i ON id.invoice_id = i.invoice_id
+        JOIN tenant t ON t.contact_id = i.object_id
+        LEFT JOIN invoice i2 ON i2.object_id = t.contact_id
+            AND i2.object_type_id = 1
+            AND i2.invoice_date >= %s
+        WHERE i.object_id BETWEEN %s AND %s
+        AND i.object_id <= %s
+        AND i.object_type_id = 1
+        AND t.to_date IS NOT NULL 
+        AND t.to_date < %s
+        AND i2.invoice_id IS NULL
+    """,
+    # Delete invoices for inactive accounts
+    'invoice': """
+        DELETE i FROM invoice i
+        JOIN tenant t ON t.contact_id = i.object_id
+        LEFT JOIN invoice i2 ON i2.object_id = t.contact_id
+            AND i2.object_type_id = 1
+            AND i2.invoice_date >= %s
+        WHERE i.object_id BETWEEN %s AND %s
+        AND i.object_id <= %s
+        AND i.object_type_id = 1
+        AND t.to_date IS NOT NULL 
+        AND t.to_date < %s
+        AND i2.invoice_id IS NULL
+    """,
+    # Delete addresses for inactive accounts
+    'address': """
+        DELETE a FROM address a
+        JOIN tenant t ON t.contact_id = a.object_id
+        LEFT JOIN invoice inv ON inv.object_id = t.contact_id
+            AND inv.object_type_id = 1
+            AND inv.invoice_date >= %s
+        WHERE a.object_id BETWEEN %s AND %s
+        AND a.object_id <= %s
+        AND a.object_type_id = %s
+        AND t.to_date IS NOT NULL 
+        AND t.to_date < %s
+        AND inv.invoice_id IS NULL
+    """,
+    # Delete phone records for inactive accounts
+    'phone': """
+        DELETE p FROM phone p
+        JOIN tenant t ON t.contact_id = p.object_id
+        LEFT JOIN invoice inv ON inv.object_id = t.contact_id
+            AND inv.object_type_id = 1
+            AND inv.invoice_date >= %s
+        WHERE p.object_id BETWEEN %s AND %s
+        AND p.object_id <= %s
+        AND p.object_type_id = %s
+        AND t.to_date IS NOT NULL 
+        AND t.to_date < %s
+        AND inv.invoice_id IS NULL
+    """,
+    # Delete tenant records for inactive accounts
+    'tenant': """
+        DELETE t FROM tenant t
+        WHERE t.contact_id BETWEEN %s AND %s
+        AND t.contact_id <= %s
+        AND t.to_date IS NOT NULL 
+        AND t.to_date < %s
+        AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = t.contact_id AND i.object_type_id = 1 AND i.invoice_date >= %s)
+    """,
+    # Delete contact records (final step for accounts)
+    'contact': """
+        DELETE c FROM contact c
+        WHERE c.contact_id BETWEEN %s AND %s
+        AND c.contact_id <= %s
+        AND EXISTS (
+            SELECT 1 FROM tenant t 
+            WHERE t.contact_id = c.contact_id
+            AND t.to_date IS NOT NULL 
+            AND t.to_date < %s
+        )
+        AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = c.contact_id AND i.object_type_id = 1 AND i.invoice_date >= %s)
+        AND NOT EXISTS (SELECT 1 FROM journal_entry je WHERE je.object_id = c.contact_id AND je.object_type_id = 1 AND je.journal_entry_date >= %s)
+        AND NOT EXISTS (SELECT 1 FROM note n WHERE n.object_id = c.contact_id AND n.object_type_id = 94 AND n.last_updated_on >= %s)
+        AND NOT EXISTS (SELECT 1 FROM email e WHERE e.object_id = c.contact_id AND e.object_type_id = 1 AND e.email_date >= %s)
+    """,
+}
+
+# Rows pulled per fetchmany() call when reading report result sets
+FETCH_SIZE = 1000
+
+# Adaptive batch sizing: aim for this many ms per batch, within these size bounds
+DEFAULT_TARGET_MS = 500
+MIN_BATCH_SIZE = 100
+MAX_BATCH_SIZE = 100_000
+
+# Backpressure: how often server health is sampled and how long to back off per check
+BACKPRESSURE_CHECK_INTERVAL = 10
+BACKPRESSURE_SLEEP_SECONDS = 1.0
+MAX_BACKPRESSURE_SLEEP_SECONDS = 30.0
+DEFAULT_MAX_HISTORY_LENGTH = 1_000_000
+DEFAULT_MAX_REPLICA_LAG = 10
+
+# Indexes the DELETE predicates rely on: (table, leading columns)
+REQUIRED_INDEXES = [
+    ('email', ('object_id', 'object_type_id', 'email_date')),
+    ('invoice', ('object_id', 'object_type_id', 'invoice_date')),
+    ('tenant', ('contact_id', 'to_date')),
+    ('address', ('object_id', 'object_type_id')),
+    ('phone', ('object_id', 'object_type_id')),
+    ('reading', ('reading_id', 'date_imported')),
+]
+
+# Indexed column that drives each table's batch ranges, used to seek past empty ID regions
+SEEK_COLUMNS = {
+    'reading': ('reading', 'reading_id'),
+    'email_attachment': ('email', 'object_id'),
+    'email': ('email', 'object_id'),
+    'invoice_detail': ('invoice', 'object_id'),
+    'invoice': ('invoice', 'object_id'),
+    'address': ('address', 'object_id'),
+    'phone': ('phone', 'object_id'),
+    'tenant': ('tenant', 'contact_id'),
+    'contact': ('contact', 'contact_id'),
+}
+
+def years_ago(years: int, now: Optional[datetime] = None) -> datetime:
+    """Return the datetime `years` years before now (Feb 29 falls back to Feb 28)"""
+    now = now or datetime.now()
+    try:
+        return now.replace(year=now.year - years)
+    except ValueError:
+        return now.replace(year=now.year - years, day=28)
 
 class BatchDeleter:
-    def __init__(self, db_config: dict, cutoff_config: dict):
+    def __init__(self, db_config: dict, cutoff_config: dict,
+                 pool: Optional[mysql.connector.pooling.MySQLConnectionPool] = None,
+                 stop_event: Optional[threading.Event] = None,
+                 replica_hosts: Optional[List[str]] = None,
+                 max_history_length: int = DEFAULT_MAX_HISTORY_LENGTH,
+                 max_replica_lag: int = DEFAULT_MAX_REPLICA_LAG,
+                 run_started: Optional[datetime] = None):
         """Initialize with database and cutoff configuration"""
         self.db_config = db_config
+        # One clock reading per run (shared with workers): every table's
+        # retention cutoff is measured from the same instant
+        self.run_started = run_started or datetime.now()
+        self.replica_hosts = replica_hosts or []
+        self.max_history_length = max_history_length
+        self.max_replica_lag = max_replica_lag
+        self.replicas = []
         self.cutoff_config = cutoff_config
+        self.cutoff_ids = self.extract_cutoff_ids(cutoff_config)
+        self.pool = pool
         self.db = None
+        self.contact_object_type_id = None
+        self._cursors = {}
+        self._last_ids = {}
         self.setup_logging()
-        self.interrupted = False
-        self.setup_signal_handlers()
+        if stop_event is None:
+            # Top-level deleter owns the shutdown flag and the signal handlers
+            self._stop_event = threading.Event()
+            self.setup_signal_handlers()
+        else:
+            self._stop_event = stop_event
+            
+    @staticmethod
+    def extract_cutoff_ids(cutoff_config: dict) -> Dict[str, int]:
+        """Validate the cutoff configuration and flatten it to table -> cutoff_id"""
+        cutoff_ids = {}
+        for table_name, entry in cutoff_config.items():
+            if not isinstance(entry, dict) or 'cutoff_id' not in entry:
+                raise ValueError(f"Cutoff configuration for {table_name} has no cutoff_id")
+            try:
+                cutoff_ids[table_name] = int(entry['cutoff_id'])
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid cutoff_id for {table_name}: {entry['cutoff_id']!r}")
+        return cutoff_ids
+        
+    @property
+    def interrupted(self) -> bool:
+        return self._stop_event.is_set()
+        
+    @interrupted.setter
+    def interrupted(self, value: bool):
+        if value:
+            self._stop_event.set()
+        else:
+            self._stop_event.clear()
+            
+    def create_worker(self) -> 'BatchDeleter':
+        """Create a deleter for another thread sharing this pool, shutdown flag and run start"""
+        return BatchDeleter(self.db_config, self.cutoff_config,
+                            pool=self.pool, stop_event=self._stop_event,
+                            replica_hosts=self.replica_hosts,
+                            max_history_length=self.max_history_length,
+                            max_replica_lag=self.max_replica_lag,
+                            run_started=self.run_started)
         
     def setup_logging(self):
         """Configure logging"""
@@ -47,10 +289,18 @@ class BatchDeleter:
         self.interrupted = True
         
     def connect(self):
-        """Connect to database"""
+        """Connect to database (through the shared connection pool)"""
         try:
-            self.db = mysql.connector.connect(**self.db_config)
-            self.db.autocommit = False  # Use transactions
+            if self.pool is None:
+                # Set through the pool config: assigning autocommit on a pooled
+                # connection would only touch the wrapper, never the session
+                db_config = self.db_config.copy()
+                db_config['autocommit'] = False  # Use transactions
+                self.pool = mysql.connector.pooling.MySQLConnectionPool(
+                    pool_name='nes_cleanup', pool_size=POOL_SIZE, **db_config
+                )
+            self.db = self.pool.get_connection()
+            self._cursors = {}
             self.logger.info("Connected to database successfully")
         except mysql.connector.Error as e:
             self.logger.error(f"Database connection failed: {e}")
@@ -59,230 +309,336 @@ class BatchDeleter:
     def disconnect(self):
         """Disconnect from database"""
         if self.db:
-            self.db.close()
+            for cursor in self._cursors.values():
+                cursor.close()
+            self._cursors = {}
+            self.db.close()  # Returns the connection to the pool
+            self.db = None
             self.logger.info("Disconnected from database")
+        for replica in self.replicas:
+            replica.close()
+        self.replicas = []
             
     def create_logging_table(self):
         """Create deletion logging table if it doesn't exist"""
-        cursor = self.db.cursor()
+        with closing(self.db.cursor()) as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS deletion_log (
+                    log_id INT AUTO_INCREMENT PRIMARY KEY,
+                    table_name VARCHAR(64) NOT NULL,
+                    batch_start_id BIGINT NOT NULL,
+                    batch_end_id BIGINT NOT NULL,
+                    records_deleted INT NOT NULL,
+                    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    execution_time_ms INT,
+                    INDEX idx_table_batch_end (table_name, batch_end_id)
+                )
+            """)
+            
+            # Tables created by earlier versions only have (table_name, batch_start_id);
+            # add the covering index so MAX(batch_end_id) per table is an index lookup
+            cursor.execute("SHOW INDEX FROM deletion_log WHERE Key_name = 'idx_table_batch_end'")
+            if not cursor.fetchall():
+                self.logger.info("Adding idx_table_batch_end index to deletion_log")
+                cursor.execute("ALTER TABLE deletion_log ADD INDEX idx_table_batch_end (table_name, batch_end_id)")
+            self.db.commit()
+            self.logger.info("Deletion logging table ready")
+            
+    def ensure_indexes(self, dry_run: bool = True):
+        """
+        Make sure every index in REQUIRED_INDEXES exists, then refresh statistics
+        of the tables that got a new one. Tables whose indexes already existed are
+        not analyzed: their statistics are maintained by InnoDB, and ANALYZE TABLE
+        on these large tables is not free (before MySQL 8.0.24 it also flushes
+        the table, stalling queries behind any long-running read).
+        """
+        with closing(self.db.cursor()) as cursor:
+            analyze_tables = []
+            
+            for table_name, columns in REQUIRED_INDEXES:
+                cursor.execute("""
+                    SELECT index_name, column_name
+                    FROM information_schema.statistics
+                    WHERE table_schema = DATABASE() AND table_name = %s
+                    ORDER BY index_name, seq_in_index
+                """, (table_name,))
+                
+                existing = {}
+                for index_name, column_name in cursor.fetchall():
+                    # A functional key part has no column_name; None keeps its position,
+                    # so the columns after it are never taken for a leading prefix
+                    existing.setdefault(index_name, []).append(column_name.lower() if column_name else None)
+                    
+                # Any index led by the required columns will do; the clustered primary
+                # key also covers trailing columns since it holds the full row
+                covered = any(
+                    tuple(cols[:len(columns)]) == columns
+                    or (name == 'PRIMARY' and columns[:len(cols)] == tuple(cols))
+                    for name, cols in existing.items()
+                )
+                if covered:
+                    continue
+                    
+                index_name = f"idx_cleanup_{'_'.join(columns)}"
+                if dry_run:
+                    self.logger.warning(f"DRY RUN: Missing index on {table_name}({', '.join(columns)}), "
+                                        f"would create {index_name}")
+                    continue
+                    
+                self.logger.info(f"Creating index {index_name} on {table_name}({', '.join(columns)})...")
+                cursor.execute(f"CREATE INDEX {index_name} ON {table_name} ({', '.join(columns)})")
+                analyze_tables.append(table_name)
+                
+            for table_name in analyze_tables:
+                cursor.execute(f"ANALYZE TABLE {table_name}")
+                cursor.fetchall()
+                self.logger.info(f"Analyzed {table_name}")
+                
+    def get_history_length(self) -> int:
+        """Current InnoDB purge backlog (undo history list length) on the primary"""
+        cursor = self.get_prepared_cursor('history')
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS deletion_log (
-                log_id INT AUTO_INCREMENT PRIMARY KEY,
-                table_name VARCHAR(64) NOT NULL,
-                batch_start_id BIGINT NOT NULL,
-                batch_end_id BIGINT NOT NULL,
-                records_deleted INT NOT NULL,
-                deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                execution_time_ms INT,
-                INDEX idx_table_batch (table_name, batch_start_id)
-            )
+            SELECT count FROM information_schema.innodb_metrics
+            WHERE name = 'trx_rseg_history_len'
         """)
-        self.db.commit()
-        self.logger.info("Deletion logging table ready")
+        result = cursor.fetchone()
+        return int(result[0]) if result else 0
+        
+    def get_max_replica_lag(self) -> int:
+        """Largest Seconds_Behind_Master across the configured replicas"""
+        if self.replica_hosts and not self.replicas:
+            for host in self.replica_hosts:
+                replica_config = dict(self.db_config, host=host)
+                self.replicas.append(mysql.connector.connect(**replica_config))
+                
+        max_lag = 0
+        for replica in self.replicas:
+            cursor = replica.cursor(dictionary=True)
+            cursor.execute("SHOW SLAVE STATUS")
+            status = cursor.fetchone()
+            cursor.close()
+            if status is None:
+                continue
+            lag = status.get('Seconds_Behind_Master')
+            if lag is None:
+                # Replication stopped or broken: treat as maximally lagging
+                self.logger.warning(f"Replica {replica.server_host} is not replicating")
+                lag = self.max_replica_lag + 1
+            max_lag = max(max_lag, int(lag))
+        return max_lag
         
+    def wait_for_backpressure(self):
+        """Sleep while the purge backlog or replica lag is above its threshold"""
+        while not self.interrupted:
+            history_length = self.get_history_length()
+            replica_lag = self.get_max_replica_lag() if self.replica_hosts else 0
+            
+            pressure = max(history_length / self.max_history_length if self.max_history_length else 0,
+                           replica_lag / self.max_replica_lag if self.max_replica_lag else 0)
+            if pressure <= 1:
+                return
+                
+            sleep_seconds = min(BACKPRESSURE_SLEEP_SECONDS * pressure, MAX_BACKPRESSURE_SLEEP_SECONDS)
+            self.logger.info(f"Backing off {sleep_seconds:.1f}s (history length {history_length:,}, "
+                             f"replica lag {replica_lag}s)")
+            time.sleep(sleep_seconds)
+            
     def get_last_processed_id(self, table_name: str) -> int:
         """Get the last processed ID for a table to support resumption"""
-        cursor = self.db.cursor()
-        cursor.execute("""
-            SELECT COALESCE(MAX(batch_end_id), 0) as last_id
-            FROM deletion_log 
-            WHERE table_name = %s
-        """, (table_name,))
-        
-        result = cursor.fetchone()
-        return result[0] if result else 0
+        if table_name in self._last_ids:
+            return self._last_ids[table_name]
+            
+        with closing(self.db.cursor()) as cursor:
+            cursor.execute("""
+                SELECT COALESCE(MAX(batch_end_id), 0) as last_id
+                FROM deletion_log 
+                WHERE table_name = %s
+            """, (table_name,))
+            
+            result = cursor.fetchone()
+            self._last_ids[table_name] = result[0] if result else 0
+            return self._last_ids[table_name]
+            
+    def get_contact_object_type_id(self) -> int:
+        """Resolve (once per run) the object_type_id used for contact-owned rows"""
+        if self.contact_object_type_id is None:
+            with closing(self.db.cursor()) as cursor:
+                cursor.execute("SELECT object_type_id FROM object WHERE object_name = 'dstContact'")
+                result = cursor.fetchone()
+                if not result:
+                    raise ValueError("Object type 'dstContact' not found in object table")
+                self.contact_object_type_id = result[0]
+                self.logger.info(f"Resolved dstContact object_type_id = {self.contact_object_type_id}")
+        return self.contact_object_type_id
         
     def log_batch_deletion(self, table_name: str, start_id: int, end_id: int, 
                           deleted_count: int, execution_time_ms: int):
-        """Log a batch deletion"""
-        cursor = self.db.cursor()
+        """Log a batch deletion (committed together with the batch's DELETE)"""
+        cursor = self.get_prepared_cursor('log')
         cursor.execute("""
             INSERT INTO deletion_log 
             (table_name, batch_start_id, batch_end_id, records_deleted, execution_time_ms)
             VALUES (%s, %s, %s, %s, %s)
         """, (table_name, start_id, end_id, deleted_count, execution_time_ms))
-        self.db.commit()
         
-    def delete_reading_batch(self, start_id: int, end_id: int, cutoff_id: int) -> int:
+    def get_prepared_cursor(self, key: str):
+        """Return a prepared-statement cursor cached for the lifetime of the connection"""
+        cursor = self._cursors.get(key)
+        if cursor is None:
+            cursor = self.db.cursor(prepared=True)
+            self._cursors[key] = cursor
+        return cursor
+        
+    def find_next_id(self, table_name: str, from_id: int, cutoff_id: int) -> Optional[int]:
+        """Return the first populated ID in [from_id, cutoff_id] for a table, or None"""
+        source_table, column = SEEK_COLUMNS[table_name]
+        cursor = self.get_prepared_cursor(f"seek:{table_name}")
+        cursor.execute(
+            f"SELECT MIN({column}) FROM {source_table} WHERE {column} >= %s AND {column} <= %s",
+            (from_id, cutoff_id)
+        )
+        result = cursor.fetchone()
+        return result[0] if result else None
+        
+    def get_reading_partitions(self) -> List[Tuple[str, int]]:
+        """
+        Return (partition_name, exclusive_upper_bound) for reading if it is
+        RANGE-partitioned on reading_id; empty list otherwise
+        """
+        with closing(self.db.cursor()) as cursor:
+            cursor.execute("""
+                SELECT partition_name, partition_method, partition_expression, partition_description
+                FROM information_schema.partitions
+                WHERE table_schema = DATABASE() AND table_name = 'reading'
+                AND partition_name IS NOT NULL
+                ORDER BY partition_ordinal_position
+            """)
+            
+            partitions = []
+            for name, method, expression, description in cursor.fetchall():
+                if method != 'RANGE' or expression.strip('`').lower() != 'reading_id':
+                    return []
+                if description == 'MAXVALUE':
+                    continue
+                partitions.append((name, int(description)))
+            return partitions
+            
+    def truncate_reading_partitions(self, start_id: int, cutoff_id: int, cutoff_date: datetime,
+                                    dry_run: bool = True) -> int:
+        """
+        Empty whole reading partitions from start_id up to cutoff_id that hold
+        only deletable rows (old and not used for billing). Stops at the first
+        partition that cannot be truncated so the logged progress stays
+        contiguous for resumption. Returns rows removed.
+        """
+        with closing(self.db.cursor()) as cursor:
+            total_deleted = 0
+            lower_bound = 0
+            
+            for name, upper_bound in self.get_reading_partitions():
+                partition_start, lower_bound = lower_bound, upper_bound
+                if upper_bound <= start_id:
+                    continue  # Already processed
+                # Ids up to start_id - 1 are processed; a partition holding some of
+                # them is finished by the row batches (a fresh run has start_id 1)
+                if partition_start < start_id - 1 or upper_bound - 1 > cutoff_id or self.interrupted:
+                    break
+                    
+                # Any row that must be kept rules out truncating the partition
+                # (including undated rows, which READING_DELETE_SQL never matches)
+                cursor.execute(f"""
+                    SELECT 1 FROM reading PARTITION ({name}) r
+                    LEFT JOIN sm_usage su ON r.guid = su.guid
+                    WHERE su.sm_usage_id IS NOT NULL OR r.date_imported >= %s
+                    OR r.date_imported IS NULL
+                    LIMIT 1
+                """, (cutoff_date,))
+                if cursor.fetchall():
+                    break
+                    
+                cursor.execute(f"SELECT COUNT(*) FROM reading PARTITION ({name})")
+                row_count = cursor.fetchone()[0]
+                if row_count == 0:
+                    continue
+                    
+                if dry_run:
+                    self.logger.info(f"DRY RUN: Would truncate reading partition {name} ({row_count:,} rows)")
+                    continue
+                    
+                start_time = time.time()
+                cursor.execute(f"ALTER TABLE reading TRUNCATE PARTITION {name}")
+                execution_time_ms = int((time.time() - start_time) * 1000)
+                
+                self.log_batch_deletion('reading', partition_start, upper_bound - 1,
+                                        row_count, execution_time_ms)
+                self.db.commit()
+                total_deleted += row_count
+                self.logger.info(f"Truncated reading partition {name}: {row_count:,} rows in {execution_time_ms}ms")
+                
+            return total_deleted
+            
+    def delete_reading_batch(self, start_id: int, end_id: int, cutoff_id: int,
+                             cutoff_date: datetime) -> int:
         """Delete a batch of reading records not used for billing"""
-        cursor = self.db.cursor()
+        cursor = self.get_prepared_cursor('reading')
         
         start_time = time.time()
         
         # Delete non-billing readings in the ID range
-        cursor.execute("""
-            DELETE r FROM reading r
-            LEFT JOIN sm_usage su ON r.guid = su.guid
-            WHERE r.reading_id BETWEEN %s AND %s
-            AND r.reading_id <= %s
-            AND su.sm_usage_id IS NULL
-            AND r.date_imported < DATE_SUB(NOW(), INTERVAL 2 YEAR)
-        """, (start_id, end_id, cutoff_id))
+        cursor.execute(READING_DELETE_SQL, (start_id, end_id, cutoff_id, cutoff_date))
         
         deleted_count = cursor.rowcount
         execution_time_ms = int((time.time() - start_time) * 1000)
         
-        self.db.commit()
+        # Log row and DELETE share one transaction: one commit per batch
         self.log_batch_deletion('reading', start_id, end_id, deleted_count, execution_time_ms)
+        self.db.commit()
         
         return deleted_count
         
     def delete_account_related_batch(self, table_name: str, start_id: int, end_id: int, 
-                                   cutoff_id: int) -> int:
+                                   cutoff_id: int, cutoff_date: datetime) -> int:
         """Delete a batch of account-related records"""
-        cursor = self.db.cursor()
-        start_time = time.time()
-        deleted_count = 0
-        
-        if table_name == 'email_attachment':
-            # Delete email attachments for inactive accounts
-            cursor.execute("""
-                DELETE ea FROM email_attachment ea
-                JOIN email e ON ea.email_id = e.email_id
-                WHERE e.object_id BETWEEN %s AND %s
-                AND e.object_id <= %s
-                AND e.object_type_id = 1
-                AND EXISTS (
-                    SELECT 1 FROM contact c 
-                    JOIN tenant t ON c.contact_id = t.contact_id
-                    WHERE c.contact_id = e.object_id
-                    AND t.to_date IS NOT NULL 
-                    AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-                    AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = c.contact_id AND i.object_type_id = 1 AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-                )
-            """, (start_id, end_id, cutoff_id))
-            
-        elif table_name == 'email':
-            # Delete emails for inactive accounts
-            cursor.execute("""
-                DELETE e FROM email e
-                WHERE e.object_id BETWEEN %s AND %s
-                AND e.object_id <= %s
-                AND e.object_type_id = 1
-                AND EXISTS (
-                    SELECT 1 FROM contact c 
-                    JOIN tenant t ON c.contact_id = t.contact_id
-                    WHERE c.contact_id = e.object_id
-                    AND t.to_date IS NOT NULL 
-                    AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-                    AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = c.contact_id AND i.object_type_id = 1 AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-                )
-            """, (start_id, end_id, cutoff_id))
-            
-        elif table_name == 'invoice_detail':
-            # Delete invoice details for inactive accounts
-            cursor.execute("""
-                DELETE id FROM invoice_detail id
-                JOIN invoice i ON id.invoice_id = i.invoice_id
-                WHERE i.object_id BETWEEN %s AND %s
-                AND i.object_id <= %s
-                AND i.object_type_id = 1
-                AND EXISTS (
-                    SELECT 1 FROM contact c 
-                    JOIN tenant t ON c.contact_id = t.contact_id
-                    WHERE c.contact_id = i.object_id
-                    AND t.to_date IS NOT NULL 
-                    AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-                    AND NOT EXISTS (SELECT 1 FROM invoice i2 WHERE i2.object_id = c.contact_id AND i2.object_type_id = 1 AND i2.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-                )
-            """, (start_id, end_id, cutoff_id))
-            
-        elif table_name == 'invoice':
-            # Delete invoices for inactive accounts
-            cursor.execute("""
-                DELETE i FROM invoice i
-                WHERE i.object_id BETWEEN %s AND %s
-                AND i.object_id <= %s
-                AND i.object_type_id = 1
-                AND EXISTS (
-                    SELECT 1 FROM contact c 
-                    JOIN tenant t ON c.contact_id = t.contact_id
-                    WHERE c.contact_id = i.object_id
-                    AND t.to_date IS NOT NULL 
-                    AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-                    AND NOT EXISTS (SELECT 1 FROM invoice i2 WHERE i2.object_id = c.contact_id AND i2.object_type_id = 1 AND i2.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-                )
-            """, (start_id, end_id, cutoff_id))
-            
-        elif table_name == 'address':
-            # Delete addresses for inactive accounts
-            cursor.execute("""
-                DELETE a FROM address a
-                WHERE a.object_id BETWEEN %s AND %s
-                AND a.object_id <= %s
-                AND a.object_type_id = (SELECT object_type_id FROM object WHERE object_name = 'dstContact')
-                AND EXISTS (
-                    SELECT 1 FROM contact c 
-                    JOIN tenant t ON c.contact_id = t.contact_id
-                    WHERE c.contact_id = a.object_id
-                    AND t.to_date IS NOT NULL 
-                    AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-                    AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = c.contact_id AND i.object_type_id = 1 AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-                )
-            """, (start_id, end_id, cutoff_id))
-            
-        elif table_name == 'phone':
-            # Delete phone records for inactive accounts
-            cursor.execute("""
-                DELETE p FROM phone p
-                WHERE p.object_id BETWEEN %s AND %s
-                AND p.object_id <= %s
-                AND p.object_type_id = (SELECT object_type_id FROM object WHERE object_name = 'dstContact')
-                AND EXISTS (
-                    SELECT 1 FROM contact c 
-                    JOIN tenant t ON c.contact_id = t.contact_id
-                    WHERE c.contact_id = p.object_id
-                    AND t.to_date IS NOT NULL 
-                    AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-                    AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = c.contact_id AND i.object_type_id = 1 AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-                )
-            """, (start_id, end_id, cutoff_id))
+        if table_name not in ACCOUNT_DELETE_SQL:
+            raise ValueError(f"No delete statement defined for table: {table_name}")
             
+        if table_name in ('address', 'phone'):
+            params = (cutoff_date, start_id, end_id, cutoff_id,
+                      self.get_contact_object_type_id(), cutoff_date)
         elif table_name == 'tenant':
-            # Delete tenant records for inactive accounts
-            cursor.execute("""
-                DELETE t FROM tenant t
-                WHERE t.contact_id BETWEEN %s AND %s
-                AND t.contact_id <= %s
-                AND t.to_date IS NOT NULL 
-                AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-                AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = t.contact_id AND i.object_type_id = 1 AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-            """, (start_id, end_id, cutoff_id))
-            
+            params = (start_id, end_id, cutoff_id, cutoff_date, cutoff_date)
         elif table_name == 'contact':
-            # Delete contact records (final step for accounts)
-            cursor.execute("""
-                DELETE c FROM contact c
-                WHERE c.contact_id BETWEEN %s AND %s
-                AND c.contact_id <= %s
-                AND EXISTS (
-                    SELECT 1 FROM tenant t 
-                    WHERE t.contact_id = c.contact_id
-                    AND t.to_date IS NOT NULL 
-                    AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-                )
-                AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = c.contact_id AND i.object_type_id = 1 AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-                AND NOT EXISTS (SELECT 1 FROM journal_entry je WHERE je.object_id = c.contact_id AND je.object_type_id = 1 AND je.journal_entry_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-                AND NOT EXISTS (SELECT 1 FROM note n WHERE n.object_id = c.contact_id AND n.object_type_id = 94 AND n.last_updated_on >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-                AND NOT EXISTS (SELECT 1 FROM email e WHERE e.object_id = c.contact_id AND e.object_type_id = 1 AND e.email_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-            """, (start_id, end_id, cutoff_id))
+            params = (start_id, end_id, cutoff_id) + (cutoff_date,) * 5
+        else:
+            params = (cutoff_date, start_id, end_id, cutoff_id, cutoff_date)
+            
+        cursor = self.get_prepared_cursor(table_name)
+        start_time = time.time()
+        
+        cursor.execute(ACCOUNT_DELETE_SQL[table_name], params)
         
         deleted_count = cursor.rowcount
         execution_time_ms = int((time.time() - start_time) * 1000)
         
-        self.db.commit()
+        # Log row and DELETE share one transaction: one commit per batch
         self.log_batch_deletion(table_name, start_id, end_id, deleted_count, execution_time_ms)
+        self.db.commit()
         
         return deleted_count
         
     def process_table(self, table_name: str, batch_size: int = 1000, 
-                     delay_seconds: float = 0.1, dry_run: bool = True) -> Dict:
-        """Process an entire table in batches"""
+                     delay_seconds: float = 0.0, dry_run: bool = True,
+                     target_ms: int = DEFAULT_TARGET_MS) -> Dict:
+        """
+        Process an entire table in batches
+        When target_ms > 0 the batch size is rescaled after every batch so each
+        DELETE takes roughly target_ms; 0 keeps batch_size fixed.
+        """
         
-        if table_name not in self.cutoff_config:
+        if table_name not in self.cutoff_ids:
             raise ValueError(f"No cutoff configuration found for table: {table_name}")
             
-        cutoff_id = self.cutoff_config[table_name]['cutoff_id']
+        cutoff_id = self.cutoff_ids[table_name]
         
         if cutoff_id == 0:
             self.logger.info(f"No records to delete for {table_name} (cutoff_id = 0)")
@@ -297,86 +653,159 @@ class BatchDeleter:
             
         total_deleted = 0
         batches_processed = 0
-        current_id = start_id
+        last_end_id = start_id - 1
+        
+        # Evaluate the retention cutoff once so every batch binds the same constant
+        if table_name == 'reading':
+            cutoff_date = years_ago(READING_RETENTION_YEARS, self.run_started)
+        else:
+            cutoff_date = years_ago(ACCOUNT_RETENTION_YEARS, self.run_started)
+        if table_name in ('address', 'phone') and not dry_run:
+            self.get_contact_object_type_id()
         
         self.logger.info(f"Processing {table_name}: ID range {start_id:,} to {cutoff_id:,}")
         
         if dry_run:
             self.logger.info("DRY RUN MODE - No data will be deleted")
             
-        while current_id <= cutoff_id and not self.interrupted:
+        # Whole partitions of old non-billing readings are emptied in one step;
+        # the batch loop below then seeks past them
+        if table_name == 'reading':
+            total_deleted += self.truncate_reading_partitions(start_id, cutoff_id, cutoff_date, dry_run)
+            
+        # Per-batch messages use lazy %-formatting and are skipped entirely when INFO is off
+        log_batches = self.logger.isEnabledFor(logging.INFO)
+        
+        # Seek to the first populated ID instead of stepping through empty ranges
+        current_id = self.find_next_id(table_name, start_id, cutoff_id)
+        
+        # Resolve loop invariants once rather than re-deciding them every batch
+        adaptive = target_ms > 0 and not dry_run
+        cheap_batch_ms = target_ms / 4
+        is_interrupted = self._stop_event.is_set
+        if table_name == 'reading':
+            delete_batch = lambda start, end: self.delete_reading_batch(start, end, cutoff_id, cutoff_date)
+        else:
+            delete_batch = lambda start, end: self.delete_account_related_batch(
+                table_name, start, end, cutoff_id, cutoff_date)
+            
+        while current_id is not None and not is_interrupted():
             end_id = min(current_id + batch_size - 1, cutoff_id)
             
             if dry_run:
                 # In dry run, just log what would be deleted
-                self.logger.info(f"DRY RUN: Would process {table_name} batch {current_id:,}-{end_id:,}")
+                self.logger.info("DRY RUN: Would process %s batch %d-%d", table_name, current_id, end_id)
                 deleted_count = 0
+                execution_time_ms = 0
             else:
                 # Perform actual deletion
-                if table_name == 'reading':
-                    deleted_count = self.delete_reading_batch(current_id, end_id, cutoff_id)
-                else:
-                    deleted_count = self.delete_account_related_batch(table_name, current_id, end_id, cutoff_id)
+                batch_start = time.time()
+                deleted_count = delete_batch(current_id, end_id)
+                execution_time_ms = int((time.time() - batch_start) * 1000)
                     
             total_deleted += deleted_count
             batches_processed += 1
             
-            if deleted_count > 0 or batches_processed % 100 == 0:
-                self.logger.info(f"{table_name}: Batch {current_id:,}-{end_id:,}, deleted {deleted_count:,} records")
+            if log_batches and (deleted_count > 0 or batches_processed % 100 == 0):
+                self.logger.info("%s: Batch %d-%d, deleted %d records",
+                                 table_name, current_id, end_id, deleted_count)
                 
-            current_id += batch_size
+            last_end_id = end_id
+            if end_id >= cutoff_id:
+                current_id = None
+            elif deleted_count == 0:
+                # Nothing in this window; jump over any hole in the ID space
+                current_id = self.find_next_id(table_name, end_id + 1, cutoff_id)
+            else:
+                current_id = end_id + 1
             
-            # Add delay to reduce system load
-            if delay_seconds > 0:
+            # Grow easy batches and shrink slow ones toward the target latency
+            if adaptive:
+                scale = min(max(target_ms / max(execution_time_ms, 1), 0.5), 2.0)
+                batch_size = min(max(int(batch_size * scale), MIN_BATCH_SIZE), MAX_BATCH_SIZE)
+                
+            # Optional fixed delay (not needed after very cheap batches)
+            if delay_seconds > 0 and not (adaptive and execution_time_ms < cheap_batch_ms):
                 time.sleep(delay_seconds)
                 
+            # Throttle on server health rather than a fixed per-batch sleep
+            if not dry_run and batches_processed % BACKPRESSURE_CHECK_INTERVAL == 0:
+                self.wait_for_backpressure()
+                
+        if batches_processed and not dry_run:
+            self._last_ids[table_name] = last_end_id
+        
         if self.interrupted:
-            self.logger.info(f"Processing interrupted for {table_name} at ID {current_id:,}")
+            self.logger.info(f"Processing interrupted for {table_name} after ID {last_end_id:,}")
         else:
             self.logger.info(f"Completed processing {table_name}: {total_deleted:,} total records deleted")
             
         return {
             'total_deleted': total_deleted,
             'batches_processed': batches_processed,
-            'last_processed_id': current_id - batch_size
+            'last_processed_id': last_end_id
         }
         
     def get_progress_report(self) -> Dict:
         """Generate progress report"""
-        cursor = self.db.cursor()
-        cursor.execute("""
-            SELECT 
-                table_name,
-                COUNT(*) as batches,
-                SUM(records_deleted) as total_deleted,
-                MAX(batch_end_id) as progress_id,
-                MIN(deleted_at) as started,
-                MAX(deleted_at) as last_batch,
-                AVG(execution_time_ms) as avg_time_ms
-            FROM deletion_log 
-            GROUP BY table_name
-            ORDER BY table_name
-        """)
+        with closing(self.db.cursor(buffered=False)) as cursor:
+            cursor.execute("""
+                SELECT 
+                    table_name,
+                    COUNT(*) as batches,
+                    SUM(records_deleted) as total_deleted,
+                    MAX(batch_end_id) as progress_id,
+                    MIN(deleted_at) as started,
+                    MAX(deleted_at) as last_batch,
+                    AVG(execution_time_ms) as avg_time_ms
+                FROM deletion_log 
+                GROUP BY table_name
+                ORDER BY table_name
+            """)
         
-        progress = {}
-        for row in cursor.fetchall():
-            progress[row[0]] = {
-                'batches': row[1],
-                'total_deleted': row[2],
-                'progress_id': row[3],
-                'started': row[4],
-                'last_batch': row[5],
-                'avg_time_ms': row[6]
-            }
+            progress = {}
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    progress[row[0]] = {
+                        'batches': row[1],
+                        'total_deleted': row[2],
+                        'progress_id': row[3],
+                        'started': row[4],
+                        'last_batch': row[5],
+                        'avg_time_ms': row[6]
+                    }
             
-        return progress
+            return progress
 
 def load_cutoff_config(filename: str) -> Dict:
     """Load cutoff configuration from JSON file"""
-    with open(filename, 'r') as f:
-        data = json.load(f)
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     return data.get('cutoffs', {})
 
+def process_tables(deleter: BatchDeleter, tables: List[str], args) -> Dict[str, Dict]:
+    """Process tables sequentially on a dedicated pooled connection"""
+    results = {}
+    deleter.connect()
+    try:
+        for table in tables:
+            if deleter.interrupted:
+                break
+            results[table] = deleter.process_table(
+                table,
+                batch_size=args.batch_size,
+                delay_seconds=args.delay,
+                dry_run=args.dry_run,
+                target_ms=args.target_ms
+            )
+    finally:
+        deleter.disconnect()
+    return results
+
 def main():
     parser = argparse.ArgumentParser(description='Perform batch deletion using ID ranges')
     parser.add_argument('--host', default='localhost', help='Database host')
@@ -386,9 +815,21 @@ def main():
     parser.add_argument('--cutoff-config', required=True, help='Cutoff configuration JSON file')
     parser.add_argument('--table', help='Specific table to process (default: all)')
     parser.add_argument('--batch-size', type=int, default=1000, help='Batch size for deletion')
-    parser.add_argument('--delay', type=float, default=0.1, help='Delay between batches (seconds)')
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help='Fixed delay between batches (seconds); normally left at 0 and '
+                             'throttled by --max-history-length / --max-replica-lag instead')
+    parser.add_argument('--max-history-length', type=int, default=DEFAULT_MAX_HISTORY_LENGTH,
+                        help='Pause while the InnoDB history list length exceeds this (0 disables)')
+    parser.add_argument('--max-replica-lag', type=int, default=DEFAULT_MAX_REPLICA_LAG,
+                        help='Pause while any --replica-host lags by more than this many seconds')
+    parser.add_argument('--replica-host', action='append', default=[],
+                        help='Replica to monitor for lag (repeatable; same credentials)')
     parser.add_argument('--dry-run', action='store_true', help='Dry run mode (no actual deletion)')
     parser.add_argument('--progress', action='store_true', help='Show progress report only')
+    parser.add_argument('--target-ms', type=int, default=DEFAULT_TARGET_MS,
+                        help='Target time per batch for adaptive batch sizing (0 = fixed batch size)')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='Number of independent table groups processed in parallel')
     
     args = parser.parse_args()
     
@@ -400,7 +841,10 @@ def main():
     }
     
     cutoff_config = load_cutoff_config(args.cutoff_config)
-    deleter = BatchDeleter(db_config, cutoff_config)
+    deleter = BatchDeleter(db_config, cutoff_config,
+                           replica_hosts=args.replica_host,
+                           max_history_length=args.max_history_length,
+                           max_replica_lag=args.max_replica_lag)
     
     try:
         deleter.connect()
@@ -425,32 +869,53 @@ def main():
             if args.dry_run:
                 print("DRY RUN MODE - No data will be deleted")
                 
-            # Define processing order (children before parents)
-            processing_order = [
-                'reading',  # Standalone table
-                'email_attachment',  # Child of email
-                'email',  # Polymorphic to contact
-                'invoice_detail',  # Child of invoice
-                'invoice',  # Polymorphic to contact
-                'address',  # Polymorphic to contact
-                'phone',  # Polymorphic to contact
-                'tenant',  # References contact
-                'contact'  # Parent table
+            # Define processing order (children before parents). Each group is
+            # independent of the others and can run on its own connection.
+            processing_groups = [
+                ['reading'],  # Standalone table
+                [
+                    'email_attachment',  # Child of email
+                    'email',  # Polymorphic to contact
+                    'invoice_detail',  # Child of invoice
+                    'invoice',  # Polymorphic to contact
+                    'address',  # Polymorphic to contact
+                    'phone',  # Polymorphic to contact
+                    'tenant',  # References contact
+                    'contact'  # Parent table
+                ]
             ]
             
-            tables_to_process = [args.table] if args.table else processing_order
-            
-            for table in tables_to_process:
-                if table in cutoff_config:
-                    result = deleter.process_table(
-                        table, 
-                        batch_size=args.batch_size,
-                        delay_seconds=args.delay,
-                        dry_run=args.dry_run
-                    )
-                    print(f"Completed {table}: {result['total_deleted']:,} records deleted")
-                else:
-                    print(f"Skipping {table}: No cutoff configuration")
+            if args.table:
+                processing_groups = [[args.table]]
+                
+            groups = []
+            for group in processing_groups:
+                tables = []
+                for table in group:
+                    if table in cutoff_config:
+                        tables.append(table)
+                    else:
+                        print(f"Skipping {table}: No cutoff configuration")
+                if tables:
+                    groups.append(tables)
+                    
+            deleter.ensure_indexes(dry_run=args.dry_run)
+                    
+            workers = max(1, min(args.workers, len(groups), POOL_SIZE - 1))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(process_tables, deleter.create_worker(), tables, args)
+                    for tables in groups
+                ]
+                for future in futures:
+                    try:
+                        results = future.result()
+                    except Exception:
+                        # Stop the other groups at their next batch boundary
+                        deleter.interrupted = True
+                        raise
+                    for table, result in results.items():
+                        print(f"Completed {table}: {result['total_deleted']:,} records deleted")
                     
     except KeyboardInterrupt:
         print("\nInterrupted by user")
@@ -8,8 +8,30 @@ the correct types for closed/inactive communities.
 import mysql.connector
 import argparse
 import logging
+import re
+from contextlib import closing
+from datetime import datetime, timedelta
 from typing import List, Dict
 
+try:
+    import MySQLdb  # Optional mysqlclient (C) driver, preferred when installed
+    import MySQLdb.cursors
+except ImportError:
+    MySQLdb = None
+
+# Connection errors from whichever driver is in use
+DB_ERRORS = (mysql.connector.Error,) + ((MySQLdb.Error,) if MySQLdb is not None else ())
+
+# Contacts not updated within this many days (7 years) count as old
+CONTACT_RETENTION_DAYS = 2555
+
+# Rows pulled per fetchmany() call when reading result sets
+FETCH_SIZE = 1000
+
+# Name fragments that suggest closed/inactive or community contact types
+CLOSED_TYPE_RE = re.compile('clos|inact|term|end|zy|dead|cancel|expir|suspend', re.IGNORECASE)
+COMMUNITY_TYPE_RE = re.compile('commun|proper|build|complex|site|location', re.IGNORECASE)
+
 class ContactTypeChecker:
     def __init__(self, db_config: dict):
         """Initialize with database configuration"""
@@ -28,9 +50,16 @@ class ContactTypeChecker:
     def connect(self):
         """Connect to database"""
         try:
-            self.db = mysql.connector.connect(**self.db_config)
-            self.logger.info("Connected to database successfully")
-        except mysql.connector.Error as e:
+            if MySQLdb is not None:
+                # mysqlclient names two of the connect() keywords differently
+                renames = {'database': 'db', 'password': 'passwd'}
+                self.db = MySQLdb.connect(**{renames.get(key, key): value
+                                             for key, value in self.db_config.items()})
+                self.logger.info("Connected to database successfully (mysqlclient driver)")
+            else:
+                self.db = mysql.connector.connect(**self.db_config)
+                self.logger.info("Connected to database successfully")
+        except DB_ERRORS as e:
             self.logger.error(f"Database connection failed: {e}")
             raise
             
@@ -40,119 +69,61 @@ class ContactTypeChecker:
             self.db.close()
             self.logger.info("Disconnected from database")
             
-    def get_all_contact_types(self) -> List[Dict]:
-        """Get all contact types with counts"""
-        cursor = self.db.cursor()
-        cursor.execute("""
-            SELECT 
-                ct.contact_type_id,
-                ct.contact_type,
-                COUNT(c.contact_id) as contact_count
-            FROM contact_type ct
-            LEFT JOIN contact c ON ct.contact_type_id = c.contact_type_id
-            GROUP BY ct.contact_type_id, ct.contact_type
-            ORDER BY contact_count DESC
-        """)
-        
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'contact_type_id': row[0],
-                'contact_type': row[1],
-                'contact_count': row[2]
-            })
-            
-        return results
-        
-    def find_potential_closed_types(self) -> List[Dict]:
-        """Find contact types that might indicate closed/inactive communities"""
-        cursor = self.db.cursor()
-        cursor.execute("""
-            SELECT 
-                ct.contact_type_id,
-                ct.contact_type,
-                COUNT(c.contact_id) as contact_count
-            FROM contact_type ct
-            LEFT JOIN contact c ON ct.contact_type_id = c.contact_type_id
-            WHERE LOWER(ct.contact_type) LIKE '%clos%'
-               OR LOWER(ct.contact_type) LIKE '%inact%'
-               OR LOWER(ct.contact_type) LIKE '%term%'
-               OR LOWER(ct.contact_type) LIKE '%end%'
-               OR LOWER(ct.contact_type) LIKE '%zy%'
-               OR LOWER(ct.contact_type) LIKE '%dead%'
-               OR LOWER(ct.contact_type) LIKE '%cancel%'
-               OR LOWER(ct.contact_type) LIKE '%expir%'
-               OR LOWER(ct.contact_type) LIKE '%suspend%'
-            GROUP BY ct.contact_type_id, ct.contact_type
-            ORDER BY contact_count DESC
-        """)
-        
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'contact_type_id': row[0],
-                'contact_type': row[1],
-                'contact_count': row[2]
-            })
-            
-        return results
+    def get_contact_type_summary(self) -> List[Dict]:
+        """
+        Get per-type usage, 7+ year old contact counts and name classification
+        in a single pass over contact (instead of one aggregation per report section)
+        """
+        if MySQLdb is not None:
+            cursor = self.db.cursor(MySQLdb.cursors.SSCursor)
+        else:
+            cursor = self.db.cursor(buffered=False)
         
-    def find_community_types(self) -> List[Dict]:
-        """Find contact types that might be community-related"""
-        cursor = self.db.cursor()
-        cursor.execute("""
-            SELECT 
-                ct.contact_type_id,
-                ct.contact_type,
-                COUNT(c.contact_id) as contact_count
-            FROM contact_type ct
-            LEFT JOIN contact c ON ct.contact_type_id = c.contact_type_id
-            WHERE LOWER(ct.contact_type) LIKE '%commun%'
-               OR LOWER(ct.contact_type) LIKE '%proper%'
-               OR LOWER(ct.contact_type) LIKE '%build%'
-               OR LOWER(ct.contact_type) LIKE '%complex%'
-               OR LOWER(ct.contact_type) LIKE '%site%'
-               OR LOWER(ct.contact_type) LIKE '%location%'
-            GROUP BY ct.contact_type_id, ct.contact_type
-            ORDER BY contact_count DESC
-        """)
+        with closing(cursor):
+            # contact_type is tiny: classify names in Python rather than with
+            # LOWER()/REGEXP predicates evaluated inside the aggregation
+            cursor.execute("SELECT contact_type_id, contact_type FROM contact_type")
+            contact_types = cursor.fetchall()
         
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'contact_type_id': row[0],
-                'contact_type': row[1],
-                'contact_count': row[2]
-            })
-            
-        return results
+            cutoff_date = datetime.now() - timedelta(days=CONTACT_RETENTION_DAYS)
         
-    def get_old_contacts_by_type(self) -> List[Dict]:
-        """Get contacts older than 7 years grouped by contact type"""
-        cursor = self.db.cursor()
-        cursor.execute("""
-            SELECT 
-                ct.contact_type,
-                COUNT(*) as old_contacts,
-                MIN(c.last_updated_on) as oldest_update,
-                MAX(c.last_updated_on) as newest_update
-            FROM contact c
-            JOIN contact_type ct ON c.contact_type_id = ct.contact_type_id
-            WHERE c.last_updated_on < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-            GROUP BY ct.contact_type_id, ct.contact_type
-            HAVING COUNT(*) > 0
-            ORDER BY old_contacts DESC
-        """)
+            # Aggregate contact on its own, grouped by the indexed contact_type_id
+            cursor.execute("""
+                SELECT 
+                    contact_type_id,
+                    COUNT(*) as contact_count,
+                    SUM(last_updated_on < %s) as old_contacts,
+                    MIN(CASE WHEN last_updated_on < %s THEN last_updated_on END) as oldest_update,
+                    MAX(CASE WHEN last_updated_on < %s THEN last_updated_on END) as newest_update
+                FROM contact
+                GROUP BY contact_type_id
+            """, (cutoff_date,) * 3)
+            counts = {}
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    counts[row[0]] = row[1:]
         
         results = []
-        for row in cursor.fetchall():
+        for contact_type_id, contact_type in contact_types:
+            contact_count, old_contacts, oldest_update, newest_update = counts.get(
+                contact_type_id, (0, 0, None, None)
+            )
+            name = contact_type or ''
             results.append({
-                'contact_type': row[0],
-                'old_contacts': row[1],
-                'oldest_update': row[2],
-                'newest_update': row[3]
+                'contact_type_id': contact_type_id,
+                'contact_type': contact_type,
+                'contact_count': contact_count,
+                'old_contacts': int(old_contacts or 0),
+                'oldest_update': oldest_update,
+                'newest_update': newest_update,
+                'is_closed': bool(CLOSED_TYPE_RE.search(name)),
+                'is_community': bool(COMMUNITY_TYPE_RE.search(name))
             })
             
+        results.sort(key=lambda ct: ct['contact_count'], reverse=True)
         return results
         
     def generate_report(self):
@@ -161,10 +132,18 @@ class ContactTypeChecker:
         print("CONTACT TYPE ANALYSIS REPORT")
         print("="*80)
         
+        # One scan feeds every section of the report
+        all_types = self.get_contact_type_summary()
+        closed_types = [ct for ct in all_types if ct['is_closed']]
+        community_types = [ct for ct in all_types if ct['is_community']]
+        old_contacts = sorted(
+            (ct for ct in all_types if ct['old_contacts'] > 0),
+            key=lambda ct: ct['old_contacts'], reverse=True
+        )
+        
         # All contact types
         print("\n1. ALL CONTACT TYPES (by usage count):")
         print("-" * 50)
-        all_types = self.get_all_contact_types()
         for ct in all_types[:20]:  # Show top 20
             print(f"  {ct['contact_type']:<30} {ct['contact_count']:>8,} contacts")
             
@@ -174,7 +153,6 @@ class ContactTypeChecker:
         # Potential closed types
         print("\n2. POTENTIAL CLOSED/INACTIVE TYPES:")
         print("-" * 50)
-        closed_types = self.find_potential_closed_types()
         if closed_types:
             for ct in closed_types:
                 print(f"  {ct['contact_type']:<30} {ct['contact_count']:>8,} contacts")
@@ -184,7 +162,6 @@ class ContactTypeChecker:
         # Community types
         print("\n3. POTENTIAL COMMUNITY TYPES:")
         print("-" * 50)
-        community_types = self.find_community_types()
         if community_types:
             for ct in community_types:
                 print(f"  {ct['contact_type']:<30} {ct['contact_count']:>8,} contacts")
@@ -194,7 +171,6 @@ class ContactTypeChecker:
         # Old contacts by type
         print("\n4. CONTACTS OLDER THAN 7 YEARS (by type):")
         print("-" * 50)
-        old_contacts = self.get_old_contacts_by_type()
         for ct in old_contacts[:15]:  # Show top 15
             print(f"  {ct['contact_type']:<30} {ct['old_contacts']:>8,} old contacts")
             
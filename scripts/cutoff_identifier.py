@@ -6,12 +6,69 @@ This script identifies the autoincrement ID cutoffs for safe data deletion.
 
 import json
 import logging
+import math
+import os
+import sys
+import threading
 import argparse
+import hashlib
 import mysql.connector
+import mysql.connector.pooling
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 from decimal import Decimal
 
+try:
+    import orjson  # Optional C-accelerated encoder for the report
+except ImportError:
+    orjson = None
+
+try:
+    import MySQLdb  # Optional mysqlclient (C) driver, preferred when installed
+    import MySQLdb.cursors
+except ImportError:
+    MySQLdb = None
+
+# Connection attribute identifying these sessions (mysql.connector 8.0.17+ only)
+PROGRAM_NAME = 'cutoff_identifier'
+CONNECTOR_SUPPORTS_CONN_ATTRS = tuple(getattr(mysql.connector, '__version_info__', ())[:3]) >= (8, 0, 17)
+
+# Pooled connections: the main connection plus one per concurrent analysis
+CONNECTION_POOL_SIZE = 3
+
+# Connection errors from whichever driver is in use
+DB_ERRORS = (mysql.connector.Error,) + ((MySQLdb.Error,) if MySQLdb is not None else ())
+
+# Retention windows for the cutoff timestamps bound into queries
+READING_RETENTION = timedelta(days=730)    # 2 years
+CONTACT_RETENTION = timedelta(days=2555)   # 7 years
+
+# Report file write buffer (1 MiB) - fewer write() calls for large reports
+REPORT_WRITE_BUFFER = 1 << 20
+
+# Reuse of a previous run's report (--use-cache): where it is kept and how old it
+# may be. It is only reused while the reading/contact primary key ranges are
+# unchanged: imports move the MAX and the cleanup deletes from the low end,
+# moving the MIN (information_schema table_rows is an estimate that drifts
+# between runs, so it cannot tell whether the data changed)
+REPORT_CACHE_DIR = os.path.expanduser('~/.cache/nes_cleanup')
+REPORT_CACHE_MAX_AGE = timedelta(hours=24)
+
+# Rows per DELETE suggested to the batch deleter, keeping each transaction short
+SUGGESTED_BATCH_SIZE = 10_000
+
+# EXPLAIN row estimate above which a full table scan is worth a warning
+FULL_SCAN_WARN_ROWS = 1_000_000
+
+# The failed contact safety check stops counting offending rows here
+SAFETY_COUNT_LIMIT = 1000
+
+# Index that lets the contact safety check range-scan instead of reading every row
+RECOMMENDED_CONTACT_INDEX = "CREATE INDEX idx_contact_updated_type ON contact(last_updated_on, contact_type_id)"
+
 class DecimalEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle Decimal objects"""
     def default(self, obj):
@@ -19,27 +76,113 @@ class DecimalEncoder(json.JSONEncoder):
             return float(obj)
         return super(DecimalEncoder, self).default(obj)
 
+def orjson_default(obj):
+    """orjson fallback for Decimal (and anything else it cannot encode natively)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+def mysqldb_connect_args(db_config: dict) -> dict:
+    """Translate mysql.connector connect() keywords to their MySQLdb names"""
+    renames = {'database': 'db', 'password': 'passwd'}
+    return {renames.get(key, key): value for key, value in db_config.items()}
+
+def write_json(data: Dict, filename: str, indent: bool = True):
+    """
+    Write data as JSON (indented unless only machines read it) via a temporary
+    file renamed into place, so a crash mid-write never leaves a truncated file behind
+    """
+    tmp_filename = filename + '.tmp'
+    try:
+        if orjson is not None:
+            # Encode straight to bytes instead of via an intermediate str
+            with open(tmp_filename, 'wb', buffering=REPORT_WRITE_BUFFER) as f:
+                f.write(orjson.dumps(data, default=orjson_default,
+                                     option=orjson.OPT_INDENT_2 if indent else None))
+        else:
+            with open(tmp_filename, 'w', buffering=REPORT_WRITE_BUFFER) as f:
+                json.dump(data, f, indent=2 if indent else None,
+                          separators=None if indent else (',', ':'), cls=DecimalEncoder)
+        os.replace(tmp_filename, filename)
+    except Exception:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+@dataclass
+class CutoffEntry:
+    """One table's entry under report['cutoffs']"""
+    __slots__ = ('cutoff_id', 'estimated_deletions', 'is_safe', 'cutoff_date',
+                 'suggested_batch_size', 'suggested_batches')
+    cutoff_id: int
+    estimated_deletions: int
+    is_safe: bool
+    cutoff_date: str
+    suggested_batch_size: int
+    suggested_batches: int
+
+@dataclass
+class TableStats:
+    """One table's entry under report['table_stats']"""
+    __slots__ = ('rows', 'data_mb', 'index_mb', 'total_mb')
+    rows: int
+    data_mb: Decimal
+    index_mb: Decimal
+    total_mb: Decimal
+
 class CutoffIdentifier:
-    def __init__(self, db_config: dict):
+    def __init__(self, db_config: dict, estimate_mode: str = 'exact', quiet: bool = False,
+                 use_cache: bool = False, explain_only: bool = False):
         """Initialize with database configuration"""
         self.db_config = db_config
+        self.estimate_mode = estimate_mode
+        self.use_cache = use_cache
+        self.explain_only = explain_only
+        # One clock reading per run, so every query and the report share the same cutoffs
+        self.run_started = datetime.now()
+        self.reading_cutoff_date = self.run_started - READING_RETENTION
+        self.contact_cutoff_date = self.run_started - CONTACT_RETENTION
         self.db = None
-        self.setup_logging()
-        
-    def setup_logging(self):
-        """Configure logging"""
+        self.pool = None
+        self.pool_lock = threading.Lock()
+        self.company_name_index_checked = False
+        self.reading_date_indexed = None
+        self.closed_contact_type_ids = None
+        # information_schema statistics already read this run, by table name
+        self.table_stats = {}
+        # Per-thread connection override used by run_on_own_connection
+        self.thread_state = threading.local()
+        self.setup_logging(quiet)
+        
+    def setup_logging(self, quiet: bool = False):
+        """
+        Configure logging (once - repeated calls must not stack handlers).
+        quiet mutes the INFO progress narration; result lines go through
+        result_logger, which keeps its own INFO level.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.result_logger = logging.getLogger(__name__ + '.result')
+        self.result_logger.setLevel(logging.INFO)
+        if quiet:
+            self.logger.setLevel(logging.WARNING)
+        if logging.getLogger().handlers:
+            return
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S',
             handlers=[
                 logging.FileHandler('cutoff_identification.log'),
                 logging.StreamHandler()
             ]
         )
-        self.logger = logging.getLogger(__name__)
         
     def connect(self):
         """Connect to database with compatibility for older MySQL servers"""
+        self.db = self.create_connection()
+        
+    def create_connection(self):
+        """Open a new database connection with compatibility for older MySQL servers"""
         try:
             # Add charset compatibility for older MySQL servers
             db_config = self.db_config.copy()
@@ -51,9 +194,23 @@ class CutoffIdentifier:
             # Disable SSL warnings for older servers
             db_config['autocommit'] = True
             
-            self.db = mysql.connector.connect(**db_config)
-            self.logger.info("Connected to database successfully")
-        except mysql.connector.Error as e:
+            if MySQLdb is not None:
+                db = MySQLdb.connect(**mysqldb_connect_args(db_config))
+                self.logger.info("Connected to database successfully (mysqlclient driver)")
+            else:
+                if CONNECTOR_SUPPORTS_CONN_ATTRS:
+                    # Lets DBAs attribute this workload in performance_schema
+                    db_config['conn_attrs'] = {'program_name': PROGRAM_NAME}
+                with self.pool_lock:
+                    if self.pool is None:
+                        # Connections closed by an analysis go back to the pool, so
+                        # later reports from this identifier skip the connect handshake
+                        self.pool = mysql.connector.pooling.MySQLConnectionPool(
+                            pool_name=f"{PROGRAM_NAME}_{id(self)}", pool_size=CONNECTION_POOL_SIZE, **db_config)
+                db = self.pool.get_connection()
+                self.logger.info("Connected to database successfully")
+            return db
+        except DB_ERRORS as e:
             self.logger.error(f"Database connection failed: {e}")
             raise
             
@@ -63,6 +220,52 @@ class CutoffIdentifier:
             self.db.close()
             self.logger.info("Disconnected from database")
             
+    def run_on_own_connection(self, analysis):
+        """Run an analysis method on a dedicated connection (for use from a worker thread)"""
+        db = self.thread_state.db = self.create_connection()
+        try:
+            # One read view for the whole analysis, so its statements (e.g. the
+            # reading MIN/MAX, bisect probes and counts) all see the same data
+            self.start_snapshot(db)
+            try:
+                return analysis()
+            finally:
+                db.commit()
+        finally:
+            db.close()
+            self.thread_state.db = None
+            
+    def start_snapshot(self, db):
+        """Start a consistent-snapshot transaction (read-only where the server supports it)"""
+        cursor = db.cursor()
+        try:
+            try:
+                cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+            except DB_ERRORS:
+                # READ ONLY transactions need MySQL 5.6.5+
+                cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+        finally:
+            cursor.close()
+            
+    @contextmanager
+    def open_cursor(self, unbuffered: bool = False, **kwargs):
+        """
+        Yield a cursor that is always closed (freeing any server-side prepared statement).
+        unbuffered streams rows from the server as they are iterated instead of
+        reading the whole result set into memory first.
+        """
+        if MySQLdb is not None:
+            # mysqlclient has no prepared/buffered cursor options; it decodes rows in C
+            kwargs = {'cursorclass': MySQLdb.cursors.SSCursor} if unbuffered else {}
+        elif unbuffered:
+            kwargs['buffered'] = False
+        db = getattr(self.thread_state, 'db', None) or self.db
+        cursor = db.cursor(**kwargs)
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+            
     def identify_reading_cutoff(self) -> Tuple[int, int, bool]:
         """
         Identify cutoff for reading table (2 years)
@@ -71,206 +274,409 @@ class CutoffIdentifier:
         Returns: (cutoff_id, estimated_deletions, is_safe)
         """
         self.logger.info("=== ANALYZING READING TABLE ===")
-        cursor = self.db.cursor()
-        
-        try:
-            # First, get total reading count for context
-            self.logger.info("Getting total reading count...")
-            cursor.execute("SELECT COUNT(*) FROM reading")
-            total_readings = cursor.fetchone()[0]
-            self.logger.info(f"Total readings in database: {total_readings:,}")
-        except Exception as e:
-            self.logger.error(f"Failed to get total reading count: {e}")
-            return 0, 0, False
-        
-        try:
-            # Find minimum reading_id where date_imported >= 2 years ago
-            # Everything below this ID can be safely deleted
-            self.logger.info("Finding cutoff ID (minimum reading_id where date_imported >= 2 years ago)...")
-            cursor.execute("""
-                SELECT COALESCE(MIN(reading_id), 0) as cutoff_id
-                FROM reading 
-                WHERE date_imported >= DATE_SUB(NOW(), INTERVAL 2 YEAR)
-            """)
-            cutoff_id = cursor.fetchone()[0]
-            self.logger.info(f"Cutoff ID found: {cutoff_id}")
-        except Exception as e:
-            self.logger.error(f"Failed to find cutoff ID: {e}")
-            return 0, 0, False
-        
-        # If no readings found within 2 years, use max ID + 1 (delete nothing)
-        if cutoff_id == 0:
+        use_date_index = self.has_reading_date_index()
+        # Prepared (binary protocol) cursor: the bisect probes re-execute one
+        # statement ~30 times and every result here is a single row
+        with self.open_cursor(prepared=True) as cursor:
+            cutoff_date = self.reading_cutoff_date
+            
+            if self.estimate_mode == 'exact':
+                try:
+                    # One pass over reading for the ID range, the total and the
+                    # deletable count, so the bisect below needs no MIN/MAX query
+                    self.logger.info("Counting total and deletable readings...")
+                    cursor.execute(*self.reading_count_query())
+                    min_id, max_id, total_readings, estimated_deletions = cursor.fetchone()
+                    estimated_deletions = int(estimated_deletions)
+                    self.logger.info(f"Total readings in database: {total_readings:,}")
+                except Exception as e:
+                    self.logger.error(f"Failed to count readings: {e}")
+                    return 0, 0, False
+            
             try:
+                # Locate the cutoff with ~30 primary-key probes instead of scanning
+                # every recent row for MIN(reading_id)
+                self.logger.info("Finding cutoff ID (minimum reading_id where date_imported >= 2 years ago)...")
+                if self.estimate_mode != 'exact':
+                    cursor.execute("SELECT COALESCE(MIN(reading_id), 0), COALESCE(MAX(reading_id), 0) FROM reading")
+                    min_id, max_id = cursor.fetchone()
+                if use_date_index:
+                    # A covering range scan of the recent date_imported index entries
+                    cursor.execute(*self.reading_date_probe_query())
+                    row = cursor.fetchone()
+                    cutoff_id = row[0] if row and row[0] is not None else 0
+                else:
+                    cutoff_id = self.bisect_reading_cutoff_id(cursor, cutoff_date, min_id, max_id)
+                self.logger.info(f"Cutoff ID found: {cutoff_id}")
+            except Exception as e:
+                self.logger.error(f"Failed to find cutoff ID: {e}")
+                return 0, 0, False
+            
+            if self.estimate_mode == 'id-range':
+                # reading_id is auto-increment with few gaps, so ID arithmetic
+                # approximates the deletions without reading any index entries
+                estimated_deletions = cutoff_id - min_id if cutoff_id else 0
+                self.logger.info(f"Fast estimate from ID range: min_id={min_id}, max_id={max_id}, "
+                                 f"cutoff_id={cutoff_id} (approximate, assumes dense reading_id)")
+                # For the total, prefer the table statistics the report already read
+                total_readings = self.table_stats.get('reading', {}).get('rows')
+                if total_readings is None:
+                    total_readings = max_id - min_id + 1 if max_id else 0
+                self.logger.info(f"Total readings in database (estimated): {total_readings:,}")
+            elif self.estimate_mode == 'explain':
+                # Optimizer row estimates for the two PK ranges: no rows are read
+                id_range_sql = "SELECT reading_id FROM reading WHERE reading_id < %s"
+                # The table's row estimate is already in the run's statistics
+                total_readings = self.table_stats.get('reading', {}).get('rows')
+                if total_readings is None:
+                    total_readings = self.explain_row_estimate(id_range_sql, (max_id + 1,))
+                estimated_deletions = self.explain_row_estimate(id_range_sql, (cutoff_id,)) if cutoff_id else 0
+                if total_readings is None or estimated_deletions is None:
+                    self.logger.error("Failed to read EXPLAIN row estimates for reading")
+                    return cutoff_id, 0, False
+                self.logger.info(f"Total readings in database (optimizer estimate): {total_readings:,}")
+            
+            # If no readings found within 2 years, use max ID + 1 (delete nothing)
+            if cutoff_id == 0:
                 self.logger.warning("No readings found within the last 2 years!")
-                self.logger.info("Getting maximum reading_id to set safe cutoff...")
-                cursor.execute("SELECT COALESCE(MAX(reading_id), 0) + 1 as cutoff_id FROM reading")
-                cutoff_id = cursor.fetchone()[0]
+                cutoff_id = max_id + 1
                 estimated_deletions = 0
                 self.logger.info(f"Safe cutoff set to: {cutoff_id} (no deletions will occur)")
-            except Exception as e:
-                self.logger.error(f"Failed to get maximum reading_id: {e}")
-                return 0, 0, False
-        else:
-            try:
-                # Count records that will be deleted (reading_id < cutoff_id)
-                self.logger.info(f"Counting readings that will be deleted (reading_id < {cutoff_id})...")
-                cursor.execute("""
-                    SELECT COUNT(*) as deletable_count
-                    FROM reading 
-                    WHERE reading_id < %s
-                """, (cutoff_id,))
-                estimated_deletions = cursor.fetchone()[0]
-                
-                # Calculate percentage
+            elif self.logger.isEnabledFor(logging.INFO):
+                # Percentages only feed the progress narration, so skip them under --quiet
                 deletion_percentage = (estimated_deletions / total_readings * 100) if total_readings > 0 else 0
                 self.logger.info(f"Readings to be deleted: {estimated_deletions:,} ({deletion_percentage:.1f}% of total)")
                 self.logger.info(f"Readings to be retained: {total_readings - estimated_deletions:,} ({100 - deletion_percentage:.1f}% of total)")
-            except Exception as e:
-                self.logger.error(f"Failed to count deletable readings: {e}")
-                return cutoff_id, 0, False
-        
-        # This approach is inherently safe - we only delete readings older than 2 years
-        is_safe = True
+            
+            # This approach is inherently safe - we only delete readings older than 2 years
+            is_safe = True
+            
+            self.logger.info("=== READING ANALYSIS COMPLETE ===")
+            self.result_logger.info(f"RESULT: Cutoff ID = {cutoff_id}, Deletions = {estimated_deletions:,}, Safe = {is_safe}")
+            
+            return cutoff_id, estimated_deletions, is_safe
         
-        self.logger.info("=== READING ANALYSIS COMPLETE ===")
-        self.logger.info(f"RESULT: Cutoff ID = {cutoff_id}, Deletions = {estimated_deletions:,}, Safe = {is_safe}")
+    def bisect_reading_cutoff_id(self, cursor, cutoff_date: datetime, min_id: int, max_id: int) -> int:
+        """
+        Binary search reading_id for the first reading imported on/after cutoff_date.
+        Relies on date_imported increasing with reading_id (rows are imported in ID
+        order); gaps in the ID space are handled by probing the next existing row.
+        The batch deleter re-checks date_imported, so a misordered row is never deleted.
+        Returns 0 if no reading is that recent.
+        """
+        def first_row_from(reading_id: int):
+            cursor.execute(*self.reading_probe_query(reading_id))
+            return cursor.fetchone()
+            
+        if max_id == 0:
+            return 0
+        last_row = first_row_from(max_id)
+        if last_row is None or last_row[1] is None or last_row[1] < cutoff_date:
+            return 0
+            
+        low, high = min_id, max_id
+        probes = 0
+        while low < high:
+            mid = (low + high) // 2
+            row = first_row_from(mid)
+            probes += 1
+            if row[1] is not None and row[1] >= cutoff_date:
+                high = mid
+            else:
+                low = mid + 1
+                
+        self.logger.info(f"Cutoff located after {probes} primary key probes")
+        return first_row_from(low)[0]
         
-        return cutoff_id, estimated_deletions, is_safe
+    def reading_probe_query(self, reading_id: int) -> Tuple[str, tuple]:
+        """Bisect probe: the first reading at or after reading_id"""
+        return """
+            SELECT reading_id, date_imported FROM reading
+            WHERE reading_id >= %s ORDER BY reading_id LIMIT 1
+        """, (reading_id,)
         
-    def identify_contact_cutoff(self) -> Tuple[int, int, bool]:
+    def reading_date_probe_query(self) -> Tuple[str, tuple]:
         """
-        Identify cutoff for inactive contacts (7 years)
-        Returns: (cutoff_id, estimated_deletions, is_safe)
+        Lowest reading_id imported on/after the cutoff, read from an index leading
+        with date_imported (DBA: CREATE INDEX idx_reading_date_imported
+        ON reading(date_imported) - InnoDB appends reading_id, making it covering).
+        This is the true minimum even if readings were backfilled out of id order;
+        the earliest-imported recent row is not necessarily the lowest id.
         """
-        self.logger.info("=== ANALYZING CONTACT TABLE ===")
-        cursor = self.db.cursor()
-        
+        return """
+            SELECT MIN(reading_id) FROM reading
+            WHERE date_imported >= %s
+        """, (self.reading_cutoff_date,)
+        
+    def has_reading_date_index(self) -> bool:
+        """Whether (checked once per run) an index leads with reading.date_imported"""
+        if self.reading_date_indexed is None:
+            try:
+                with self.open_cursor() as cursor:
+                    cursor.execute("""
+                        SELECT COUNT(*) FROM information_schema.statistics
+                        WHERE table_schema = DATABASE() AND table_name = 'reading'
+                        AND column_name = 'date_imported' AND seq_in_index = 1
+                    """)
+                    self.reading_date_indexed = cursor.fetchone()[0] > 0
+            except Exception as e:
+                self.logger.error(f"Failed to check reading indexes: {e}")
+                self.reading_date_indexed = False
+            if not self.reading_date_indexed:
+                self.logger.info("No index on reading.date_imported - locating the cutoff by primary key bisection")
+        return self.reading_date_indexed
+        
+    def reading_count_query(self) -> Tuple[str, tuple]:
+        """ID range plus exact total and deletable reading counts in one pass"""
+        return """
+            SELECT 
+                COALESCE(MIN(reading_id), 0) as min_id,
+                COALESCE(MAX(reading_id), 0) as max_id,
+                COUNT(*) as total_readings,
+                COALESCE(SUM(date_imported < %s), 0) as deletable_count
+            FROM reading
+        """, (self.reading_cutoff_date,)
+        
+    def get_closed_contact_type_ids(self) -> List[int]:
+        """Resolve (once per run) the contact_type_id values named 'Closed'"""
+        if self.closed_contact_type_ids is None:
+            with self.open_cursor(unbuffered=True) as cursor:
+                cursor.execute("SELECT contact_type_id FROM contact_type WHERE contact_type = 'Closed'")
+                self.closed_contact_type_ids = [row[0] for row in cursor]
+            self.logger.info(f"Resolved Closed contact_type_id(s) = {self.closed_contact_type_ids}")
+        return self.closed_contact_type_ids
+        
+    def explain(self, sql: str, params: tuple = ()) -> List[Dict]:
+        """Return the (traditional format) EXPLAIN plan of a query as one dict per step"""
+        with self.open_cursor(unbuffered=True) as cursor:
+            cursor.execute("EXPLAIN " + sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+            
+    def explain_row_estimate(self, sql: str, params: tuple = ()):
+        """Optimizer row estimate for a single-table query, or None if EXPLAIN fails"""
         try:
-            # Get total contact count for context
-            self.logger.info("Getting total contact count...")
-            cursor.execute("SELECT COUNT(*) FROM contact")
-            total_contacts = cursor.fetchone()[0]
-            self.logger.info(f"Total contacts in database: {total_contacts:,}")
+            plan = self.explain(sql, params)
+            return int(plan[0].get('rows') or 0)
         except Exception as e:
-            self.logger.error(f"Failed to get total contact count: {e}")
-            return 0, 0, False
-        
-        # Analyze communities (closed and ZY)
-        closed_communities = 0
+            self.logger.warning(f"Could not EXPLAIN row estimate: {e}")
+            return None
+            
+    def check_query_plan(self, label: str, sql: str, params: tuple = (), recommendation: str = None) -> bool:
+        """
+        EXPLAIN a query before running it and warn if MySQL plans a large full table scan.
+        Returns False if such a scan was found (or the plan could not be read).
+        """
         try:
-            self.logger.info("Analyzing closed communities...")
-            cursor.execute("""
-                SELECT COUNT(*) FROM contact c 
-                JOIN contact_type ct ON c.contact_type_id = ct.contact_type_id 
-                WHERE ct.contact_type = 'Closed' 
-                AND c.last_updated_on < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-            """)
-            closed_communities = cursor.fetchone()[0]
-            self.logger.info(f"Closed communities (7+ years old): {closed_communities:,}")
+            plan = self.explain(sql, params)
         except Exception as e:
-            self.logger.error(f"Failed to analyze closed communities: {e}")
-            self.logger.info("Closed communities analysis failed, continuing with ZY analysis...")
-        
-        zy_communities = 0
+            self.logger.warning(f"Could not EXPLAIN {label} query: {e}")
+            return False
+        return self.warn_full_scans(label, plan, recommendation)
+        
+    def warn_full_scans(self, label: str, plan: List[Dict], recommendation: str = None) -> bool:
+        """Warn about each large full table scan in an EXPLAIN plan; returns False if there were any"""
+        ok = True
+        for step in plan:
+            rows = int(step.get('rows') or 0)
+            if step.get('type') == 'ALL' and rows > FULL_SCAN_WARN_ROWS:
+                ok = False
+                self.logger.warning(f"{label} query plans a full scan of {step.get('table')} "
+                                    f"(~{rows:,} rows, possible keys: {step.get('possible_keys')})")
+                if recommendation:
+                    self.logger.warning(f"Consider: {recommendation}")
+        return ok
+        
+    def check_company_name_index(self, cursor):
+        """Warn (once) if no index leads with contact.company_name, so zy_cutoff_query() must scan"""
+        if self.company_name_index_checked:
+            return
+        self.company_name_index_checked = True
         try:
-            self.logger.info("Analyzing ZY communities...")
             cursor.execute("""
-                SELECT COUNT(*) FROM contact 
-                WHERE LEFT(company_name, 2) = 'ZY'
-                AND last_updated_on < DATE_SUB(NOW(), INTERVAL 7 YEAR)
+                SELECT COUNT(*) FROM information_schema.statistics
+                WHERE table_schema = DATABASE() AND table_name = 'contact'
+                AND column_name = 'company_name' AND seq_in_index = 1
             """)
-            zy_communities = cursor.fetchone()[0]
-            self.logger.info(f"ZY communities (7+ years old): {zy_communities:,}")
+            if cursor.fetchone()[0] == 0:
+                self.logger.warning("No index on contact.company_name - the ZY community cutoff lookup "
+                                    "will scan the contact table. "
+                                    "Consider: CREATE INDEX idx_contact_company_prefix "
+                                    "ON contact(company_name(8), last_updated_on)")
         except Exception as e:
-            self.logger.error(f"Failed to analyze ZY communities: {e}")
-            self.logger.info("ZY communities analysis failed, continuing...")
-        
-        total_communities = closed_communities + zy_communities
-        self.logger.info(f"Total communities for deletion: {total_communities:,}")
-        
-        # Find cutoff ID for communities
-        cutoff_id = 0
-        try:
-            self.logger.info("Finding cutoff ID for communities...")
-            cursor.execute("""
-                SELECT COALESCE(MAX(contact_id), 0) as cutoff_id
-                FROM contact c
-                JOIN contact_type ct ON c.contact_type_id = ct.contact_type_id
-                WHERE (
-                    ct.contact_type = 'Closed'           -- Explicitly closed communities  
-                    OR LEFT(c.company_name, 2) = 'ZY'   -- ZY'd communities
-                )
-                AND c.last_updated_on < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-            """)
-            cutoff_id = cursor.fetchone()[0]
-            self.logger.info(f"Community cutoff ID: {cutoff_id}")
-        except Exception as e:
-            self.logger.error(f"Failed to find cutoff ID for communities: {e}")
-            # If we can't find cutoff ID, use a safe default
-            cutoff_id = 0
-        
-        # Count total deletable communities
-        estimated_deletions = total_communities
-        
-        # Calculate percentage
-        deletion_percentage = (estimated_deletions / total_contacts * 100) if total_contacts > 0 else 0
-        self.logger.info(f"Contacts to be deleted: {estimated_deletions:,} ({deletion_percentage:.1f}% of total)")
-        self.logger.info(f"Contacts to be retained: {total_contacts - estimated_deletions:,} ({100 - deletion_percentage:.1f}% of total)")
+            self.logger.error(f"Failed to check contact indexes: {e}")
+            
+    def contact_scan_query(self, closed_type_ids: List[int]) -> Tuple[str, tuple]:
+        """Single pass over contact for the total, the closed/ZY counts and first recent ID"""
+        cutoff_date = self.contact_cutoff_date
+        if closed_type_ids:
+            closed_match = f"c.contact_type_id IN ({', '.join(['%s'] * len(closed_type_ids))})"
+        else:
+            closed_match = "FALSE"
+        closed_params = tuple(closed_type_ids)
+        # Comments stay out of the SQL: this runs on a prepared cursor, whose
+        # %s -> ? rewrite skips anything after an unpaired quote, even in a comment
+        return f"""
+            SELECT 
+                COUNT(*) as total_contacts,
+                COALESCE(SUM({closed_match} AND c.last_updated_on < %s), 0) as closed_communities,
+                COALESCE(SUM(c.company_name LIKE 'ZY%%' AND c.last_updated_on < %s), 0) as zy_communities,
+                COALESCE(SUM(({closed_match} OR c.company_name LIKE 'ZY%%')
+                             AND c.last_updated_on < %s), 0) as total_communities,
+                MIN(CASE WHEN c.last_updated_on >= %s THEN c.contact_id END) as first_recent_id
+            FROM contact c
+        """, (closed_params + (cutoff_date,) + (cutoff_date,) + closed_params + (cutoff_date,)
+              + (cutoff_date,))
+        
+    def closed_cutoff_query(self, closed_type_ids: List[int]) -> Tuple[str, tuple]:
+        """Highest explicitly closed community past retention (index range on type + date)"""
+        return f"""
+            SELECT MAX(c.contact_id) FROM contact c
+            WHERE c.contact_type_id IN ({', '.join(['%s'] * len(closed_type_ids))})
+            AND c.last_updated_on < %s
+        """, tuple(closed_type_ids) + (self.contact_cutoff_date,)
+        
+    def zy_cutoff_query(self) -> Tuple[str, tuple]:
+        """Highest ZY community past retention (index range on the company_name prefix)"""
+        return """
+            SELECT MAX(c.contact_id) FROM contact c
+            WHERE c.company_name LIKE 'ZY%%'
+            AND c.last_updated_on < %s
+        """, (self.contact_cutoff_date,)
+        
+    def contact_safety_query(self, cutoff_id: int) -> Tuple[str, tuple]:
+        """
+        Count (up to SAFETY_COUNT_LIMIT) of recently-updated contacts at or below
+        cutoff_id - the LIMIT stops the scan early instead of reading every match
+        """
+        return """
+            SELECT COUNT(*) as recent_activity_count
+            FROM (
+                SELECT 1 FROM contact c
+                WHERE c.contact_id <= %s
+                AND c.last_updated_on >= %s
+                LIMIT %s
+            ) recent
+        """, (cutoff_id, self.contact_cutoff_date, SAFETY_COUNT_LIMIT)
         
-        # Safety check: verify no recent activity above cutoff
-        is_safe = True
-        if cutoff_id > 0:
+    def identify_contact_cutoff(self) -> Tuple[int, int, bool]:
+        """
+        Identify cutoff for inactive contacts (7 years)
+        Returns: (cutoff_id, estimated_deletions, is_safe)
+        """
+        self.logger.info("=== ANALYZING CONTACT TABLE ===")
+        with self.open_cursor(prepared=True) as cursor:
+            
+            self.check_company_name_index(cursor)
+            
             try:
-                self.logger.info("Performing safety check for recent activity...")
-                cursor.execute("""
-                    SELECT COUNT(*) as recent_activity_count
-                    FROM contact c
-                    WHERE c.contact_id <= %s
-                    AND c.last_updated_on >= DATE_SUB(NOW(), INTERVAL 7 YEAR)
-                """, (cutoff_id,))
-                recent_activity_count = cursor.fetchone()[0]
+                closed_type_ids = self.get_closed_contact_type_ids()
+            except Exception as e:
+                self.logger.error(f"Failed to resolve Closed contact type: {e}")
+                return 0, 0, False
+            if not closed_type_ids:
+                self.logger.warning("No 'Closed' contact type found; only ZY communities will be considered")
+            
+            try:
+                # One pass over contact for the total, the closed/ZY community counts
+                # and the lowest recently-updated contact_id that the safety check
+                # compares against the cutoff
+                self.logger.info("Analyzing contacts and closed/ZY communities...")
+                cursor.execute(*self.contact_scan_query(closed_type_ids))
+                (total_contacts, closed_communities, zy_communities, total_communities,
+                 first_recent_id) = cursor.fetchone()
+                # The community cutoff comes from two separate MAX lookups, one per
+                # branch, so each can range-scan its own index instead of the scan
+                closed_cutoff_id = 0
+                if closed_type_ids:
+                    cursor.execute(*self.closed_cutoff_query(closed_type_ids))
+                    closed_cutoff_id = cursor.fetchone()[0] or 0
+                cursor.execute(*self.zy_cutoff_query())
+                zy_cutoff_id = cursor.fetchone()[0] or 0
+                cutoff_id = max(closed_cutoff_id, zy_cutoff_id)
+                closed_communities = int(closed_communities)
+                zy_communities = int(zy_communities)
+                total_communities = int(total_communities)
+            except Exception as e:
+                self.logger.error(f"Failed to analyze contact table: {e}")
+                return 0, 0, False
                 
-                is_safe = recent_activity_count == 0
+            # Count total deletable communities
+            estimated_deletions = total_communities
+            
+            # The breakdown and percentages only feed the progress narration,
+            # so skip formatting them when --quiet has muted INFO
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"Total contacts in database: {total_contacts:,}")
+                self.logger.info(f"Closed communities (7+ years old): {closed_communities:,}")
+                self.logger.info(f"ZY communities (7+ years old): {zy_communities:,}")
+                self.logger.info(f"Total communities for deletion: {total_communities:,}")
+                self.logger.info(f"Community cutoff ID: {cutoff_id} (closed: {closed_cutoff_id}, ZY: {zy_cutoff_id})")
                 
-                if is_safe:
-                    self.logger.info("✓ Safety check passed: No recent activity found above cutoff")
-                else:
-                    self.logger.warning(f"⚠ Safety check failed: {recent_activity_count} contacts with recent activity above cutoff")
-            except Exception as e:
-                self.logger.error(f"Failed to perform safety check: {e}")
-                is_safe = False
-        
-        self.logger.info("=== CONTACT ANALYSIS COMPLETE ===")
-        self.logger.info(f"RESULT: Cutoff ID = {cutoff_id}, Deletions = {estimated_deletions:,}, Safe = {is_safe}")
-        
-        return cutoff_id, estimated_deletions, is_safe
+                deletion_percentage = (estimated_deletions / total_contacts * 100) if total_contacts > 0 else 0
+                self.logger.info(f"Contacts to be deleted: {estimated_deletions:,} ({deletion_percentage:.1f}% of total)")
+                self.logger.info(f"Contacts to be retained: {total_contacts - estimated_deletions:,} ({100 - deletion_percentage:.1f}% of total)")
+            
+            # Safety check: recent activity at or below the cutoff exists exactly
+            # when the lowest recently-updated contact_id is <= cutoff_id
+            is_safe = cutoff_id == 0 or first_recent_id is None or first_recent_id > cutoff_id
+            if is_safe:
+                self.logger.info("✓ Safety check passed: No recent activity found above cutoff")
+            else:
+                # Only count the offending rows when there are some to report
+                try:
+                    safety_sql, safety_params = self.contact_safety_query(cutoff_id)
+                    self.check_query_plan("Contact safety check", safety_sql, safety_params,
+                                          RECOMMENDED_CONTACT_INDEX)
+                    cursor.execute(safety_sql, safety_params)
+                    recent_activity_count = cursor.fetchone()[0]
+                    if recent_activity_count >= SAFETY_COUNT_LIMIT:
+                        recent_activity_count = f"{SAFETY_COUNT_LIMIT}+"
+                    self.logger.warning(f"⚠ Safety check failed: {recent_activity_count} contacts with recent activity above cutoff "
+                                        f"(first: contact_id {first_recent_id})")
+                except Exception as e:
+                    self.logger.error(f"Failed to count recent activity above cutoff: {e}")
+                    self.logger.warning(f"⚠ Safety check failed: contact_id {first_recent_id} has recent activity above cutoff")
+            
+            self.logger.info("=== CONTACT ANALYSIS COMPLETE ===")
+            self.result_logger.info(f"RESULT: Cutoff ID = {cutoff_id}, Deletions = {estimated_deletions:,}, Safe = {is_safe}")
+            
+            return cutoff_id, estimated_deletions, is_safe
         
     def get_table_stats(self, table_name: str) -> Dict:
-        """Get current table statistics"""
-        cursor = self.db.cursor()
-        try:
-            cursor.execute("""
-                SELECT 
-                    table_rows,
-                    ROUND(data_length/1024/1024, 2) as data_mb,
-                    ROUND(index_length/1024/1024, 2) as index_mb,
-                    ROUND((data_length+index_length)/1024/1024, 2) as total_mb
-                FROM information_schema.tables 
-                WHERE table_schema = 'nes' AND table_name = %s
-            """, (table_name,))
-            
-            result = cursor.fetchone()
-            if result:
-                return {
-                    'rows': result[0],
-                    'data_mb': result[1],
-                    'index_mb': result[2],
-                    'total_mb': result[3]
-                }
-        except Exception as e:
-            self.logger.error(f"Failed to get statistics for table {table_name}: {e}")
+        """Get current table statistics (reusing any already read this run)"""
+        if table_name in self.table_stats:
+            return self.table_stats[table_name]
+        return self.get_all_table_stats([table_name])[table_name]
         
-        return {}
+    def get_all_table_stats(self, tables: List[str]) -> Dict[str, Dict]:
+        """
+        Get current statistics for several tables in one information_schema query.
+        Results are kept in self.table_stats for the rest of the run.
+        """
+        stats = {table: {} for table in tables}
+        with self.open_cursor(unbuffered=True) as cursor:
+            try:
+                placeholders = ', '.join(['%s'] * len(tables))
+                cursor.execute(f"""
+                    SELECT 
+                        table_name,
+                        table_rows,
+                        ROUND(data_length/1024/1024, 2) as data_mb,
+                        ROUND(index_length/1024/1024, 2) as index_mb,
+                        ROUND((data_length+index_length)/1024/1024, 2) as total_mb
+                    FROM information_schema.tables 
+                    WHERE table_schema = %s AND table_name IN ({placeholders})
+                """, (self.db_config.get('database', 'nes'),) + tuple(tables))
+                
+                for table_name, rows, data_mb, index_mb, total_mb in cursor:
+                    stats[table_name] = asdict(TableStats(rows, data_mb, index_mb, total_mb))
+            except Exception as e:
+                self.logger.error(f"Failed to get table statistics: {e}")
+                return stats
+            
+            self.table_stats.update(stats)
+            return stats
         
     def generate_cutoff_report(self) -> Dict:
         """Generate comprehensive cutoff report"""
@@ -279,53 +685,61 @@ class CutoffIdentifier:
         self.logger.info("="*80)
         
         report = {
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': self.run_started.isoformat(),
             'cutoffs': {},
             'table_stats': {},
             'safety_status': 'UNKNOWN'
         }
         
-        # Identify all cutoffs with verbose progress and error handling
-        self.logger.info("Phase 1/2: Reading table analysis...")
-        try:
-            reading_cutoff, reading_deletions, reading_safe = self.identify_reading_cutoff()
-        except Exception as e:
-            self.logger.error(f"Reading analysis failed: {e}")
-            reading_cutoff, reading_deletions, reading_safe = 0, 0, False
-        
-        self.logger.info("\nPhase 2/2: Contact table analysis...")
-        try:
-            contact_cutoff, contact_deletions, contact_safe = self.identify_contact_cutoff()
-        except Exception as e:
-            self.logger.error(f"Contact analysis failed: {e}")
-            contact_cutoff, contact_deletions, contact_safe = 0, 0, False
-        
-        self.logger.info("\nGathering table statistics...")
-        # Get table statistics with error handling
-        for table in ['reading', 'contact', 'email', 'invoice_detail', 'address']:
+        self.logger.info("Gathering table statistics...")
+        # Get statistics for all tables in a single round trip
+        report['table_stats'] = self.get_all_table_stats(['reading', 'contact', 'email', 'invoice_detail', 'address'])
+        
+        if self.explain_only:
+            # Plans only: no cutoffs are computed, so nothing is safe to act on
+            report['plans'] = self.explain_cutoff_queries()
+            report['safety_status'] = 'NOT_ANALYZED'
+            self.logger.info("✓ Query plans collected (cutoff queries were not run)")
+            return report
+        
+        if self.use_cache:
+            id_ranges = self.get_id_ranges()
+            cached = self.load_cached_report(id_ranges)
+            if cached is not None:
+                return cached
+        
+        # The reading and contact analyses are independent read-only scans, so
+        # run them concurrently, each on its own connection
+        self.logger.info("Running reading and contact table analyses concurrently...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            reading_future = executor.submit(self.run_on_own_connection, self.identify_reading_cutoff)
+            contact_future = executor.submit(self.run_on_own_connection, self.identify_contact_cutoff)
+            
             try:
-                self.logger.info(f"Getting statistics for {table} table...")
-                report['table_stats'][table] = self.get_table_stats(table)
+                reading_cutoff, reading_deletions, reading_safe = reading_future.result()
             except Exception as e:
-                self.logger.error(f"Failed to get statistics for {table} table: {e}")
-                report['table_stats'][table] = {}
+                self.logger.error(f"Reading analysis failed: {e}")
+                reading_cutoff, reading_deletions, reading_safe = 0, 0, False
+            
+            try:
+                contact_cutoff, contact_deletions, contact_safe = contact_future.result()
+            except Exception as e:
+                self.logger.error(f"Contact analysis failed: {e}")
+                contact_cutoff, contact_deletions, contact_safe = 0, 0, False
         
         # Store cutoff information
         self.logger.info("\nCompiling final report...")
-        report['cutoffs'] = {
-            'reading': {
-                'cutoff_id': reading_cutoff,
-                'estimated_deletions': reading_deletions,
-                'is_safe': reading_safe,
-                'cutoff_date': (datetime.now() - timedelta(days=730)).isoformat()  # 2 years
-            },
-            'contact': {
-                'cutoff_id': contact_cutoff,
-                'estimated_deletions': contact_deletions,
-                'is_safe': contact_safe,
-                'cutoff_date': (datetime.now() - timedelta(days=2555)).isoformat()  # 7 years
-            }
+        # Deletions are sized for many short, PK-range-bounded transactions rather
+        # than one huge DELETE that would stall the server (and its replicas)
+        cutoffs = {
+            'reading': CutoffEntry(reading_cutoff, reading_deletions, reading_safe,
+                                   self.reading_cutoff_date.isoformat(), SUGGESTED_BATCH_SIZE,
+                                   math.ceil(reading_deletions / SUGGESTED_BATCH_SIZE)),
+            'contact': CutoffEntry(contact_cutoff, contact_deletions, contact_safe,
+                                   self.contact_cutoff_date.isoformat(), SUGGESTED_BATCH_SIZE,
+                                   math.ceil(contact_deletions / SUGGESTED_BATCH_SIZE))
         }
+        report['cutoffs'] = {table: asdict(entry) for table, entry in cutoffs.items()}
             
         # Overall safety status
         all_safe = reading_safe and contact_safe
@@ -333,15 +747,118 @@ class CutoffIdentifier:
         
         self.logger.info("✓ Report generation complete")
         
+        if self.use_cache and id_ranges is not None:
+            report['id_ranges'] = id_ranges
+            self.store_cached_report(report)
+        
         return report
         
+    def explain_cutoff_queries(self) -> Dict[str, List[Dict]]:
+        """
+        EXPLAIN the cutoff queries this run would issue, without running them,
+        and warn about large full table scans. Returns the plans by query name.
+        """
+        self.logger.info("Explaining cutoff queries (they will not be run)...")
+        if self.has_reading_date_index():
+            queries = {'reading_date_probe': self.reading_date_probe_query()}
+        else:
+            queries = {'reading_probe': self.reading_probe_query(0)}
+        if self.estimate_mode == 'exact':
+            queries['reading_counts'] = self.reading_count_query()
+        try:
+            closed_type_ids = self.get_closed_contact_type_ids()
+            queries['contact_scan'] = self.contact_scan_query(closed_type_ids)
+            if closed_type_ids:
+                queries['closed_cutoff'] = self.closed_cutoff_query(closed_type_ids)
+        except Exception as e:
+            self.logger.error(f"Failed to resolve Closed contact type: {e}")
+        queries['zy_cutoff'] = self.zy_cutoff_query()
+        # The safety check's cutoff is not known yet; plan for the widest ID range
+        queries['contact_safety'] = self.contact_safety_query(sys.maxsize)
+        
+        plans = {}
+        for name, (sql, params) in queries.items():
+            try:
+                plans[name] = self.explain(sql, params)
+            except Exception as e:
+                self.logger.error(f"Could not EXPLAIN {name} query: {e}")
+                continue
+            recommendation = RECOMMENDED_CONTACT_INDEX if name == 'contact_safety' else None
+            self.warn_full_scans(name, plans[name], recommendation)
+            for step in plans[name]:
+                self.logger.info(f"{name}: table={step.get('table')} type={step.get('type')} "
+                                 f"key={step.get('key')} rows~{step.get('rows')}")
+        return plans
+        
+    def report_cache_path(self) -> str:
+        """Cache file for this server, database, day and estimate mode"""
+        key = '|'.join([
+            str(self.db_config.get('host')),
+            str(self.db_config.get('database')),
+            self.run_started.strftime('%Y%m%d'),
+            self.estimate_mode
+        ])
+        return os.path.join(REPORT_CACHE_DIR, hashlib.sha256(key.encode()).hexdigest() + '.json')
+        
+    def get_id_ranges(self) -> Optional[Dict[str, List[int]]]:
+        """
+        [MIN, MAX] primary key of reading and contact, each an index-end lookup;
+        None if they could not be read (the cache is then neither used nor written)
+        """
+        try:
+            with self.open_cursor() as cursor:
+                cursor.execute("""
+                    SELECT 
+                        (SELECT MIN(reading_id) FROM reading),
+                        (SELECT MAX(reading_id) FROM reading),
+                        (SELECT MIN(contact_id) FROM contact),
+                        (SELECT MAX(contact_id) FROM contact)
+                """)
+                reading_min, reading_max, contact_min, contact_max = cursor.fetchone()
+        except DB_ERRORS as e:
+            self.logger.warning(f"Could not read ID ranges, not using the report cache: {e}")
+            return None
+        return {'reading': [reading_min, reading_max], 'contact': [contact_min, contact_max]}
+        
+    def load_cached_report(self, id_ranges: Optional[Dict[str, List[int]]]):
+        """
+        Return a previous report for this database if it is recent and the
+        reading/contact ID ranges are the same as in id_ranges; otherwise None
+        """
+        if id_ranges is None:
+            return None
+        path = self.report_cache_path()
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            cached = orjson.loads(data) if orjson is not None else json.loads(data)
+            # A truncated or older-format cache is a miss, not an error
+            age = self.run_started - datetime.fromisoformat(cached['generated_at'])
+            if age > REPORT_CACHE_MAX_AGE:
+                return None
+            if cached['id_ranges'] != id_ranges:
+                return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+            
+        self.logger.info(f"Reusing cached cutoff report from {cached['generated_at']} ({path})")
+        return cached
+        
+    def store_cached_report(self, report: Dict):
+        """Keep this run's report for --use-cache reruns (failures are not fatal)"""
+        try:
+            os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+            # Only read back by --use-cache, so skip the indentation
+            write_json(report, self.report_cache_path(), indent=False)
+        except OSError as e:
+            self.logger.warning(f"Could not write report cache: {e}")
+        
     def save_report(self, report: Dict, filename: str = None):
         """Save report to file"""
         if filename is None:
-            filename = f"cutoff_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            filename = f"cutoff_report_{self.run_started.strftime('%Y%m%d_%H%M%S')}.json"
             
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2, cls=DecimalEncoder)
+        write_json(report, filename)
             
         self.logger.info(f"Report saved to {filename}")
         return filename
@@ -353,15 +870,29 @@ def main():
     parser.add_argument('--password', required=True, help='Database password')
     parser.add_argument('--database', default='nes', help='Database name')
     parser.add_argument('--output', help='Output filename for report')
+    parser.add_argument('--estimate-mode', choices=['exact', 'explain', 'id-range'], default='exact',
+                       help='How to count readings: exact COUNT, optimizer (EXPLAIN) estimate, or reading_id range arithmetic')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Only log warnings, errors and results (skip progress narration)')
+    parser.add_argument('--use-cache', action='store_true',
+                       help="Reuse today's cached report if it is under 24h old and the reading/contact ID ranges are unchanged")
+    parser.add_argument('--fast-estimate', dest='estimate_mode', action='store_const', const='id-range',
+                       help='Shorthand for --estimate-mode=id-range')
+    parser.add_argument('--dry-run-explain', action='store_true',
+                       help='Only EXPLAIN the cutoff queries and save their plans (no cutoffs are computed)')
     
     args = parser.parse_args()
     
-    # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    db_config = {
+        'host': args.host,
+        'user': args.user,
+        'password': args.password,
+        'database': args.database
+    }
+    
+    # The identifier configures logging (console + log file) on construction
+    identifier = CutoffIdentifier(db_config, estimate_mode=args.estimate_mode, quiet=args.quiet,
+                                  use_cache=args.use_cache, explain_only=args.dry_run_explain)
     logger = logging.getLogger(__name__)
     
     logger.info("="*80)
@@ -372,15 +903,6 @@ def main():
     logger.info(f"Database User: {args.user}")
     logger.info("="*80)
     
-    db_config = {
-        'host': args.host,
-        'user': args.user,
-        'password': args.password,
-        'database': args.database
-    }
-    
-    identifier = CutoffIdentifier(db_config)
-    
     try:
         logger.info("Connecting to database...")
         identifier.connect()
@@ -393,25 +915,34 @@ def main():
         filename = identifier.save_report(report, args.output)
         logger.info(f"✓ Report saved to: {filename}")
         
-        logger.info("\n" + "="*80)
-        logger.info("CUTOFF IDENTIFICATION COMPLETE - SUMMARY")
-        logger.info("="*80)
+        if args.dry_run_explain:
+            identifier.result_logger.info(f"Query plans for {', '.join(report['plans'])} saved to: {filename}")
+            return
+        
+        # The summary is the run's result, so it is logged even with --quiet
+        results = identifier.result_logger
+        results.info("\n" + "="*80)
+        results.info("CUTOFF IDENTIFICATION COMPLETE - SUMMARY")
+        results.info("="*80)
         
         total_deletions = 0
         for table, data in report['cutoffs'].items():
-            logger.info(f"\n{table.upper()}:")
-            logger.info(f"  Cutoff ID: {data['cutoff_id']:,}")
-            logger.info(f"  Estimated Deletions: {data['estimated_deletions']:,}")
-            logger.info(f"  Safety Status: {'✓ SAFE' if data['is_safe'] else '⚠ REQUIRES REVIEW'}")
+            results.info(f"\n{table.upper()}:")
+            results.info(f"  Cutoff ID: {data['cutoff_id']:,}")
+            results.info(f"  Estimated Deletions: {data['estimated_deletions']:,}")
+            if 'suggested_batches' in data:
+                results.info(f"  Suggested Batches: {data['suggested_batches']:,} "
+                             f"x {data['suggested_batch_size']:,} rows")
+            results.info(f"  Safety Status: {'✓ SAFE' if data['is_safe'] else '⚠ REQUIRES REVIEW'}")
             total_deletions += data['estimated_deletions']
             
-        logger.info(f"\nTOTAL ESTIMATED DELETIONS: {total_deletions:,}")
-        logger.info(f"Overall Safety Status: {report['safety_status']}")
-        logger.info(f"Report File: {filename}")
-        logger.info("="*80)
+        results.info(f"\nTOTAL ESTIMATED DELETIONS: {total_deletions:,}")
+        results.info(f"Overall Safety Status: {report['safety_status']}")
+        results.info(f"Report File: {filename}")
+        results.info("="*80)
         
         if report['safety_status'] == 'SAFE':
-            logger.info("✅ All cutoffs are SAFE - ready for deletion execution")
+            results.info("✅ All cutoffs are SAFE - ready for deletion execution")
         else:
             logger.warning("⚠️  Some cutoffs require review - check safety issues before proceeding")
             
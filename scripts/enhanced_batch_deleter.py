@@ -5,23 +5,139 @@ This enhanced version handles proper deletion order and polymorphic relationship
 """
 
 import mysql.connector
+import mysql.connector.pooling
+from mysql.connector.constants import ClientFlag
 import argparse
 import json
 import logging
 import time
 import signal
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Non-billing readings older than this are deleted
+READING_RETENTION = timedelta(days=730)  # 2 years
+
+# Connections shared by the main deleter and any per-table workers
+POOL_SIZE = 8
+
+# Session settings for every deleting connection: READ COMMITTED takes row locks
+# without gap locks, and a short lock wait fails fast instead of queueing behind
+# application traffic (a rerun resumes from the remaining contacts)
+SESSION_SETTINGS = [
+    "SET SESSION transaction_isolation = 'READ-COMMITTED'",
+    "SET SESSION innodb_lock_wait_timeout = 5",
+]
+
+# Contact dependencies in deletion order. Tables within a level do not reference
+# each other, so a level's tables can be deleted concurrently (the direct FK
+# level instead goes to the server as one multi-statement).
+EMAIL_DEPENDENCY_TABLES = ['email_attachment', 'email_preview']
+DIRECT_DEPENDENCY_TABLES = [
+    'bank', 'subscription', 'contact_batch', 'contact_logical_unit',
+    'nes_anet_customer_profile'
+]
+CONTACT_DEPENDENCY_LEVELS = [
+    EMAIL_DEPENDENCY_TABLES + ['note', 'phone', 'address'],  # Leaf tables
+    ['email'],  # After attachments/previews
+    ['tenant'],
+    DIRECT_DEPENDENCY_TABLES,  # Direct foreign keys
+]
+
+# Tables deleted by object_type_id/object_id (email also drives the attachment/preview joins)
+POLYMORPHIC_TABLES = ['note', 'phone', 'address', 'email', 'tenant']
+
+# EXPLAIN access types that probe an index rather than scanning the table
+INDEXED_ACCESS_TYPES = ('const', 'eq_ref', 'ref', 'range')
+
+# Most ids bound into one IN (...) list, keeping statements well under parser limits
+IN_LIST_CHUNK_SIZE = 1000
+
+# Non-billing readings in a reading_id window
+READING_DELETE_SQL = """
+    DELETE FROM reading
+    WHERE reading_id > %s AND reading_id <= %s
+    AND reading_date < %s
+    AND NOT EXISTS (SELECT 1 FROM sm_usage su WHERE su.reading_id = reading.reading_id)
+"""
+
+# Next batch of contact IDs up to the cutoff, by keyset
+CONTACT_PAGE_SQL = """
+    SELECT contact_id FROM contact
+    WHERE contact_id > %s AND contact_id <= %s
+    ORDER BY contact_id
+    LIMIT %s
+"""
+
+# A batch of contacts, once their dependencies are gone
+CONTACT_DELETE_SQL = "DELETE FROM contact WHERE contact_id BETWEEN %s AND %s"
+
+# Server-side equivalent of the whole contact cascade, see sql/delete-contacts-cascade.sql
+CASCADE_PROCEDURE = 'delete_contacts_cascade'
+
+def chunked(ids: List[int], size: int):
+    """Yield consecutive slices of ids holding at most size items"""
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+def multi_statement_rowcounts(cursor, sql: str, params: List) -> List[int]:
+    """
+    Execute a ;-joined multi-statement of DML (the connection needs
+    ClientFlag.MULTI_STATEMENTS) and return each statement's rowcount in order
+    """
+    cursor.execute(sql, params)
+    rowcounts = [cursor.rowcount]
+    while cursor.nextset():
+        rowcounts.append(cursor.rowcount)
+    return rowcounts
+
+@lru_cache(maxsize=None)
+def polymorphic_delete_sql(table_name: str, id_count: int) -> str:
+    """DELETE of a table's rows owned by id_count objects of one type"""
+    placeholders = ', '.join(['%s'] * id_count)
+    return f"""
+        DELETE FROM {table_name} 
+        WHERE object_type_id = %s AND object_id IN ({placeholders})
+    """
+
+@lru_cache(maxsize=None)
+def email_dependency_delete_sql(dependency_table: str, id_count: int) -> str:
+    """DELETE of attachments/previews of the emails owned by id_count objects of one type"""
+    placeholders = ', '.join(['%s'] * id_count)
+    return f"""
+        DELETE dep FROM {dependency_table} dep
+        JOIN email e ON dep.email_id = e.email_id
+        WHERE e.object_type_id = %s AND e.object_id IN ({placeholders})
+    """
 
 class EnhancedBatchDeleter:
-    def __init__(self, db_config: dict, cutoff_config: dict):
+    def __init__(self, db_config: dict, cutoff_config: dict, server_side_cascade: bool = False,
+                 skip_binlog: bool = False):
         """Initialize with database and cutoff configuration"""
         self.db_config = db_config
         self.cutoff_config = cutoff_config
+        # Keep this run's deletes out of the binary log (replicas will NOT see them)
+        self.skip_binlog = skip_binlog
+        # Run each batch's whole cascade as one CALL (sql/delete-contacts-cascade.sql)
+        self.server_side_cascade = server_side_cascade
+        # Computed once, so every batch of a run deletes against the same cutoff
+        self.reading_cutoff_date = datetime.now() - READING_RETENTION
+        self.pool = None
         self.db = None
+        self.cursor = None
+        self.executor = None
+        # Each thread's (connection, cursor, prepared cursors), see session()
+        self._local = threading.local()
+        self._worker_sessions = []
+        self._main_prepared = {}
         self.interrupted = False
         self.object_type_cache = {}
+        self.contact_object_type_id = None
+        self.dependency_levels = CONTACT_DEPENDENCY_LEVELS
         self.setup_logging()
         self.setup_signal_handlers()
         
@@ -44,10 +160,25 @@ class EnhancedBatchDeleter:
         self.interrupted = True
         
     def connect(self):
-        """Connect to database"""
+        """Connect to database (through a connection pool)"""
         try:
-            self.db = mysql.connector.connect(**self.db_config)
-            self.db.autocommit = False  # Use transactions
+            if self.pool is None:
+                # Set through the pool config: assigning autocommit on a pooled
+                # connection would only touch the wrapper, never the session
+                db_config = self.db_config.copy()
+                db_config['autocommit'] = False  # Use transactions
+                self.pool = mysql.connector.pooling.MySQLConnectionPool(
+                    pool_name='nes_enhanced_cleanup', pool_size=POOL_SIZE,
+                    client_flags=[ClientFlag.MULTI_STATEMENTS],  # See delete_direct_dependencies()
+                    **db_config
+                )
+            self.db = self.pool.get_connection()
+            self.cursor = self.db.cursor()
+            self.configure_session(self.cursor)
+            self._local.session = (self.db, self.cursor, {})
+            self._main_prepared = self._local.session[2]
+            # Level workers each hold one more pooled connection (see session())
+            self.executor = ThreadPoolExecutor(max_workers=POOL_SIZE - 1)
             self.logger.info("Connected to database successfully")
         except mysql.connector.Error as e:
             self.logger.error(f"Database connection failed: {e}")
@@ -55,13 +186,67 @@ class EnhancedBatchDeleter:
             
     def disconnect(self):
         """Disconnect from database"""
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+        for db, cursor, prepared in self._worker_sessions:
+            for prepared_cursor in prepared.values():
+                prepared_cursor.close()
+            cursor.close()
+            db.close()  # Returns the connection to the pool
+        self._worker_sessions = []
         if self.db:
-            self.db.close()
+            self._local.session = None
+            for prepared_cursor in self._main_prepared.values():
+                prepared_cursor.close()
+            self._main_prepared = {}
+            self.cursor.close()
+            self.cursor = None
+            self.db.close()  # Returns the connection to the pool
+            self.db = None
             self.logger.info("Disconnected from database")
             
+    def session(self):
+        """
+        Return the calling thread's (connection, cursor, prepared cursors). All
+        are reused for the whole run: the main thread's are opened by connect(),
+        and each level worker checks one connection out of the pool on first use.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            db = self.pool.get_connection()
+            session = (db, db.cursor(), {})
+            self.configure_session(session[1])
+            self._local.session = session
+            self._worker_sessions.append(session)
+        return session
+        
+    def configure_session(self, cursor):
+        """
+        Apply SESSION_SETTINGS (and sql_log_bin = 0 with skip_binlog) to a newly
+        checked-out connection; the pool resets session variables on return,
+        so this runs for every checkout
+        """
+        for statement in SESSION_SETTINGS:
+            cursor.execute(statement)
+        if self.skip_binlog:
+            cursor.execute("SET SESSION sql_log_bin = 0")
+            
+    def prepared_cursor(self, sql: str):
+        """
+        Prepared-statement cursor for sql on the calling thread's connection.
+        Each distinct statement is prepared on the server once per connection.
+        """
+        db, _, prepared = self.session()
+        cursor = prepared.get(sql)
+        if cursor is None:
+            cursor = db.cursor(prepared=True)
+            prepared[sql] = cursor
+        return cursor
+        
     def load_object_types(self):
         """Load and cache object type mappings"""
-        cursor = self.db.cursor()
+        cursor = self.cursor
         cursor.execute("SELECT object_type_id, object_type FROM object")
         
         for row in cursor.fetchall():
@@ -69,252 +254,316 @@ class EnhancedBatchDeleter:
             
         self.logger.info(f"Loaded {len(self.object_type_cache)} object types")
         
-    def get_contact_object_type_id(self) -> Optional[int]:
-        """Get the object_type_id for Contact entities"""
-        return self.object_type_cache.get('Contact')
+        # Resolved once here rather than looked up for every batch
+        if 'Contact' not in self.object_type_cache:
+            raise ValueError("Object type 'Contact' not found in object table")
+        self.contact_object_type_id = self.object_type_cache['Contact']
         
-    def delete_polymorphic_records(self, table_name: str, object_id: int, object_type_id: int, batch_size: int = 1000) -> int:
+    def check_polymorphic_indexes(self, force: bool = False):
         """
-        Delete polymorphic records for a given object_id and object_type_id
-        Returns: number of records deleted
+        EXPLAIN the per-table polymorphic DELETE and refuse to run if any table
+        would be scanned rather than probed through an (object_type_id, object_id)
+        index. force downgrades the failure to a logged error.
         """
-        cursor = self.db.cursor()
-        total_deleted = 0
+        object_type_id = self.contact_object_type_id
+        cursor = self.cursor
+        unindexed = []
         
-        while not self.interrupted:
-            # Delete in batches to avoid long-running transactions
+        for table_name in POLYMORPHIC_TABLES:
             cursor.execute(f"""
-                DELETE FROM {table_name} 
-                WHERE object_id = %s AND object_type_id = %s 
-                LIMIT %s
-            """, (object_id, object_type_id, batch_size))
-            
-            deleted_count = cursor.rowcount
-            total_deleted += deleted_count
+                EXPLAIN DELETE FROM {table_name}
+                WHERE object_type_id = %s AND object_id IN (%s)
+            """, (object_type_id, 0))
+            columns = [column[0] for column in cursor.description]
+            for row in cursor.fetchall():
+                step = dict(zip(columns, row))
+                if step.get('type') not in INDEXED_ACCESS_TYPES:
+                    unindexed.append(table_name)
+                    self.logger.error(f"DELETE on {table_name} plans a {step.get('type')} access "
+                                      f"(~{int(step.get('rows') or 0):,} rows). "
+                                      f"Consider: CREATE INDEX idx_{table_name}_object "
+                                      f"ON {table_name}(object_type_id, object_id)")
+                    
+        if unindexed and not force:
+            raise RuntimeError(f"No usable (object_type_id, object_id) index on: {', '.join(unindexed)} "
+                               f"(use --force to run anyway)")
             
-            if deleted_count == 0:
+    def delete_polymorphic_records(self, table_name: str, contact_ids: List[int]) -> int:
+        """
+        Delete polymorphic records owned by any of contact_ids, one IN-list
+        statement per chunk of IN_LIST_CHUNK_SIZE ids
+        Returns: number of records deleted
+        """
+        object_type_id = self.contact_object_type_id
+        total_deleted = 0
+        
+        for chunk in chunked(contact_ids, IN_LIST_CHUNK_SIZE):
+            if self.interrupted:
                 break
                 
-            self.db.commit()
+            sql = polymorphic_delete_sql(table_name, len(chunk))
+            cursor = self.prepared_cursor(sql)
+            cursor.execute(sql, [object_type_id, *chunk])
+            total_deleted += cursor.rowcount
             
-            if deleted_count < batch_size:
-                break
-                
         return total_deleted
         
-    def delete_contact_dependencies(self, contact_id: int) -> Dict[str, int]:
+    def skip_empty_dependency_tables(self):
         """
-        Delete all dependencies for a contact in proper order
-        Returns: dictionary of table_name -> deleted_count
+        Drop dependency tables that hold no rows at all from this run's levels,
+        so no batch spends a DELETE (or a pooled worker) on them
         """
-        deleted_counts = {}
-        contact_object_type_id = self.get_contact_object_type_id()
-        
-        if not contact_object_type_id:
-            self.logger.warning("Could not find Contact object type ID")
-            return deleted_counts
-            
-        # Level 1: Leaf tables with polymorphic relationships
-        polymorphic_tables = ['email_attachment', 'email_preview', 'note', 'phone', 'address']
+        cursor = self.cursor
+        levels = []
         
-        for table in polymorphic_tables:
-            if self.interrupted:
-                break
-                
-            try:
-                # For email_attachment and email_preview, we need to delete via email table
-                if table in ['email_attachment', 'email_preview']:
-                    deleted_count = self.delete_email_dependencies(contact_id, contact_object_type_id, table)
+        for level in CONTACT_DEPENDENCY_LEVELS:
+            tables = []
+            for table_name in level:
+                cursor.execute(f"SELECT 1 FROM {table_name} LIMIT 1")
+                if cursor.fetchall():
+                    tables.append(table_name)
                 else:
-                    # Direct polymorphic deletion
-                    deleted_count = self.delete_polymorphic_records(table, contact_id, contact_object_type_id)
-                    
-                deleted_counts[table] = deleted_count
-                if deleted_count > 0:
-                    self.logger.info(f"Deleted {deleted_count} {table} records for contact {contact_id}")
-                    
-            except Exception as e:
-                self.logger.error(f"Error deleting {table} for contact {contact_id}: {e}")
-                self.db.rollback()
-                raise
-                
-        # Level 2: Email records (after attachments/previews)
-        if not self.interrupted:
-            try:
-                deleted_count = self.delete_polymorphic_records('email', contact_id, contact_object_type_id)
-                deleted_counts['email'] = deleted_count
-                if deleted_count > 0:
-                    self.logger.info(f"Deleted {deleted_count} email records for contact {contact_id}")
-            except Exception as e:
-                self.logger.error(f"Error deleting emails for contact {contact_id}: {e}")
-                self.db.rollback()
-                raise
-                
-        # Level 3: Tenant records
-        if not self.interrupted:
-            try:
-                deleted_count = self.delete_polymorphic_records('tenant', contact_id, contact_object_type_id)
-                deleted_counts['tenant'] = deleted_count
-                if deleted_count > 0:
-                    self.logger.info(f"Deleted {deleted_count} tenant records for contact {contact_id}")
-            except Exception as e:
-                self.logger.error(f"Error deleting tenants for contact {contact_id}: {e}")
-                self.db.rollback()
-                raise
+                    self.logger.info(f"Skipping {table_name}: table is empty")
+            if tables:
+                levels.append(tables)
                 
-        # Level 4: Direct foreign key dependencies
-        direct_dependencies = [
-            'bank', 'subscription', 'contact_batch', 'contact_logical_unit', 
-            'nes_anet_customer_profile'
-        ]
+        self.dependency_levels = levels
         
-        for table in direct_dependencies:
+    def delete_contact_dependencies(self, contact_ids: List[int]) -> Dict[str, int]:
+        """
+        Delete all dependencies for a batch of contacts in proper order.
+        Tables within a level are deleted concurrently on pooled connections,
+        each committing once; single-table levels and the direct FK
+        multi-statement run on the main connection and are left uncommitted so
+        they share the batch's contact DELETE transaction.
+        Returns: dictionary of table_name -> deleted_count
+        """
+        deleted_counts = {}
+        
+        for level in self.dependency_levels:
             if self.interrupted:
                 break
                 
-            try:
-                cursor = self.db.cursor()
-                cursor.execute(f"DELETE FROM {table} WHERE contact_id = %s", (contact_id,))
-                deleted_count = cursor.rowcount
-                deleted_counts[table] = deleted_count
-                
-                if deleted_count > 0:
-                    self.logger.info(f"Deleted {deleted_count} {table} records for contact {contact_id}")
-                    
-                self.db.commit()
-                
-            except Exception as e:
-                self.logger.error(f"Error deleting {table} for contact {contact_id}: {e}")
-                self.db.rollback()
-                raise
+            if level[0] in DIRECT_DEPENDENCY_TABLES:
+                counts = self.delete_direct_dependencies(level, contact_ids)
+            elif len(level) == 1:
+                counts = [self.delete_dependency_table(level[0], contact_ids, commit=False)]
+            else:
+                # All of a level finishes before the next starts, preserving FK order
+                counts = list(self.executor.map(
+                    lambda table: self.delete_dependency_table(table, contact_ids),
+                    level
+                ))
                 
+            deleted_counts.update(zip(level, counts))
+            
         return deleted_counts
         
-    def delete_email_dependencies(self, contact_id: int, contact_object_type_id: int, dependency_table: str) -> int:
-        """Delete email attachments/previews for emails belonging to a contact"""
-        cursor = self.db.cursor()
+    def delete_dependency_table(self, table_name: str, contact_ids: List[int],
+                                commit: bool = True) -> int:
+        """
+        Delete one dependency table's rows for a batch of contacts on this thread's
+        session, committing once at the end (if anything was deleted) unless
+        commit is False
+        """
+        db = self.session()[0]
+        try:
+            if table_name in EMAIL_DEPENDENCY_TABLES:
+                # Attachments/previews hang off email rather than the contact
+                deleted_count = self.delete_email_dependencies(contact_ids, table_name)
+            else:
+                deleted_count = self.delete_polymorphic_records(table_name, contact_ids)
+            if commit and deleted_count > 0:
+                db.commit()
+            return deleted_count
+        except Exception as e:
+            self.logger.error(f"Error deleting {table_name} for contacts {contact_ids[0]}-{contact_ids[-1]}: {e}")
+            db.rollback()
+            raise
+            
+    def delete_direct_dependencies(self, tables: List[str], contact_ids: List[int]) -> List[int]:
+        """
+        Delete the rows of every direct FK table in tables for a batch of contacts,
+        sending all the tables' DELETEs in one multi-statement round trip per IN-list
+        chunk. Runs on the main connection, uncommitted, like the other
+        single-connection levels.
+        Returns: deleted counts in tables order
+        """
+        db, cursor, _ = self.session()
+        totals = [0] * len(tables)
         
-        # First get all email IDs for this contact
-        cursor.execute("""
-            SELECT email_id FROM email 
-            WHERE object_id = %s AND object_type_id = %s
-        """, (contact_id, contact_object_type_id))
+        try:
+            for chunk in chunked(contact_ids, IN_LIST_CHUNK_SIZE):
+                if self.interrupted:
+                    break
+                    
+                placeholders = ', '.join(['%s'] * len(chunk))
+                sql = ';'.join(f"DELETE FROM {table} WHERE contact_id IN ({placeholders})"
+                               for table in tables)
+                for i, rowcount in enumerate(multi_statement_rowcounts(cursor, sql, chunk * len(tables))):
+                    totals[i] += rowcount
+        except Exception as e:
+            self.logger.error(f"Error deleting direct dependencies for contacts "
+                              f"{contact_ids[0]}-{contact_ids[-1]}: {e}")
+            db.rollback()
+            raise
+            
+        return totals
         
-        email_ids = [row[0] for row in cursor.fetchall()]
+    def delete_email_dependencies(self, contact_ids: List[int], dependency_table: str) -> int:
+        """Delete email attachments/previews for emails belonging to a batch of contacts"""
+        contact_object_type_id = self.contact_object_type_id
         total_deleted = 0
         
-        for email_id in email_ids:
+        for chunk in chunked(contact_ids, IN_LIST_CHUNK_SIZE):
             if self.interrupted:
                 break
                 
-            cursor.execute(f"DELETE FROM {dependency_table} WHERE email_id = %s", (email_id,))
+            # Join through email instead of fetching its ids first
+            sql = email_dependency_delete_sql(dependency_table, len(chunk))
+            cursor = self.prepared_cursor(sql)
+            cursor.execute(sql, [contact_object_type_id, *chunk])
             total_deleted += cursor.rowcount
             
-        self.db.commit()
         return total_deleted
         
+    def delete_contacts_cascade(self, contact_ids: List[int]) -> Dict[str, int]:
+        """
+        Delete a batch of contacts and all their dependencies with one CALL to the
+        delete_contacts_cascade stored procedure (uncommitted, like the in-Python levels)
+        Returns: dictionary of table_name -> deleted_count, including contact
+        """
+        cursor = self.cursor
+        cursor.callproc(CASCADE_PROCEDURE, (json.dumps(contact_ids), self.contact_object_type_id))
+        
+        summary = {}
+        for result in cursor.stored_results():
+            columns = [column[0] for column in result.description]
+            for row in result.fetchall():
+                summary.update(zip(columns, (int(count) for count in row)))
+        return summary
+        
+    def check_cascade_procedure(self):
+        """Fail fast if --server-side-cascade was requested but the procedure is not installed"""
+        cursor = self.cursor
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.routines
+            WHERE routine_schema = DATABASE() AND routine_name = %s
+        """, (CASCADE_PROCEDURE,))
+        if cursor.fetchall()[0][0] == 0:
+            raise RuntimeError(f"Stored procedure {CASCADE_PROCEDURE} not found; "
+                               f"install it from sql/delete-contacts-cascade.sql")
+            
     def delete_contact_batch(self, cutoff_id: int, batch_size: int = 1000) -> Dict[str, int]:
         """
-        Delete contacts and all their dependencies in batches
+        Delete contacts and all their dependencies in batches. Each batch's
+        contact IDs come from one keyset SELECT (contact_id > last LIMIT
+        batch_size) that is fully read before the deletes start, so no
+        statement or read view stays open across batches.
         Returns: summary of deletion counts
         """
-        cursor = self.db.cursor()
+        page_cursor = self.prepared_cursor(CONTACT_PAGE_SQL)
+        delete_cursor = self.prepared_cursor(CONTACT_DELETE_SQL)
         total_summary = {}
         processed_contacts = 0
+        last_id = 0
         
         self.logger.info(f"Starting contact deletion up to ID {cutoff_id}")
+        log_batches = self.logger.isEnabledFor(logging.INFO)
+        if self.server_side_cascade:
+            self.check_cascade_procedure()
+        else:
+            self.skip_empty_dependency_tables()
         
-        # Get contacts to delete in batches
         while not self.interrupted:
-            cursor.execute("""
-                SELECT contact_id FROM contact 
-                WHERE contact_id <= %s 
-                ORDER BY contact_id 
-                LIMIT %s
-            """, (cutoff_id, batch_size))
-            
-            contacts = cursor.fetchall()
-            if not contacts:
+            page_cursor.execute(CONTACT_PAGE_SQL, (last_id, cutoff_id, batch_size))
+            contact_ids = [row[0] for row in page_cursor.fetchall()]
+            if not contact_ids:
                 break
+            last_id = contact_ids[-1]
                 
-            for (contact_id,) in contacts:
-                if self.interrupted:
-                    break
-                    
-                try:
-                    # Delete all dependencies first
-                    dependency_summary = self.delete_contact_dependencies(contact_id)
-                    
-                    # Then delete the contact itself
-                    cursor.execute("DELETE FROM contact WHERE contact_id = %s", (contact_id,))
-                    contact_deleted = cursor.rowcount
-                    
-                    if contact_deleted > 0:
-                        dependency_summary['contact'] = contact_deleted
-                        processed_contacts += 1
-                        
-                        # Update totals
-                        for table, count in dependency_summary.items():
-                            total_summary[table] = total_summary.get(table, 0) + count
+            try:
+                if self.server_side_cascade:
+                    dependency_summary = self.delete_contacts_cascade(contact_ids)
+                    self.db.commit()
+                else:
+                    # Delete all dependencies of the whole batch first, one statement per table
+                    dependency_summary = self.delete_contact_dependencies(contact_ids)
+                    if self.interrupted:
+                        # Keep the dependency rows already removed on the main connection
+                        self.db.commit()
+                        break
                             
+                    # Then delete the contacts themselves: the batch is every contact in
+                    # [first, last], so one range statement covers it. The one commit
+                    # also covers the dependency levels run on the main connection.
+                    delete_cursor.execute(CONTACT_DELETE_SQL, (contact_ids[0], contact_ids[-1]))
+                    dependency_summary['contact'] = delete_cursor.rowcount
+                    if any(dependency_summary.values()):
                         self.db.commit()
+                processed_contacts += dependency_summary.get('contact', 0)
+                    
+                # Update totals
+                for table, count in dependency_summary.items():
+                    total_summary[table] = total_summary.get(table, 0) + count
                         
-                        if processed_contacts % 100 == 0:
-                            self.logger.info(f"Processed {processed_contacts} contacts")
-                            
-                except Exception as e:
-                    self.logger.error(f"Error deleting contact {contact_id}: {e}")
-                    self.db.rollback()
-                    continue
+                # One lazily formatted line per batch instead of one per table
+                if log_batches:
+                    self.logger.info("Contacts %d-%d: deleted %s (processed %d contacts)",
+                                     contact_ids[0], contact_ids[-1],
+                                     {table: count for table, count in dependency_summary.items() if count},
+                                     processed_contacts)
                     
-            # Update cutoff for next batch
-            if contacts:
-                last_contact_id = contacts[-1][0]
-                cursor.execute("DELETE FROM contact WHERE contact_id <= %s", (last_contact_id,))
-                self.db.commit()
-                
+            except Exception as e:
+                self.logger.error(f"Error deleting contacts {contact_ids[0]}-{contact_ids[-1]}: {e}")
+                self.db.rollback()
+                raise
+            
         self.logger.info(f"Contact deletion completed. Processed {processed_contacts} contacts")
         return total_summary
         
     def delete_readings_batch(self, cutoff_id: int, batch_size: int = 10000) -> int:
         """
-        Delete non-billing readings in batches
+        Delete non-billing readings in consecutive reading_id windows of
+        batch_size ids, so each DELETE only touches its own key range
         Returns: total number of readings deleted
         """
-        cursor = self.db.cursor()
+        cursor = self.cursor
+        delete_cursor = self.prepared_cursor(READING_DELETE_SQL)
         total_deleted = 0
+        windows = 0
         
         self.logger.info(f"Starting reading deletion up to ID {cutoff_id}")
         
-        while not self.interrupted:
+        cursor.execute("SELECT MIN(reading_id) FROM reading WHERE reading_id <= %s", (cutoff_id,))
+        min_id = cursor.fetchall()[0][0]
+        if min_id is None:
+            self.logger.info("Reading deletion completed. Deleted 0 readings")
+            return total_deleted
+            
+        last_id = min_id - 1
+        while last_id < cutoff_id and not self.interrupted:
+            window_end = min(last_id + batch_size, cutoff_id)
+            
             # Delete readings that are NOT used for billing
-            cursor.execute("""
-                DELETE r FROM reading r
-                LEFT JOIN sm_usage su ON r.reading_id = su.reading_id
-                WHERE r.reading_id <= %s 
-                AND su.reading_id IS NULL
-                AND r.reading_date < DATE_SUB(NOW(), INTERVAL 2 YEAR)
-                LIMIT %s
-            """, (cutoff_id, batch_size))
+            delete_cursor.execute(READING_DELETE_SQL, (last_id, window_end, self.reading_cutoff_date))
             
-            deleted_count = cursor.rowcount
+            deleted_count = delete_cursor.rowcount
             total_deleted += deleted_count
             
-            if deleted_count == 0:
-                break
-                
-            self.db.commit()
-            
-            if total_deleted % 50000 == 0:
-                self.logger.info(f"Deleted {total_deleted} readings so far")
+            if deleted_count > 0:
+                self.db.commit()
                 
-            if deleted_count < batch_size:
-                break
+            last_id = window_end
+            windows += 1
+            if windows % 50 == 0:
+                self.logger.info(f"Deleted {total_deleted} readings so far (through ID {last_id})")
                 
         self.logger.info(f"Reading deletion completed. Deleted {total_deleted} readings")
         return total_deleted
         
-    def run_deletion(self, table_name: Optional[str] = None, dry_run: bool = False):
+    def run_deletion(self, table_name: Optional[str] = None, dry_run: bool = False,
+                     force: bool = False):
         """
         Run the deletion process for specified table or all tables
         """
@@ -325,6 +574,8 @@ class EnhancedBatchDeleter:
         try:
             self.connect()
             self.load_object_types()
+            if table_name in (None, 'contact'):
+                self.check_polymorphic_indexes(force)
             
             if table_name:
                 self.logger.info(f"Processing single table: {table_name}")
@@ -368,6 +619,14 @@ def main():
     parser.add_argument('--cutoff-config', required=True, help='Path to cutoff configuration JSON file')
     parser.add_argument('--table', help='Specific table to process (optional)')
     parser.add_argument('--dry-run', action='store_true', help='Perform dry run without actual deletion')
+    parser.add_argument('--force', action='store_true',
+                        help='Run even if a polymorphic DELETE would scan its table')
+    parser.add_argument('--skip-binlog', action='store_true',
+                        help='Set sql_log_bin = 0 so deletes are not replicated (requires SUPER/'
+                             'SYSTEM_VARIABLES_ADMIN; run the same cleanup on every replica yourself)')
+    parser.add_argument('--server-side-cascade', action='store_true',
+                        help='Delete each contact batch with one CALL to the delete_contacts_cascade '
+                             'procedure (install sql/delete-contacts-cascade.sql first)')
     
     args = parser.parse_args()
     
@@ -386,10 +645,11 @@ def main():
         'database': args.database
     }
     
-    deleter = EnhancedBatchDeleter(db_config, cutoff_config)
+    deleter = EnhancedBatchDeleter(db_config, cutoff_config, args.server_side_cascade,
+                                   args.skip_binlog)
     
     try:
-        deleter.run_deletion(args.table, args.dry_run)
+        deleter.run_deletion(args.table, args.dry_run, args.force)
     except Exception as e:
         logging.error(f"Deletion failed: {e}")
         sys.exit(1)
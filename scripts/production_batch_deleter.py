@@ -5,21 +5,120 @@ Based on actual discovery query results and polymorphic relationship analysis
 """
 
 import mysql.connector
+import mysql.connector.pooling
+from mysql.connector.constants import ClientFlag
 import argparse
 import json
 import logging
 import time
 import signal
 import sys
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Non-billing readings older than this are deleted
+READING_RETENTION = timedelta(days=730)  # 2 years
+
+# Most ids bound into one IN (...) list
+IN_LIST_CHUNK_SIZE = 1000
+
+# Tables keyed to their owner by (object_type_id, object_id)
+POLYMORPHIC_TABLES = ['address', 'phone', 'note', 'email']
+
+# Tables referencing contact.contact_id directly; cleared in one multi-statement
+DIRECT_DEPENDENCY_TABLES = [
+    'bank', 'subscription', 'contact_batch', 'contact_logical_unit', 
+    'nes_anet_customer_profile'
+]
+
+# Adaptive batch sizing: a batch faster than the lower bound doubles the next
+# one, slower than the upper bound halves it, always within the size limits
+BATCH_TIME_TARGET = (0.1, 0.5)  # seconds
+BATCH_SIZE_LIMITS = (100, 50000)
+
+# Main connection, the contact batch reader, and one worker per polymorphic
+# table of the widest group (tenants)
+POOL_SIZE = 6
+
+# LIMIT batches per transaction; one commit (and redo log flush) covers this many
+COMMIT_EVERY_BATCHES = 16
+
+@lru_cache(maxsize=None)
+def polymorphic_page_sql(table_name: str) -> str:
+    """Next page of a table's primary keys owned by the staged tmp_ids of one type"""
+    return f"""
+        SELECT t.{table_name}_id FROM {table_name} t
+        JOIN tmp_ids ON t.object_id = tmp_ids.id
+        WHERE t.object_type_id = %s
+        AND t.{table_name}_id > %s
+        ORDER BY t.{table_name}_id
+        LIMIT %s
+    """
+
+@lru_cache(maxsize=None)
+def delete_by_pk_sql(table_name: str, id_count: int) -> str:
+    """DELETE of id_count rows of a table by primary key"""
+    placeholders = ','.join(['%s'] * id_count)
+    return f"""
+        DELETE FROM {table_name} 
+        WHERE {table_name}_id IN ({placeholders})
+    """
+
+def multi_statement_rowcounts(cursor, sql: str, params: List) -> List[int]:
+    """
+    Execute a ;-joined multi-statement of DML (the connection needs
+    ClientFlag.MULTI_STATEMENTS) and return each statement's rowcount in order
+    """
+    cursor.execute(sql, params)
+    rowcounts = [cursor.rowcount]
+    while cursor.nextset():
+        rowcounts.append(cursor.rowcount)
+    return rowcounts
+
+def secondary_index_definitions(create_table_sql: str) -> Dict[str, str]:
+    """
+    Non-unique index clauses of a SHOW CREATE TABLE statement, by index name,
+    exactly as the server prints them (prefixes, expressions, DESC, COMMENT,
+    INVISIBLE), so ADD <clause> recreates the same index
+    """
+    definitions = {}
+    for line in create_table_sql.splitlines():
+        clause = line.strip().rstrip(',')
+        if clause.startswith('KEY `'):
+            name_end = 5
+            while clause[name_end] != '`' or clause[name_end + 1] == '`':
+                name_end += 2 if clause[name_end] == '`' else 1  # `` escapes a backtick
+            definitions[clause[5:name_end].replace('``', '`')] = clause
+    return definitions
 
 class ProductionBatchDeleter:
-    def __init__(self, db_config: dict, cutoff_config: dict):
+    def __init__(self, db_config: dict, cutoff_config: dict, claim_batches: bool = False,
+                 bulk_mode: bool = False, multi_table_delete: bool = False):
         """Initialize with database and cutoff configuration"""
         self.db_config = db_config
         self.cutoff_config = cutoff_config
+        # Lock each contact batch with SKIP LOCKED so several processes can share a cutoff
+        self.claim_batches = claim_batches
+        # Drop optional secondary indexes of the polymorphic tables for the run
+        self.bulk_mode = bulk_mode
+        self.dropped_indexes = {}
+        # Send each contact batch's whole cascade as one multi-statement of join DELETEs
+        self.multi_table_delete = multi_table_delete
+        # Computed once, so every batch of a run deletes against the same cutoff
+        self.reading_cutoff_date = datetime.now() - READING_RETENTION
+        self.pool = None
         self.db = None
+        self.executor = None
+        # Each thread's own pooled connection, see session()
+        self._local = threading.local()
+        self._worker_connections = []
+        self._prepared_cursors = []
+        # Polymorphic deletes skipped because the group count found nothing (for tuning)
+        self.skipped_empty_deletes = 0
         self.interrupted = False
         
         # Object type mappings based on discovery results
@@ -51,6 +150,9 @@ class ProductionBatchDeleter:
             'default': 1000
         }
         
+        # Current size per table, tuned from BATCH_SIZES as batches are timed
+        self.adaptive_batch_sizes = {}
+        
         self.setup_logging()
         self.setup_signal_handlers()
         
@@ -85,8 +187,17 @@ class ProductionBatchDeleter:
             # Disable SSL warnings for older servers
             db_config['autocommit'] = False  # Use transactions for deletion
             
-            self.db = mysql.connector.connect(**db_config)
+            if self.pool is None:
+                self.pool = mysql.connector.pooling.MySQLConnectionPool(
+                    pool_name='nes_production_cleanup', pool_size=POOL_SIZE,
+                    client_flags=[ClientFlag.MULTI_STATEMENTS],  # See delete_direct_dependencies()
+                    **db_config
+                )
+            self.db = self.pool.get_connection()
             self.db.autocommit = False  # Use transactions
+            self._local.db = self.db
+            # Polymorphic tables are deleted concurrently, one worker connection each
+            self.executor = ThreadPoolExecutor(max_workers=POOL_SIZE - 2)
             self.logger.info("Connected to database successfully")
         except mysql.connector.Error as e:
             self.logger.error(f"Database connection failed: {e}")
@@ -94,10 +205,182 @@ class ProductionBatchDeleter:
             
     def disconnect(self):
         """Disconnect from database"""
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+        for cursor in self._prepared_cursors:
+            cursor.close()
+        self._prepared_cursors = []
+        for db in self._worker_connections:
+            db.close()  # Returns the connection to the pool
+        self._worker_connections = []
         if self.db:
+            self._local.db = None
+            self._local.staged_ids = None
+            self._local.prepared = None
             self.db.close()
+            self.db = None
             self.logger.info("Disconnected from database")
             
+    def session(self):
+        """
+        Return the calling thread's connection: the main connection on the
+        main thread, and a pooled connection checked out on first use (and
+        kept for the run) on each executor worker
+        """
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self.pool.get_connection()
+            db.autocommit = False
+            self._local.db = db
+            self._worker_connections.append(db)
+        return db
+        
+    def check_polymorphic_indexes(self, force: bool = False):
+        """
+        Refuse to run unless each polymorphic table has an index leading with
+        (object_type_id, object_id), which the group counts and primary key
+        pages range-scan (InnoDB secondary indexes carry the primary key, so
+        such an index also covers the page SELECT).
+        force downgrades the failure to a logged error.
+        """
+        cursor = self.db.cursor()
+        unindexed = []
+        
+        for table_name in POLYMORPHIC_TABLES:
+            cursor.execute(f"SHOW INDEX FROM {table_name}")
+            columns = [column[0] for column in cursor.description]
+            index_columns = {}
+            for row in cursor.fetchall():
+                entry = dict(zip(columns, row))
+                index_columns.setdefault(entry['Key_name'], {})[entry['Seq_in_index']] = entry['Column_name']
+                
+            if not any(columns_by_seq.get(1) == 'object_type_id' and columns_by_seq.get(2) == 'object_id'
+                       for columns_by_seq in index_columns.values()):
+                unindexed.append(table_name)
+                self.logger.error(f"{table_name} has no index on (object_type_id, object_id); every "
+                                  f"polymorphic delete will scan it. Consider: CREATE INDEX "
+                                  f"idx_{table_name}_object ON {table_name}(object_type_id, object_id)")
+                
+        cursor.close()
+        if unindexed and not force:
+            raise RuntimeError(f"No usable (object_type_id, object_id) index on: {', '.join(unindexed)} "
+                               f"(use --force to run anyway)")
+            
+    def drop_secondary_indexes(self):
+        """
+        Bulk mode: drop the polymorphic tables' secondary indexes the cleanup
+        does not read, so deletes stop maintaining them; restore_secondary_indexes()
+        rebuilds each table's set in one ALTER from the definitions SHOW CREATE
+        TABLE printed. Kept: the primary key, unique, non-BTREE and foreign key
+        indexes, (object_type_id, object_id), and any index whose definition
+        could not be read back.
+        """
+        cursor = self.db.cursor()
+        
+        for table_name in POLYMORPHIC_TABLES:
+            cursor.execute("""
+                SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                AND REFERENCED_TABLE_NAME IS NOT NULL
+            """, (table_name,))
+            foreign_key_columns = {row[0] for row in cursor.fetchall()}
+            
+            cursor.execute(f"SHOW INDEX FROM {table_name}")
+            columns = [column[0] for column in cursor.description]
+            indexes = {}
+            for row in cursor.fetchall():
+                entry = dict(zip(columns, row))
+                indexes.setdefault(entry['Key_name'], []).append(entry)
+                
+            cursor.execute(f"SHOW CREATE TABLE {table_name}")
+            create_definitions = secondary_index_definitions(cursor.fetchone()[1])
+            
+            definitions = []
+            for key_name, entries in indexes.items():
+                entries.sort(key=lambda entry: entry['Seq_in_index'])
+                index_columns = [entry['Column_name'] for entry in entries]
+                if (key_name == 'PRIMARY' or not entries[0]['Non_unique']
+                        or entries[0]['Index_type'] != 'BTREE'
+                        or index_columns[0] in foreign_key_columns
+                        or index_columns[:2] == ['object_type_id', 'object_id']
+                        or key_name not in create_definitions):
+                    continue
+                definitions.append((key_name, f"ADD {create_definitions[key_name]}"))
+                
+            if not definitions:
+                continue
+                
+            # Logged first, so the indexes can be rebuilt by hand if the run dies
+            self.logger.warning(f"Bulk mode: dropping {len(definitions)} index(es) on {table_name}; "
+                                f"to restore: ALTER TABLE {table_name} "
+                                f"{', '.join(add for _, add in definitions)}")
+            cursor.execute(f"ALTER TABLE {table_name} " +
+                           ', '.join(f"DROP INDEX `{key_name.replace('`', '``')}`"
+                                     for key_name, _ in definitions))
+            self.dropped_indexes[table_name] = [add for _, add in definitions]
+            
+        cursor.close()
+        
+    def restore_secondary_indexes(self):
+        """Rebuild the indexes drop_secondary_indexes() dropped, one ALTER per table"""
+        cursor = self.db.cursor()
+        for table_name, additions in list(self.dropped_indexes.items()):
+            self.logger.info(f"Bulk mode: rebuilding {len(additions)} index(es) on {table_name}")
+            cursor.execute(f"ALTER TABLE {table_name} {', '.join(additions)}")
+            del self.dropped_indexes[table_name]
+        cursor.close()
+        
+    def prepared_cursor(self, sql: str):
+        """
+        Prepared-statement cursor for sql on the calling thread's connection.
+        Each distinct statement is prepared on the server once per connection.
+        """
+        prepared = getattr(self._local, 'prepared', None)
+        if prepared is None:
+            prepared = self._local.prepared = {}
+        cursor = prepared.get(sql)
+        if cursor is None:
+            cursor = self.session().cursor(prepared=True)
+            prepared[sql] = cursor
+            self._prepared_cursors.append(cursor)
+        return cursor
+        
+    def tune_batch_size(self, table_name: str, batch_size: int, elapsed: float) -> int:
+        """
+        Next batch size for table_name after a batch of batch_size took elapsed
+        seconds, so each statement's lock hold time stays near BATCH_TIME_TARGET
+        """
+        fast, slow = BATCH_TIME_TARGET
+        if elapsed < fast:
+            batch_size *= 2
+        elif elapsed > slow:
+            batch_size //= 2
+        batch_size = max(BATCH_SIZE_LIMITS[0], min(batch_size, BATCH_SIZE_LIMITS[1]))
+        self.adaptive_batch_sizes[table_name] = batch_size
+        return batch_size
+        
+    def stage_ids(self, ids: List[int]):
+        """
+        Load ids into the calling thread's tmp_ids temporary table, which the
+        polymorphic deletes join against instead of binding an IN (...) list.
+        Skipped when the connection already holds exactly these ids.
+        """
+        if getattr(self._local, 'staged_ids', None) == ids:
+            return
+            
+        cursor = self.session().cursor()
+        cursor.execute("""
+            CREATE TEMPORARY TABLE IF NOT EXISTS tmp_ids (id BIGINT PRIMARY KEY) ENGINE=MEMORY
+        """)
+        # DELETE rather than TRUNCATE, which would implicitly commit
+        cursor.execute("DELETE FROM tmp_ids")
+        for i in range(0, len(ids), IN_LIST_CHUNK_SIZE):
+            cursor.executemany("INSERT INTO tmp_ids (id) VALUES (%s)",
+                               [(object_id,) for object_id in ids[i:i + IN_LIST_CHUNK_SIZE]])
+        cursor.close()
+        self._local.staged_ids = list(ids)
+        
     def delete_polymorphic_records_by_type(self, table_name: str, object_type_id: int, 
                                          contact_ids: List[int], batch_size: int = None) -> int:
         """
@@ -107,43 +390,92 @@ class ProductionBatchDeleter:
         if not contact_ids:
             return 0
             
-        if batch_size is None:
-            batch_size = self.BATCH_SIZES.get(table_name, self.BATCH_SIZES['default'])
+        # An explicit batch_size is used as given; otherwise it adapts to batch timings
+        adaptive = batch_size is None
+        if adaptive:
+            batch_size = self.adaptive_batch_sizes.get(
+                table_name, self.BATCH_SIZES.get(table_name, self.BATCH_SIZES['default'])
+            )
             
-        cursor = self.db.cursor()
+        db = self.session()
+        
+        self.stage_ids(contact_ids)
+        page_sql = polymorphic_page_sql(table_name)
+        select_cursor = self.prepared_cursor(page_sql)
+        # Every page is padded to batch_size ids, so one DELETE is prepared per
+        # table and size; repeating the last id is harmless inside IN (...)
+        delete_sql = delete_by_pk_sql(table_name, batch_size)
+        cursor = self.prepared_cursor(delete_sql)
+        # Reused for every page: [1] is the last id seen, [2] the page size
+        page_params = [object_type_id, 0, batch_size]
         total_deleted = 0
+        batches_since_commit = 0
+        iteration = 0
         
-        # Process contact IDs in chunks to avoid huge IN clauses
-        chunk_size = 1000
-        for i in range(0, len(contact_ids), chunk_size):
-            if self.interrupted:
+        while True:
+            # The interrupt flag only needs to be seen within a few batches
+            if iteration & 0xF == 0 and self.interrupted:
                 break
-                
-            chunk = contact_ids[i:i + chunk_size]
-            placeholders = ','.join(['%s'] * len(chunk))
+            iteration += 1
             
-            while not self.interrupted:
-                # Delete in batches
-                cursor.execute(f"""
-                    DELETE FROM {table_name} 
-                    WHERE object_type_id = %s 
-                    AND object_id IN ({placeholders})
-                    LIMIT %s
-                """, [object_type_id] + chunk + [batch_size])
-                
-                deleted_count = cursor.rowcount
-                total_deleted += deleted_count
+            # Walk the matching rows by primary key, then delete exactly those rows,
+            # so no batch rescans index entries an earlier batch already emptied
+            select_cursor.execute(page_sql, page_params)
+            
+            row_ids = [row[0] for row in select_cursor.fetchall()]
+            page_length = len(row_ids)
+            if not page_length:
+                break
                 
-                if deleted_count == 0:
-                    break
-                    
-                self.db.commit()
+            page_params[1] = row_ids[-1]
+            row_ids.extend([row_ids[-1]] * (batch_size - page_length))
+            started = time.perf_counter()
+            cursor.execute(delete_sql, row_ids)
+            elapsed = time.perf_counter() - started
+            
+            deleted_count = cursor.rowcount
+            total_deleted += deleted_count
+            
+            batches_since_commit += 1
+            if batches_since_commit >= COMMIT_EVERY_BATCHES:
+                db.commit()
+                batches_since_commit = 0
+            
+            if page_length < batch_size:
+                break
                 
-                if deleted_count < batch_size:
-                    break
+            if adaptive:
+                tuned_size = self.tune_batch_size(table_name, batch_size, elapsed)
+                if tuned_size != batch_size:
+                    batch_size = page_params[2] = tuned_size
+                    delete_sql = delete_by_pk_sql(table_name, batch_size)
+                    cursor = self.prepared_cursor(delete_sql)
                     
+        if batches_since_commit:
+            db.commit()
+            
         return total_deleted
         
+    def count_polymorphic_records(self, table_names: List[str], object_type_id: int,
+                                  object_ids: List[int]) -> Dict[str, int]:
+        """
+        Count the rows each polymorphic table holds for a group of objects, in
+        one UNION ALL round trip. Tables counted at zero are not dispatched.
+        """
+        placeholders = ','.join(['%s'] * len(object_ids))
+        sql = " UNION ALL ".join(
+            f"SELECT '{table_name}', COUNT(*) FROM {table_name} "
+            f"WHERE object_type_id = %s AND object_id IN ({placeholders})"
+            for table_name in table_names
+        )
+        cursor = self.db.cursor()
+        cursor.execute(sql, ([object_type_id] + object_ids) * len(table_names))
+        counts = {table_name: count for table_name, count in cursor.fetchall()}
+        cursor.close()
+        
+        self.skipped_empty_deletes += sum(1 for count in counts.values() if count == 0)
+        return counts
+        
     def delete_community_polymorphic_dependencies(self, community_ids: List[int]) -> Dict[str, int]:
         """
         Delete all polymorphic dependencies for communities
@@ -158,26 +490,35 @@ class ProductionBatchDeleter:
             ('phone', 17970),
             ('note', 3599)
         ]
+        counts = self.count_polymorphic_records([table_name for table_name, _ in polymorphic_tables],
+                                                community_object_type, community_ids)
         
-        for table_name, expected_volume in polymorphic_tables:
+        def delete_table(entry):
+            table_name, expected_volume = entry
             if self.interrupted:
-                break
+                return table_name, 0
                 
             try:
-                self.logger.info(f"Deleting {table_name} records for {len(community_ids)} communities (expected ~{expected_volume:,} records)")
+                self.logger.info(f"Deleting {counts[table_name]:,} {table_name} records for {len(community_ids)} communities (discovery estimate ~{expected_volume:,} records)")
                 deleted_count = self.delete_polymorphic_records_by_type(
                     table_name, community_object_type, community_ids
                 )
-                deleted_counts[table_name] = deleted_count
                 
                 if deleted_count > 0:
                     self.logger.info(f"Deleted {deleted_count:,} {table_name} records for communities")
                     
+                return table_name, deleted_count
+                
             except Exception as e:
                 self.logger.error(f"Error deleting {table_name} for communities: {e}")
-                self.db.rollback()
+                self.session().rollback()
                 raise
                 
+        # The tables do not reference each other, so each gets its own worker
+        tables_with_rows = [entry for entry in polymorphic_tables if counts[entry[0]]]
+        for table_name, deleted_count in self.executor.map(delete_table, tables_with_rows):
+            deleted_counts[table_name] = deleted_count
+            
         return deleted_counts
         
     def delete_tenant_polymorphic_dependencies(self, tenant_ids: List[int]) -> Dict[str, int]:
@@ -196,76 +537,109 @@ class ProductionBatchDeleter:
             ('note', 1184463),     # 1.2M+ records
             ('email', 29341)       # 29K+ records
         ]
+        counts = self.count_polymorphic_records([table_name for table_name, _ in polymorphic_tables],
+                                                tenant_object_type, tenant_ids)
         
-        for table_name, expected_volume in polymorphic_tables:
+        def delete_table(entry):
+            table_name, expected_volume = entry
             if self.interrupted:
-                break
+                return table_name, 0
                 
             try:
-                self.logger.info(f"Deleting {table_name} records for {len(tenant_ids)} tenants (expected ~{expected_volume:,} records)")
+                self.logger.info(f"Deleting {counts[table_name]:,} {table_name} records for {len(tenant_ids)} tenants (discovery estimate ~{expected_volume:,} records)")
                 self.logger.warning(f"This may take a LONG time due to volume!")
                 
                 deleted_count = self.delete_polymorphic_records_by_type(
                     table_name, tenant_object_type, tenant_ids
                 )
-                deleted_counts[table_name] = deleted_count
                 
                 if deleted_count > 0:
                     self.logger.info(f"Deleted {deleted_count:,} {table_name} records for tenants")
                     
+                return table_name, deleted_count
+                
             except Exception as e:
                 self.logger.error(f"Error deleting {table_name} for tenants: {e}")
-                self.db.rollback()
+                self.session().rollback()
                 raise
                 
+        # The tables do not reference each other, so each gets its own worker
+        tables_with_rows = [entry for entry in polymorphic_tables if counts[entry[0]]]
+        for table_name, deleted_count in self.executor.map(delete_table, tables_with_rows):
+            deleted_counts[table_name] = deleted_count
+            
         return deleted_counts
         
-    def delete_contact_dependencies(self, contact_id: int, object_type_id: int) -> Dict[str, int]:
+    def delete_contact_dependencies(self, contact_ids: List[int], object_type_id: int) -> Dict[str, int]:
         """
-        Delete all dependencies for a single contact based on its object type
+        Delete all dependencies for a batch of contacts sharing one object type
         """
         deleted_counts = {}
         
         # Determine deletion strategy based on object type
         if object_type_id == self.OBJECT_TYPES['dstCommunity']:
             # Community - moderate volume
-            deleted_counts = self.delete_community_polymorphic_dependencies([contact_id])
+            deleted_counts = self.delete_community_polymorphic_dependencies(contact_ids)
         elif object_type_id == self.OBJECT_TYPES['dstTenant']:
             # Tenant - MASSIVE volume, handle carefully
-            self.logger.warning(f"Deleting tenant {contact_id} - this may take a while due to large volume")
-            deleted_counts = self.delete_tenant_polymorphic_dependencies([contact_id])
+            self.logger.warning(f"Deleting {len(contact_ids)} tenants - this may take a while due to large volume")
+            deleted_counts = self.delete_tenant_polymorphic_dependencies(contact_ids)
         else:
             # Other contact types - use generic polymorphic deletion
-            deleted_counts = self.delete_generic_polymorphic_dependencies([contact_id], object_type_id)
+            deleted_counts = self.delete_generic_polymorphic_dependencies(contact_ids, object_type_id)
             
         # Delete direct foreign key dependencies
-        direct_dependencies = [
-            'bank', 'subscription', 'contact_batch', 'contact_logical_unit', 
-            'nes_anet_customer_profile'
-        ]
-        
-        cursor = self.db.cursor()
-        for table in direct_dependencies:
-            if self.interrupted:
-                break
-                
-            try:
-                cursor.execute(f"DELETE FROM {table} WHERE contact_id = %s", (contact_id,))
-                deleted_count = cursor.rowcount
+        if not self.interrupted:
+            for table, deleted_count in self.delete_direct_dependencies(contact_ids).items():
                 deleted_counts[table] = deleted_counts.get(table, 0) + deleted_count
                 
                 if deleted_count > 0:
-                    self.logger.debug(f"Deleted {deleted_count} {table} records for contact {contact_id}")
+                    self.logger.debug(f"Deleted {deleted_count} {table} records for {len(contact_ids)} contacts")
                     
-                self.db.commit()
-                
-            except Exception as e:
-                self.logger.error(f"Error deleting {table} for contact {contact_id}: {e}")
-                self.db.rollback()
-                raise
-                
         return deleted_counts
         
+    def delete_direct_dependencies(self, contact_ids: List[int]) -> Dict[str, int]:
+        """
+        Delete every DIRECT_DEPENDENCY_TABLES row of a batch of contacts, sending
+        all the tables' DELETEs as one multi-statement per IN-list chunk.
+        Leaves the commit to the caller.
+        """
+        cursor = self.db.cursor()
+        deleted_counts = dict.fromkeys(DIRECT_DEPENDENCY_TABLES, 0)
+        
+        try:
+            for i in range(0, len(contact_ids), IN_LIST_CHUNK_SIZE):
+                chunk = contact_ids[i:i + IN_LIST_CHUNK_SIZE]
+                placeholders = ','.join(['%s'] * len(chunk))
+                sql = ';'.join(f"DELETE FROM {table} WHERE contact_id IN ({placeholders})"
+                               for table in DIRECT_DEPENDENCY_TABLES)
+                rowcounts = multi_statement_rowcounts(cursor, sql, chunk * len(DIRECT_DEPENDENCY_TABLES))
+                for table, rowcount in zip(DIRECT_DEPENDENCY_TABLES, rowcounts):
+                    deleted_counts[table] += rowcount
+                    
+        except Exception as e:
+            self.logger.error(f"Error deleting direct dependencies for contacts {contact_ids[0]}-{contact_ids[-1]}: {e}")
+            self.db.rollback()
+            raise
+            
+        return deleted_counts
+        
+    def delete_by_contact_ids(self, table_name: str, contact_ids: List[int]) -> int:
+        """
+        Delete rows of table_name whose contact_id is in contact_ids, one
+        statement per IN-list chunk. Leaves the commit to the caller.
+        """
+        cursor = self.db.cursor()
+        total_deleted = 0
+        
+        for i in range(0, len(contact_ids), IN_LIST_CHUNK_SIZE):
+            chunk = contact_ids[i:i + IN_LIST_CHUNK_SIZE]
+            placeholders = ','.join(['%s'] * len(chunk))
+            cursor.execute(f"DELETE FROM {table_name} WHERE contact_id IN ({placeholders})", chunk)
+            total_deleted += cursor.rowcount
+            
+        return total_deleted
+        
     def delete_generic_polymorphic_dependencies(self, contact_ids: List[int], object_type_id: int) -> Dict[str, int]:
         """
         Delete polymorphic dependencies for generic contact types
@@ -273,35 +647,141 @@ class ProductionBatchDeleter:
         deleted_counts = {}
         
         # Standard polymorphic tables
-        polymorphic_tables = ['address', 'phone', 'note', 'email']
+        polymorphic_tables = POLYMORPHIC_TABLES
+        counts = self.count_polymorphic_records(polymorphic_tables, object_type_id, contact_ids)
         
-        for table_name in polymorphic_tables:
+        def delete_table(table_name):
             if self.interrupted:
-                break
+                return table_name, 0
                 
             try:
                 deleted_count = self.delete_polymorphic_records_by_type(
                     table_name, object_type_id, contact_ids
                 )
-                deleted_counts[table_name] = deleted_count
                 
                 if deleted_count > 0:
                     self.logger.info(f"Deleted {deleted_count:,} {table_name} records")
                     
+                return table_name, deleted_count
+                
             except Exception as e:
                 self.logger.error(f"Error deleting {table_name}: {e}")
-                self.db.rollback()
+                self.session().rollback()
                 raise
                 
+        # The tables do not reference each other, so each gets its own worker
+        tables_with_rows = [table_name for table_name in polymorphic_tables if counts[table_name]]
+        for table_name, deleted_count in self.executor.map(delete_table, tables_with_rows):
+            deleted_counts[table_name] = deleted_count
+            
         return deleted_counts
         
-    def delete_contacts_batch(self, cutoff_id: int, object_type_filter: Optional[int] = None) -> Dict[str, int]:
+    def prefetch_contact_batches(self, where_clause: str, params: List, batch_size: int,
+                                 batches: queue.Queue, stop: threading.Event):
         """
-        Delete contacts and all their dependencies in batches
+        Reader thread for delete_contacts_batch(): pages through the matching
+        contacts by keyset on its own pooled connection and queues each batch,
+        so the next batch is already selected while the current one is deleted.
+        Each page is read unbuffered with fetchmany() and its statement and read
+        view are closed before the batch is queued, so no snapshot is held
+        across batches. Queues an exception if a read fails, and None when done.
+        """
+        db = self.pool.get_connection()
+        cursor = db.cursor()  # Unbuffered: rows arrive as fetchmany() asks for them
+        last_id = 0
+        try:
+            while not (self.interrupted or stop.is_set()):
+                cursor.execute(f"""
+                    SELECT contact_id, object_type_id FROM contact 
+                    {where_clause}
+                    AND contact_id > %s
+                    ORDER BY contact_id 
+                    LIMIT %s
+                """, params + [last_id, batch_size])
+                
+                contacts = cursor.fetchmany(batch_size)
+                db.consume_results()  # Reads the end of the result, closing the statement
+                db.commit()  # Ends the read, so no snapshot is held between batches
+                if not contacts:
+                    break
+                    
+                batches.put(contacts)
+                if len(contacts) < batch_size:
+                    break
+                last_id = contacts[-1][0]
+                
+        except Exception as e:
+            batches.put(e)
+        finally:
+            # Drain whatever an early exit left unread so the connection can go back to the pool
+            db.consume_results()
+            cursor.close()
+            db.close()
+            batches.put(None)
+            
+    def claim_contact_batch(self, where_clause: str, params: List, batch_size: int) -> Optional[List]:
+        """
+        Select and lock the next batch of contacts on the main connection,
+        skipping any another deleter process has locked. The locks are held
+        until the batch's commit, so each contact is deleted by one process.
+        Returns None when no unclaimed contacts are left.
         """
         cursor = self.db.cursor()
+        cursor.execute(f"""
+            SELECT contact_id, object_type_id FROM contact 
+            {where_clause}
+            ORDER BY contact_id 
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """, params + [batch_size])
+        contacts = cursor.fetchall()
+        cursor.close()
+        return contacts or None
+        
+    def delete_contact_batch_cascade(self, groups: Dict[int, List[int]], contact_ids: List[int]) -> Dict[str, int]:
+        """
+        --multi-table-delete: delete a whole contact batch, dependencies and
+        contacts, in one round trip. The ids are staged in tmp_ids on the main
+        connection, and every table gets one DELETE joined to it, so the server
+        plans each table once for the batch. Leaves the commit to the caller.
+        """
+        # Communities own no email rows (see delete_community_polymorphic_dependencies)
+        community_type = self.OBJECT_TYPES['dstCommunity']
+        statements = []
+        params = []
+        for table_name in POLYMORPHIC_TABLES:
+            object_types = [object_type_id for object_type_id in groups
+                            if table_name != 'email' or object_type_id != community_type]
+            if not object_types:
+                continue
+            statements.append((table_name, f"""
+                DELETE t FROM {table_name} t
+                JOIN contact c ON c.contact_id = t.object_id AND c.object_type_id = t.object_type_id
+                JOIN tmp_ids ON tmp_ids.id = c.contact_id
+                WHERE t.object_type_id IN ({','.join(['%s'] * len(object_types))})
+            """))
+            params.extend(object_types)
+        for table_name in DIRECT_DEPENDENCY_TABLES + ['contact']:
+            statements.append((table_name, f"""
+                DELETE d FROM {table_name} d
+                JOIN tmp_ids ON tmp_ids.id = d.contact_id
+            """))
+            
+        self.stage_ids(contact_ids)
+        cursor = self.db.cursor()
+        rowcounts = multi_statement_rowcounts(cursor, ';'.join(sql for _, sql in statements), params)
+        cursor.close()
+        return {table_name: rowcount for (table_name, _), rowcount in zip(statements, rowcounts)}
+        
+    def delete_contacts_batch(self, cutoff_id: int, object_type_filter: Optional[int] = None) -> Dict[str, int]:
+        """
+        Delete contacts and all their dependencies in batches. Each batch is
+        grouped by object type and every dependency table is cleared for a
+        whole group at once, rather than contact by contact.
+        """
         total_summary = {}
         processed_contacts = 0
+        self.skipped_empty_deletes = 0
         batch_size = self.BATCH_SIZES['contact']
         
         # Build query with optional object type filter
@@ -316,54 +796,85 @@ class ProductionBatchDeleter:
         if object_type_filter:
             self.logger.info(f"Filtering to object_type_id = {object_type_filter}")
             
-        while not self.interrupted:
-            cursor.execute(f"""
-                SELECT contact_id, object_type_id FROM contact 
-                {where_clause}
-                ORDER BY contact_id 
-                LIMIT %s
-            """, params + [batch_size])
-            
-            contacts = cursor.fetchall()
-            if not contacts:
-                break
-                
-            for contact_id, object_type_id in contacts:
-                if self.interrupted:
+        if self.claim_batches:
+            # Other processes may be deleting the same range, so no batch is read ahead
+            reader = None
+            next_batch = lambda: self.claim_contact_batch(where_clause, params, batch_size)
+        else:
+            # The reader stays at most one batch ahead of the deletes
+            batches = queue.Queue(maxsize=1)
+            stop = threading.Event()
+            reader = threading.Thread(target=self.prefetch_contact_batches,
+                                      args=(where_clause, params, batch_size, batches, stop),
+                                      daemon=True)
+            reader.start()
+            next_batch = batches.get
+        
+        try:
+            while not self.interrupted:
+                contacts = next_batch()
+                if contacts is None:
                     break
+                if isinstance(contacts, Exception):
+                    raise contacts
                     
+                # Group the batch so each (object type, table) pair is one set-based delete
+                groups: Dict[int, List[int]] = {}
+                for contact_id, object_type_id in contacts:
+                    groups.setdefault(object_type_id, []).append(contact_id)
+                contact_ids = [contact_id for contact_id, _ in contacts]
+                
                 try:
-                    # Delete all dependencies first
-                    dependency_summary = self.delete_contact_dependencies(contact_id, object_type_id)
-                    
-                    # Then delete the contact itself
-                    cursor.execute("DELETE FROM contact WHERE contact_id = %s", (contact_id,))
-                    contact_deleted = cursor.rowcount
-                    
-                    if contact_deleted > 0:
-                        dependency_summary['contact'] = dependency_summary.get('contact', 0) + contact_deleted
-                        processed_contacts += 1
+                    if self.multi_table_delete:
+                        batch_summary = self.delete_contact_batch_cascade(groups, contact_ids)
+                        processed_contacts += batch_summary['contact']
+                        self.db.commit()
+                        for table, count in batch_summary.items():
+                            total_summary[table] = total_summary.get(table, 0) + count
+                        self.logger.info(f"Processed {processed_contacts} contacts")
+                        continue
                         
-                        # Update totals
+                    batch_summary = {}
+                    for object_type_id, group_ids in groups.items():
+                        if self.interrupted:
+                            break
+                        dependency_summary = self.delete_contact_dependencies(group_ids, object_type_id)
                         for table, count in dependency_summary.items():
-                            total_summary[table] = total_summary.get(table, 0) + count
+                            batch_summary[table] = batch_summary.get(table, 0) + count
                             
+                    if self.interrupted:
                         self.db.commit()
+                        break
                         
-                        if processed_contacts % 10 == 0:
-                            self.logger.info(f"Processed {processed_contacts} contacts")
-                            
+                    # Then delete the contacts themselves
+                    contact_deleted = self.delete_by_contact_ids('contact', contact_ids)
+                    batch_summary['contact'] = batch_summary.get('contact', 0) + contact_deleted
+                    processed_contacts += contact_deleted
+                    self.db.commit()
+                    
+                    # Update totals
+                    for table, count in batch_summary.items():
+                        total_summary[table] = total_summary.get(table, 0) + count
+                        
+                    self.logger.info(f"Processed {processed_contacts} contacts")
+                    
                 except Exception as e:
-                    self.logger.error(f"Error deleting contact {contact_id}: {e}")
+                    self.logger.error(f"Error deleting contacts {contact_ids[0]}-{contact_ids[-1]}: {e}")
                     self.db.rollback()
-                    continue
+                    raise
+                    
+        finally:
+            # Unblock a reader waiting to queue its next batch, then let it finish
+            if reader:
+                stop.set()
+                while reader.is_alive():
+                    try:
+                        batches.get_nowait()
+                    except queue.Empty:
+                        reader.join(0.1)
                     
-            # Update params for next batch
-            if contacts:
-                last_contact_id = contacts[-1][0]
-                params[0] = last_contact_id - 1  # Avoid reprocessing
-                
         self.logger.info(f"Contact deletion completed. Processed {processed_contacts} contacts")
+        self.logger.info(f"Skipped {self.skipped_empty_deletes:,} polymorphic deletes with no matching rows")
         return total_summary
         
     def delete_readings_batch(self, cutoff_id: int) -> int:
@@ -372,39 +883,79 @@ class ProductionBatchDeleter:
         """
         cursor = self.db.cursor()
         total_deleted = 0
-        batch_size = self.BATCH_SIZES['reading']
+        batches_since_commit = 0
+        batch_size = self.adaptive_batch_sizes.get('reading', self.BATCH_SIZES['reading'])
+        
+        # Optional "reading_partitions" in the cutoff config names the partitions
+        # holding readings older than the retention window, so the rest are never opened
+        partitions = self.cutoff_config.get('reading_partitions')
+        partition_clause = f"PARTITION ({', '.join(partitions)})" if partitions else ""
         
         self.logger.info(f"Starting reading deletion up to ID {cutoff_id}")
+        if partitions:
+            self.logger.info(f"Restricting reading deletion to partitions {', '.join(partitions)}")
+            
+        # Billing reading ids are collected once, so each window is a primary key
+        # range scan of reading plus a point lookup per row, not a join to sm_usage
+        cursor.execute("""
+            CREATE TEMPORARY TABLE IF NOT EXISTS billing_ids (reading_id BIGINT PRIMARY KEY)
+        """)
+        cursor.execute("DELETE FROM billing_ids")
+        cursor.execute("""
+            INSERT INTO billing_ids
+            SELECT DISTINCT reading_id FROM sm_usage WHERE reading_id <= %s
+        """, (cutoff_id,))
+        self.db.commit()  # Releases the INSERT ... SELECT's shared locks on sm_usage
+        
+        cursor.execute("SELECT MIN(reading_id) FROM reading WHERE reading_id <= %s", (cutoff_id,))
+        min_id = cursor.fetchone()[0]
+        window_start = min_id - 1 if min_id is not None else cutoff_id
+        next_report = 100000
+        iteration = 0
         
-        while not self.interrupted:
+        while window_start < cutoff_id:
+            # The interrupt flag only needs to be seen within a few windows
+            if iteration & 0xF == 0 and self.interrupted:
+                break
+            iteration += 1
+            
+            window_end = min(window_start + batch_size, cutoff_id)
+            
             # Delete readings that are NOT used for billing
-            cursor.execute("""
-                DELETE r FROM reading r
-                LEFT JOIN sm_usage su ON r.reading_id = su.reading_id
-                WHERE r.reading_id <= %s 
-                AND su.reading_id IS NULL
-                AND r.reading_date < DATE_SUB(NOW(), INTERVAL 2 YEAR)
-                LIMIT %s
-            """, (cutoff_id, batch_size))
+            started = time.perf_counter()
+            cursor.execute(f"""
+                DELETE FROM reading {partition_clause}
+                WHERE reading_id > %s AND reading_id <= %s
+                AND reading_date < %s
+                AND NOT EXISTS (SELECT 1 FROM billing_ids b WHERE b.reading_id = reading.reading_id)
+            """, (window_start, window_end, self.reading_cutoff_date))
+            elapsed = time.perf_counter() - started
             
             deleted_count = cursor.rowcount
             total_deleted += deleted_count
+            window_start = window_end
+            batch_size = self.tune_batch_size('reading', batch_size, elapsed)
             
             if deleted_count == 0:
-                break
+                continue
                 
-            self.db.commit()
+            batches_since_commit += 1
+            if batches_since_commit >= COMMIT_EVERY_BATCHES:
+                self.db.commit()
+                batches_since_commit = 0
             
-            if total_deleted % 100000 == 0:
+            if total_deleted >= next_report:
                 self.logger.info(f"Deleted {total_deleted:,} readings so far")
+                next_report += 100000
                 
-            if deleted_count < batch_size:
-                break
-                
+        if batches_since_commit:
+            self.db.commit()
+            
         self.logger.info(f"Reading deletion completed. Deleted {total_deleted:,} readings")
         return total_deleted
         
-    def run_deletion(self, table_name: Optional[str] = None, dry_run: bool = False):
+    def run_deletion(self, table_name: Optional[str] = None, dry_run: bool = False,
+                     force: bool = False):
         """
         Run the deletion process for specified table or all tables
         """
@@ -414,6 +965,10 @@ class ProductionBatchDeleter:
             
         try:
             self.connect()
+            if table_name in (None, 'contact', 'community'):
+                self.check_polymorphic_indexes(force)
+                if self.bulk_mode:
+                    self.drop_secondary_indexes()
             
             if table_name:
                 self.logger.info(f"Processing single table: {table_name}")
@@ -462,7 +1017,11 @@ class ProductionBatchDeleter:
                 self.db.rollback()
             raise
         finally:
-            self.disconnect()
+            try:
+                if self.dropped_indexes:
+                    self.restore_secondary_indexes()
+            finally:
+                self.disconnect()
 
 def main():
     parser = argparse.ArgumentParser(description='Production NES Database Cleanup - Batch Deleter')
@@ -473,6 +1032,17 @@ def main():
     parser.add_argument('--cutoff-config', required=True, help='Path to cutoff configuration JSON file')
     parser.add_argument('--table', help='Specific table to process (contact, community, reading)')
     parser.add_argument('--dry-run', action='store_true', help='Perform dry run without actual deletion')
+    parser.add_argument('--force', action='store_true',
+                        help='Run even if a polymorphic table has no (object_type_id, object_id) index')
+    parser.add_argument('--bulk-mode', action='store_true',
+                        help='Drop optional secondary indexes of address/phone/note/email for the '
+                             'run and rebuild them at the end (slows other queries on those tables)')
+    parser.add_argument('--multi-table-delete', action='store_true',
+                        help='Delete each contact batch and all its dependencies with one '
+                             'multi-statement of join DELETEs instead of table by table')
+    parser.add_argument('--claim-batches', action='store_true',
+                        help='Claim contact batches with FOR UPDATE SKIP LOCKED (MySQL 8.0+), so several '
+                             'processes can run --table contact/community against the same cutoff')
     
     args = parser.parse_args()
     
@@ -491,10 +1061,18 @@ def main():
         'database': args.database
     }
     
-    deleter = ProductionBatchDeleter(db_config, cutoff_config)
+    if args.bulk_mode and not args.dry_run:
+        confirm = input("Bulk mode drops indexes that other queries may rely on until the run "
+                        "ends. Type 'DROP' to confirm: ")
+        if confirm != 'DROP':
+            logging.error("Bulk mode not confirmed")
+            sys.exit(1)
+    
+    deleter = ProductionBatchDeleter(db_config, cutoff_config, args.claim_batches, args.bulk_mode,
+                                     args.multi_table_delete)
     
     try:
-        deleter.run_deletion(args.table, args.dry_run)
+        deleter.run_deletion(args.table, args.dry_run, args.force)
     except Exception as e:
         logging.error(f"Deletion failed: {e}")
         sys.exit(1)
@@ -1,23 +1,48 @@
 -- Check actual contact types in the database
 -- This will help us identify the correct contact types for communities
 
--- List all contact types
-SELECT 
+SET @contact_cutoff_date := DATE_SUB(NOW(), INTERVAL 7 YEAR);
+
+-- Per-type usage and 7+ year old counts, from a single pass over contact
+-- grouped by the indexed contact_type_id. Every section below reads this
+-- instead of joining and aggregating contact again.
+DROP TEMPORARY TABLE IF EXISTS contact_type_usage;
+CREATE TEMPORARY TABLE contact_type_usage (
+    contact_type_id BIGINT NOT NULL PRIMARY KEY,
+    contact_count BIGINT NOT NULL,
+    old_contacts BIGINT NOT NULL,
+    oldest_update DATETIME NULL,
+    newest_update DATETIME NULL
+);
+
+INSERT INTO contact_type_usage
+SELECT
     contact_type_id,
-    contact_type,
-    COUNT(*) as contact_count
+    COUNT(*),
+    COALESCE(SUM(last_updated_on < @contact_cutoff_date), 0),
+    MIN(CASE WHEN last_updated_on < @contact_cutoff_date THEN last_updated_on END),
+    MAX(CASE WHEN last_updated_on < @contact_cutoff_date THEN last_updated_on END)
+FROM contact
+-- Untyped contacts would form a NULL group the primary key cannot hold
+WHERE contact_type_id IS NOT NULL
+GROUP BY contact_type_id;
+
+-- List all contact types
+SELECT
+    ct.contact_type_id,
+    ct.contact_type,
+    COALESCE(u.contact_count, 0) as contact_count
 FROM contact_type ct
-LEFT JOIN contact c ON ct.contact_type_id = c.contact_type_id
-GROUP BY ct.contact_type_id, ct.contact_type
+LEFT JOIN contact_type_usage u ON ct.contact_type_id = u.contact_type_id
 ORDER BY contact_count DESC;
 
 -- Look for contact types that might indicate closed/inactive communities
-SELECT 
-    contact_type_id,
-    contact_type,
-    COUNT(*) as contact_count
+SELECT
+    ct.contact_type_id,
+    ct.contact_type,
+    COALESCE(u.contact_count, 0) as contact_count
 FROM contact_type ct
-LEFT JOIN contact c ON ct.contact_type_id = c.contact_type_id
+LEFT JOIN contact_type_usage u ON ct.contact_type_id = u.contact_type_id
 WHERE LOWER(ct.contact_type) LIKE '%clos%'
    OR LOWER(ct.contact_type) LIKE '%inact%'
    OR LOWER(ct.contact_type) LIKE '%term%'
@@ -25,33 +50,30 @@ WHERE LOWER(ct.contact_type) LIKE '%clos%'
    OR LOWER(ct.contact_type) LIKE '%zy%'
    OR LOWER(ct.contact_type) LIKE '%dead%'
    OR LOWER(ct.contact_type) LIKE '%cancel%'
-GROUP BY ct.contact_type_id, ct.contact_type
 ORDER BY contact_count DESC;
 
 -- Check if there are any community-specific contact types
-SELECT 
-    contact_type_id,
-    contact_type,
-    COUNT(*) as contact_count
+SELECT
+    ct.contact_type_id,
+    ct.contact_type,
+    COALESCE(u.contact_count, 0) as contact_count
 FROM contact_type ct
-LEFT JOIN contact c ON ct.contact_type_id = c.contact_type_id
+LEFT JOIN contact_type_usage u ON ct.contact_type_id = u.contact_type_id
 WHERE LOWER(ct.contact_type) LIKE '%commun%'
    OR LOWER(ct.contact_type) LIKE '%proper%'
    OR LOWER(ct.contact_type) LIKE '%build%'
    OR LOWER(ct.contact_type) LIKE '%complex%'
-GROUP BY ct.contact_type_id, ct.contact_type
 ORDER BY contact_count DESC;
 
 -- Show contacts with last_updated_on older than 7 years by contact type
-SELECT 
+SELECT
     ct.contact_type,
-    COUNT(*) as old_contacts,
-    MIN(c.last_updated_on) as oldest_update,
-    MAX(c.last_updated_on) as newest_update
-FROM contact c
-JOIN contact_type ct ON c.contact_type_id = ct.contact_type_id
-WHERE c.last_updated_on < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-GROUP BY ct.contact_type_id, ct.contact_type
-HAVING COUNT(*) > 0
-ORDER BY old_contacts DESC;
+    u.old_contacts,
+    u.oldest_update,
+    u.newest_update
+FROM contact_type_usage u
+JOIN contact_type ct ON u.contact_type_id = ct.contact_type_id
+WHERE u.old_contacts > 0
+ORDER BY u.old_contacts DESC;
 
+DROP TEMPORARY TABLE contact_type_usage;
@@ -0,0 +1,116 @@
+-- =============================================================================
+-- SERVER-SIDE CONTACT CASCADE
+-- =============================================================================
+-- Deletes a batch of contacts and every row that depends on them in one CALL,
+-- in the same order as scripts/enhanced_batch_deleter.py:
+--   1. email_attachment, email_preview (via email), note, phone, address
+--   2. email
+--   3. tenant
+--   4. direct foreign keys (bank, subscription, contact_batch,
+--      contact_logical_unit, nes_anet_customer_profile)
+--   5. contact
+--
+-- Used by: enhanced_batch_deleter.py --server-side-cascade
+-- Requires MySQL 8.0+ (JSON_TABLE). The procedure does not commit; the caller
+-- commits once per batch.
+--
+-- Install:  mysql nes < sql/delete-contacts-cascade.sql
+-- Example:  CALL delete_contacts_cascade('[101, 102, 103]', @contact_object_type_id);
+
+DROP PROCEDURE IF EXISTS delete_contacts_cascade;
+
+DELIMITER //
+
+CREATE PROCEDURE delete_contacts_cascade(IN contact_ids_json JSON, IN contact_object_type_id INT)
+BEGIN
+    DECLARE email_attachment_deleted, email_preview_deleted, note_deleted, phone_deleted,
+            address_deleted, email_deleted, tenant_deleted, bank_deleted, subscription_deleted,
+            contact_batch_deleted, contact_logical_unit_deleted,
+            nes_anet_customer_profile_deleted, contact_deleted BIGINT DEFAULT 0;
+
+    -- The batch's ids, unpacked once and joined by every DELETE below
+    DROP TEMPORARY TABLE IF EXISTS cascade_contact_ids;
+    CREATE TEMPORARY TABLE cascade_contact_ids (contact_id BIGINT PRIMARY KEY) ENGINE = MEMORY;
+    INSERT IGNORE INTO cascade_contact_ids (contact_id)
+    SELECT jt.contact_id
+    FROM JSON_TABLE(contact_ids_json, '$[*]' COLUMNS (contact_id BIGINT PATH '$')) jt;
+
+    -- Level 1: leaf tables
+    DELETE ea FROM email_attachment ea
+    JOIN email e ON ea.email_id = e.email_id
+    JOIN cascade_contact_ids c ON e.object_id = c.contact_id
+    WHERE e.object_type_id = contact_object_type_id;
+    SET email_attachment_deleted = ROW_COUNT();
+
+    DELETE ep FROM email_preview ep
+    JOIN email e ON ep.email_id = e.email_id
+    JOIN cascade_contact_ids c ON e.object_id = c.contact_id
+    WHERE e.object_type_id = contact_object_type_id;
+    SET email_preview_deleted = ROW_COUNT();
+
+    DELETE n FROM note n
+    JOIN cascade_contact_ids c ON n.object_id = c.contact_id
+    WHERE n.object_type_id = contact_object_type_id;
+    SET note_deleted = ROW_COUNT();
+
+    DELETE p FROM phone p
+    JOIN cascade_contact_ids c ON p.object_id = c.contact_id
+    WHERE p.object_type_id = contact_object_type_id;
+    SET phone_deleted = ROW_COUNT();
+
+    DELETE a FROM address a
+    JOIN cascade_contact_ids c ON a.object_id = c.contact_id
+    WHERE a.object_type_id = contact_object_type_id;
+    SET address_deleted = ROW_COUNT();
+
+    -- Level 2: email (after its attachments/previews)
+    DELETE e FROM email e
+    JOIN cascade_contact_ids c ON e.object_id = c.contact_id
+    WHERE e.object_type_id = contact_object_type_id;
+    SET email_deleted = ROW_COUNT();
+
+    -- Level 3: tenant
+    DELETE t FROM tenant t
+    JOIN cascade_contact_ids c ON t.object_id = c.contact_id
+    WHERE t.object_type_id = contact_object_type_id;
+    SET tenant_deleted = ROW_COUNT();
+
+    -- Level 4: direct foreign keys
+    DELETE x FROM bank x JOIN cascade_contact_ids c ON x.contact_id = c.contact_id;
+    SET bank_deleted = ROW_COUNT();
+
+    DELETE x FROM subscription x JOIN cascade_contact_ids c ON x.contact_id = c.contact_id;
+    SET subscription_deleted = ROW_COUNT();
+
+    DELETE x FROM contact_batch x JOIN cascade_contact_ids c ON x.contact_id = c.contact_id;
+    SET contact_batch_deleted = ROW_COUNT();
+
+    DELETE x FROM contact_logical_unit x JOIN cascade_contact_ids c ON x.contact_id = c.contact_id;
+    SET contact_logical_unit_deleted = ROW_COUNT();
+
+    DELETE x FROM nes_anet_customer_profile x JOIN cascade_contact_ids c ON x.contact_id = c.contact_id;
+    SET nes_anet_customer_profile_deleted = ROW_COUNT();
+
+    -- Level 5: the contacts themselves
+    DELETE x FROM contact x JOIN cascade_contact_ids c ON x.contact_id = c.contact_id;
+    SET contact_deleted = ROW_COUNT();
+
+    DROP TEMPORARY TABLE cascade_contact_ids;
+
+    -- One row of per-table counts for the caller's summary
+    SELECT email_attachment_deleted AS email_attachment,
+           email_preview_deleted AS email_preview,
+           note_deleted AS note,
+           phone_deleted AS phone,
+           address_deleted AS address,
+           email_deleted AS email,
+           tenant_deleted AS tenant,
+           bank_deleted AS bank,
+           subscription_deleted AS subscription,
+           contact_batch_deleted AS contact_batch,
+           contact_logical_unit_deleted AS contact_logical_unit,
+           nes_anet_customer_profile_deleted AS nes_anet_customer_profile,
+           contact_deleted AS contact;
+END //
+
+DELIMITER ;
@@ -2,103 +2,202 @@
 -- This script identifies the autoincrement ID cutoffs for data deletion
 -- Run in DRY-RUN mode first to validate cutoffs before any deletion
 
+-- Cutoff dates are evaluated once so every query below compares against the
+-- same constant (and can use range access on the date columns)
+SET @reading_cutoff_date := DATE_SUB(NOW(), INTERVAL 2 YEAR);
+SET @account_cutoff_date := DATE_SUB(NOW(), INTERVAL 7 YEAR);
+
+-- Working tables for the account and community passes. A READ ONLY transaction
+-- may write temporary tables but not create or drop them (ERROR 1792), so they
+-- are created here, before it starts, and dropped after the COMMIT.
+DROP TEMPORARY TABLE IF EXISTS recent_active;
+CREATE TEMPORARY TABLE recent_active (
+    contact_id BIGINT NOT NULL PRIMARY KEY
+);
+
+DROP TEMPORARY TABLE IF EXISTS inactive_accounts;
+CREATE TEMPORARY TABLE inactive_accounts (
+    contact_id BIGINT NOT NULL PRIMARY KEY
+);
+
+DROP TEMPORARY TABLE IF EXISTS active_tenant_communities;
+CREATE TEMPORARY TABLE active_tenant_communities (
+    contact_id BIGINT NOT NULL PRIMARY KEY
+);
+
+DROP TEMPORARY TABLE IF EXISTS recent_batch_communities;
+CREATE TEMPORARY TABLE recent_batch_communities (
+    contact_id BIGINT NOT NULL PRIMARY KEY
+);
+
+DROP TEMPORARY TABLE IF EXISTS legal_hold_units;
+CREATE TEMPORARY TABLE legal_hold_units (
+    logical_unit_id BIGINT NOT NULL PRIMARY KEY
+);
+
+DROP TEMPORARY TABLE IF EXISTS inactive_communities;
+CREATE TEMPORARY TABLE inactive_communities (
+    contact_id BIGINT NOT NULL PRIMARY KEY
+);
+
+-- Run every query against one point-in-time snapshot, so the cutoffs, counts
+-- and safety checks agree with each other even while data is being imported.
+START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY;
+
 -- =============================================================================
--- READINGS TABLE CUTOFF (2 years)
+-- INDEX PREFLIGHT
 -- =============================================================================
 
--- Find the highest reading_id for readings older than 2 years
--- These are candidates for deletion if not used for billing
+-- The recent-activity scans below are only cheap when each one can be answered
+-- from a composite index (range seek on type + date, object_id read from the
+-- index, no row lookups). Any row reported MISSING here should be created
+-- before running the rest, e.g.:
+--   CREATE INDEX idx_cleanup_invoice_activity ON invoice (object_type_id, invoice_date, object_id);
+--   CREATE INDEX idx_cleanup_journal_activity ON journal_entry (object_type_id, journal_entry_date, object_id);
+--   CREATE INDEX idx_cleanup_note_activity ON note (object_type_id, last_updated_on, object_id);
+--   CREATE INDEX idx_cleanup_email_activity ON email (object_type_id, email_date, object_id);
+--   CREATE INDEX idx_cleanup_sm_usage_guid ON sm_usage (guid);
+-- The Closed community branch seeks on contact type, then ranges on the date
+-- (contact_id rides along in the InnoDB secondary index, so it is covering):
+--   CREATE INDEX idx_cleanup_contact_type_updated ON contact (contact_type_id, last_updated_on);
+-- and the ZY branch ranges on the name prefix, then filters the date in the index:
+--   CREATE INDEX idx_cleanup_contact_name_updated ON contact (contact_name, last_updated_on);
 SELECT 
-    'READINGS_CUTOFF' as cutoff_type,
-    COALESCE(MAX(reading_id), 0) as cutoff_id,
-    DATE_SUB(NOW(), INTERVAL 2 YEAR) as cutoff_date,
-    COUNT(*) as total_candidates
-FROM reading 
-WHERE date_imported < DATE_SUB(NOW(), INTERVAL 2 YEAR);
+    'INDEX_CHECK' as check_type,
+    required.table_name,
+    required.index_columns,
+    COALESCE(MIN(existing.index_name), 'MISSING') as covering_index
+FROM (
+    SELECT 'invoice' as table_name, 'object_type_id,invoice_date,object_id' as index_columns
+    UNION ALL SELECT 'journal_entry', 'object_type_id,journal_entry_date,object_id'
+    UNION ALL SELECT 'note', 'object_type_id,last_updated_on,object_id'
+    UNION ALL SELECT 'email', 'object_type_id,email_date,object_id'
+    UNION ALL SELECT 'sm_usage', 'guid'
+    UNION ALL SELECT 'contact', 'contact_type_id,last_updated_on'
+    UNION ALL SELECT 'contact', 'contact_name,last_updated_on'
+) required
+LEFT JOIN (
+    SELECT table_name, index_name, 
+           GROUP_CONCAT(LOWER(column_name) ORDER BY seq_in_index) as index_columns
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    GROUP BY table_name, index_name
+) existing ON existing.table_name = required.table_name
+    AND CONCAT(existing.index_columns, ',') LIKE CONCAT(required.index_columns, ',%')
+GROUP BY required.table_name, required.index_columns;
 
--- Validate: Count how many of these are NOT used for billing
+-- =============================================================================
+-- READINGS TABLE CUTOFF (2 years)
+-- =============================================================================
+
+-- Cutoff, candidate/deletable counts and safety check in a single pass over
+-- reading (instead of three separate scans with the same sm_usage anti-join).
+-- The cutoff is the highest reading_id older than 2 years; deletable readings
+-- are those candidates NOT used for billing. The safety check compares the
+-- lowest recent, non-billing reading_id against the cutoff: recent data sits
+-- at or below the cutoff exactly when that ID is <= cutoff_id.
+-- The NOT EXISTS probes need an index on sm_usage(guid).
+-- The results are kept in session variables so the summary below can reuse
+-- them instead of scanning reading a second time.
 SELECT 
-    'READINGS_DELETABLE' as validation_type,
-    COUNT(*) as deletable_count,
-    ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM reading), 2) as percentage_of_total
-FROM reading r
-LEFT JOIN sm_usage su ON r.guid = su.guid
-WHERE r.date_imported < DATE_SUB(NOW(), INTERVAL 2 YEAR)
-AND su.sm_usage_id IS NULL;
-
--- Safety check: Ensure no recent readings would be deleted
+    COUNT(*),
+    COALESCE(MAX(CASE WHEN r.date_imported < @reading_cutoff_date 
+                      THEN r.reading_id END), 0),
+    COALESCE(SUM(r.date_imported < @reading_cutoff_date), 0),
+    COALESCE(SUM(r.date_imported < @reading_cutoff_date 
+                 AND r.non_billing), 0),
+    MIN(CASE WHEN r.date_imported >= @reading_cutoff_date 
+             AND r.non_billing 
+             THEN r.reading_id END)
+INTO @reading_total, @reading_cutoff_id, @reading_candidates, @reading_deletable, @reading_first_recent_id
+FROM (
+    -- Anti-join as NOT EXISTS: stops at the first sm_usage match per guid
+    -- instead of joining every match (which also inflated the counts)
+    SELECT 
+        reading_id,
+        date_imported,
+        NOT EXISTS (SELECT 1 FROM sm_usage su WHERE su.guid = reading.guid) as non_billing
+    FROM reading
+) r;
+
 SELECT 
-    'READINGS_SAFETY_CHECK' as check_type,
-    COUNT(*) as recent_readings_above_cutoff,
+    'READINGS_CUTOFF' as cutoff_type,
+    @reading_cutoff_id as cutoff_id,
+    @reading_cutoff_date as cutoff_date,
+    @reading_candidates as total_candidates,
+    @reading_deletable as deletable_count,
+    ROUND(@reading_deletable * 100.0 / NULLIF(@reading_total, 0), 2) as percentage_of_total,
+    @reading_first_recent_id as first_recent_id,
     CASE 
-        WHEN COUNT(*) = 0 THEN 'SAFE' 
+        WHEN @reading_first_recent_id IS NULL OR @reading_first_recent_id > @reading_cutoff_id THEN 'SAFE' 
         ELSE 'DANGER - RECENT DATA ABOVE CUTOFF' 
-    END as safety_status
-FROM reading r
-LEFT JOIN sm_usage su ON r.guid = su.guid
-WHERE r.reading_id <= (
-    SELECT COALESCE(MAX(reading_id), 0) 
-    FROM reading 
-    WHERE date_imported < DATE_SUB(NOW(), INTERVAL 2 YEAR)
-)
-AND r.date_imported >= DATE_SUB(NOW(), INTERVAL 2 YEAR)
-AND su.sm_usage_id IS NULL;
+    END as safety_status;
 
 -- =============================================================================
 -- ACCOUNT CUTOFF (7 years - Conservative Approach)
 -- =============================================================================
 
+-- Contacts with any activity in the last 7 years, collected with one pass over
+-- each activity table (instead of four correlated lookups per candidate contact)
+
+-- Recent invoices
+INSERT IGNORE INTO recent_active (contact_id)
+SELECT i.object_id FROM invoice i 
+WHERE i.object_type_id = 1 
+AND i.invoice_date >= @account_cutoff_date;
+
+-- Recent journal entries (payments, charges)
+INSERT IGNORE INTO recent_active (contact_id)
+SELECT je.object_id FROM journal_entry je
+WHERE je.object_type_id = 1 
+AND je.journal_entry_date >= @account_cutoff_date;
+
+-- Recent notes
+INSERT IGNORE INTO recent_active (contact_id)
+SELECT n.object_id FROM note n 
+WHERE n.object_type_id = 94 
+AND n.last_updated_on >= @account_cutoff_date;
+
+-- Recent emails
+INSERT IGNORE INTO recent_active (contact_id)
+SELECT e.object_id FROM email e 
+WHERE e.object_type_id = 1 
+AND e.email_date >= @account_cutoff_date;
+
 -- Find accounts that are truly inactive for 7+ years
--- This is a conservative approach that checks multiple activity indicators
+-- This is a conservative approach that checks multiple activity indicators.
+-- The candidate set is materialized once; the cutoff, safety check and summary
+-- below read it instead of re-running the activity filters.
+
+-- Semi-join on tenant (EXISTS, not JOIN + DISTINCT): each contact is read once
+-- and yields at most one row, so there is no per-tenancy fanout to sort away
+INSERT INTO inactive_accounts (contact_id)
+SELECT c.contact_id
+FROM contact c
+-- No recent invoices, journal entries, notes or emails
+LEFT JOIN recent_active ra ON ra.contact_id = c.contact_id
+WHERE 
+    -- Must have a definitive move-out date
+    EXISTS (
+        SELECT 1 FROM tenant t
+        WHERE t.contact_id = c.contact_id
+        AND t.to_date IS NOT NULL 
+        AND t.to_date != '0000-00-00 00:00:00'
+        AND t.to_date < @account_cutoff_date
+    )
+    AND ra.contact_id IS NULL;
+
 SELECT 
     'ACCOUNT_CUTOFF' as cutoff_type,
     COALESCE(MAX(contact_id), 0) as cutoff_id,
-    DATE_SUB(NOW(), INTERVAL 7 YEAR) as cutoff_date,
+    @account_cutoff_date as cutoff_date,
     COUNT(*) as total_candidates
-FROM (
-    SELECT DISTINCT c.contact_id
-    FROM contact c
-    JOIN tenant t ON c.contact_id = t.contact_id
-    WHERE 
-        -- Must have a definitive move-out date
-        t.to_date IS NOT NULL 
-        AND t.to_date != '0000-00-00 00:00:00'
-        AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-        
-        -- No recent invoices
-        AND NOT EXISTS (
-            SELECT 1 FROM invoice i 
-            WHERE i.object_id = c.contact_id 
-            AND i.object_type_id = 1 
-            AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR)
-        )
-        
-        -- No recent journal entries (payments, charges)
-        AND NOT EXISTS (
-            SELECT 1 FROM journal_entry je
-            WHERE je.object_id = c.contact_id 
-            AND je.object_type_id = 1 
-            AND je.journal_entry_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR)
-        )
-        
-        -- No recent notes
-        AND NOT EXISTS (
-            SELECT 1 FROM note n 
-            WHERE n.object_id = c.contact_id 
-            AND n.object_type_id = 94 
-            AND n.last_updated_on >= DATE_SUB(NOW(), INTERVAL 7 YEAR)
-        )
-        
-        -- No recent emails
-        AND NOT EXISTS (
-            SELECT 1 FROM email e 
-            WHERE e.object_id = c.contact_id 
-            AND e.object_type_id = 1 
-            AND e.email_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR)
-        )
-) inactive_accounts;
+FROM inactive_accounts;
 
 -- Validate account cutoff safety
+-- Any recently active contact at or below the cutoff is a problem
+SET @account_cutoff_id := (SELECT COALESCE(MAX(contact_id), 0) FROM inactive_accounts);
+
 SELECT 
     'ACCOUNT_SAFETY_CHECK' as check_type,
     COUNT(*) as accounts_with_recent_activity_above_cutoff,
@@ -106,31 +205,8 @@ SELECT
         WHEN COUNT(*) = 0 THEN 'SAFE' 
         ELSE 'DANGER - RECENT ACTIVITY ABOVE CUTOFF' 
     END as safety_status
-FROM contact c
-WHERE c.contact_id <= (
-    -- Get the cutoff from the previous query
-    SELECT COALESCE(MAX(contact_id), 0)
-    FROM (
-        SELECT DISTINCT c.contact_id
-        FROM contact c
-        JOIN tenant t ON c.contact_id = t.contact_id
-        WHERE 
-            t.to_date IS NOT NULL 
-            AND t.to_date != '0000-00-00 00:00:00'
-            AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-            AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = c.contact_id AND i.object_type_id = 1 AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-            AND NOT EXISTS (SELECT 1 FROM journal_entry je WHERE je.object_id = c.contact_id AND je.object_type_id = 1 AND je.journal_entry_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-            AND NOT EXISTS (SELECT 1 FROM note n WHERE n.object_id = c.contact_id AND n.object_type_id = 94 AND n.last_updated_on >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-            AND NOT EXISTS (SELECT 1 FROM email e WHERE e.object_id = c.contact_id AND e.object_type_id = 1 AND e.email_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-    ) inactive_accounts
-)
-AND (
-    -- Check for any recent activity
-    EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = c.contact_id AND i.object_type_id = 1 AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-    OR EXISTS (SELECT 1 FROM journal_entry je WHERE je.object_id = c.contact_id AND je.object_type_id = 1 AND je.journal_entry_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-    OR EXISTS (SELECT 1 FROM note n WHERE n.object_id = c.contact_id AND n.object_type_id = 94 AND n.last_updated_on >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-    OR EXISTS (SELECT 1 FROM email e WHERE e.object_id = c.contact_id AND e.object_type_id = 1 AND e.email_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-);
+FROM recent_active
+WHERE contact_id <= @account_cutoff_id;
 
 -- =============================================================================
 -- COMMUNITY CUTOFF (7 years - Closed/ZY communities)
@@ -139,48 +215,77 @@ AND (
 -- Find closed communities and ZY communities (performance optimized)
 -- Based on actual contact types: Client, Prospect, Closed
 -- ZY communities are identified by name starting with "ZY"
-SELECT 
-    'COMMUNITY_CUTOFF' as cutoff_type,
-    COALESCE(MAX(contact_id), 0) as cutoff_id,
-    DATE_SUB(NOW(), INTERVAL 7 YEAR) as cutoff_date,
-    COUNT(*) as total_candidates
-FROM contact c
-JOIN contact_type ct ON c.contact_type_id = ct.contact_type_id
-WHERE 
-    -- Communities marked as Closed OR have ZY prefix (indicating they were zy'd)
-    (
-        ct.contact_type = 'Closed'
-        OR LEFT(c.contact_name, 2) = 'ZY'
+-- Materialized once for the cutoff query and the summary.
+
+-- The three exclusions (active tenants, recent batches, legal hold) are each
+-- collected once into a keyed temp table and anti-joined below, instead of
+-- being re-evaluated as a correlated NOT EXISTS for every candidate.
+
+-- Communities with a tenant still active within the last 7 years
+INSERT IGNORE INTO active_tenant_communities (contact_id)
+SELECT t.object_id FROM tenant t
+WHERE t.object_type_id = 49
+AND (t.to_date IS NULL OR t.to_date >= @account_cutoff_date);
+
+-- Communities with a batch created within the last 7 years
+INSERT IGNORE INTO recent_batch_communities (contact_id)
+SELECT cb.contact_id
+FROM contact_batch cb
+JOIN batch b ON cb.batch_id = b.batch_id
+WHERE b.created_date >= @account_cutoff_date;
+
+-- Logical units under legal hold (assuming contact.object_id links to logical_unit_id)
+INSERT IGNORE INTO legal_hold_units (logical_unit_id)
+SELECT clua.logical_unit_id
+FROM community_logical_unit_attribute clua
+JOIN community_logical_unit_attribute_type cluat 
+    ON clua.logical_unit_attribute_type_id = cluat.logical_unit_attribute_type_id
+WHERE cluat.logical_unit_attribute_type = 'Legal Hold'
+AND clua.val_integer = 1;
+
+INSERT INTO inactive_communities (contact_id)
+SELECT c.contact_id
+FROM (
+    -- Communities marked as Closed OR have ZY prefix (indicating they were zy'd),
+    -- and not updated in 7 years. Written as two disjoint branches that can each
+    -- use an index, instead of one OR that forces a scan of contact
+    -- The Closed type id(s) are an uncorrelated lookup on the tiny contact_type
+    -- table (evaluated once), so both branches are single-table plans on contact
+    SELECT c.contact_id
+    FROM contact c
+    WHERE c.contact_type_id IN (
+        SELECT contact_type_id FROM contact_type WHERE contact_type = 'Closed'
     )
+    AND c.last_updated_on < @account_cutoff_date
     
-    -- Community itself hasn't been updated in 7 years
-    AND c.last_updated_on < DATE_SUB(NOW(), INTERVAL 7 YEAR)
+    UNION ALL
     
-    -- No active tenants
-    AND NOT EXISTS (
-        SELECT 1 FROM tenant t 
-        WHERE t.object_id = c.contact_id 
-        AND t.object_type_id = 49 
-        AND (t.to_date IS NULL OR t.to_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-    )
-    
-    -- No recent batches
-    AND NOT EXISTS (
-        SELECT 1 FROM contact_batch cb
-        JOIN batch b ON cb.batch_id = b.batch_id
-        WHERE cb.contact_id = c.contact_id
-        AND b.created_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR)
+    -- Prefix match (not LEFT(contact_name, 2)) so an index on contact(contact_name) applies
+    SELECT c.contact_id
+    FROM contact c
+    WHERE c.contact_name LIKE 'ZY%'
+    AND c.contact_type_id NOT IN (
+        SELECT contact_type_id FROM contact_type WHERE contact_type = 'Closed'
     )
-    
-    -- No legal hold (assuming object_id links to logical_unit_id)
-    AND NOT EXISTS (
-        SELECT 1 FROM community_logical_unit_attribute clua
-        JOIN community_logical_unit_attribute_type cluat 
-            ON clua.logical_unit_attribute_type_id = cluat.logical_unit_attribute_type_id
-        WHERE clua.logical_unit_id = c.object_id
-        AND cluat.logical_unit_attribute_type = 'Legal Hold'
-        AND clua.val_integer = 1
-    );
+    AND c.last_updated_on < @account_cutoff_date
+) candidates
+JOIN contact c ON c.contact_id = candidates.contact_id
+-- No active tenants
+LEFT JOIN active_tenant_communities atc ON atc.contact_id = c.contact_id
+-- No recent batches
+LEFT JOIN recent_batch_communities rbc ON rbc.contact_id = c.contact_id
+-- No legal hold
+LEFT JOIN legal_hold_units lh ON lh.logical_unit_id = c.object_id
+WHERE atc.contact_id IS NULL
+AND rbc.contact_id IS NULL
+AND lh.logical_unit_id IS NULL;
+
+SELECT 
+    'COMMUNITY_CUTOFF' as cutoff_type,
+    COALESCE(MAX(contact_id), 0) as cutoff_id,
+    @account_cutoff_date as cutoff_date,
+    COUNT(*) as total_candidates
+FROM inactive_communities;
 
 -- =============================================================================
 -- SUMMARY REPORT
@@ -191,53 +296,34 @@ SELECT
     'SUMMARY' as report_type,
     'Use these cutoff values for batch deletion' as instructions;
 
--- Reading cutoff summary
+-- Reading cutoff summary (from the reading pass above - no second scan)
 SELECT 
     'reading' as table_name,
-    (SELECT COALESCE(MAX(reading_id), 0) FROM reading WHERE date_imported < DATE_SUB(NOW(), INTERVAL 2 YEAR)) as cutoff_id,
-    (SELECT COUNT(*) FROM reading r LEFT JOIN sm_usage su ON r.guid = su.guid 
-     WHERE r.date_imported < DATE_SUB(NOW(), INTERVAL 2 YEAR) AND su.sm_usage_id IS NULL) as estimated_deletions,
-    ROUND((SELECT COUNT(*) FROM reading r LEFT JOIN sm_usage su ON r.guid = su.guid 
-           WHERE r.date_imported < DATE_SUB(NOW(), INTERVAL 2 YEAR) AND su.sm_usage_id IS NULL) * 100.0 / 
-          (SELECT COUNT(*) FROM reading), 2) as percentage_of_table;
-
--- Account cutoff summary  
+    @reading_cutoff_id as cutoff_id,
+    @reading_deletable as estimated_deletions,
+    ROUND(@reading_deletable * 100.0 / NULLIF(@reading_total, 0), 2) as percentage_of_table;
+
+-- Account cutoff summary
 SELECT 
     'contact_accounts' as table_name,
-    (SELECT COALESCE(MAX(contact_id), 0) FROM (
-        SELECT DISTINCT c.contact_id FROM contact c JOIN tenant t ON c.contact_id = t.contact_id
-        WHERE t.to_date IS NOT NULL AND t.to_date != '0000-00-00 00:00:00' AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-        AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = c.contact_id AND i.object_type_id = 1 AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-        AND NOT EXISTS (SELECT 1 FROM journal_entry je WHERE je.object_id = c.contact_id AND je.object_type_id = 1 AND je.journal_entry_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-        AND NOT EXISTS (SELECT 1 FROM note n WHERE n.object_id = c.contact_id AND n.object_type_id = 94 AND n.last_updated_on >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-        AND NOT EXISTS (SELECT 1 FROM email e WHERE e.object_id = c.contact_id AND e.object_type_id = 1 AND e.email_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-    ) inactive_accounts) as cutoff_id,
-    (SELECT COUNT(*) FROM (
-        SELECT DISTINCT c.contact_id FROM contact c JOIN tenant t ON c.contact_id = t.contact_id
-        WHERE t.to_date IS NOT NULL AND t.to_date != '0000-00-00 00:00:00' AND t.to_date < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-        AND NOT EXISTS (SELECT 1 FROM invoice i WHERE i.object_id = c.contact_id AND i.object_type_id = 1 AND i.invoice_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-        AND NOT EXISTS (SELECT 1 FROM journal_entry je WHERE je.object_id = c.contact_id AND je.object_type_id = 1 AND je.journal_entry_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-        AND NOT EXISTS (SELECT 1 FROM note n WHERE n.object_id = c.contact_id AND n.object_type_id = 94 AND n.last_updated_on >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-        AND NOT EXISTS (SELECT 1 FROM email e WHERE e.object_id = c.contact_id AND e.object_type_id = 1 AND e.email_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-    ) inactive_accounts) as estimated_deletions,
-    'TBD' as percentage_of_table;
+    COALESCE(MAX(contact_id), 0) as cutoff_id,
+    COUNT(*) as estimated_deletions,
+    'TBD' as percentage_of_table
+FROM inactive_accounts;
 
 -- Community cutoff summary
 SELECT 
     'contact_communities' as table_name,
-    (SELECT COALESCE(MAX(contact_id), 0) FROM contact c JOIN contact_type ct ON c.contact_type_id = ct.contact_type_id
-     WHERE (ct.contact_type = 'Closed' OR LEFT(c.contact_name, 2) = 'ZY')
-     AND c.last_updated_on < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-     AND NOT EXISTS (SELECT 1 FROM tenant t WHERE t.object_id = c.contact_id AND t.object_type_id = 49 AND (t.to_date IS NULL OR t.to_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR)))
-     AND NOT EXISTS (SELECT 1 FROM contact_batch cb JOIN batch b ON cb.batch_id = b.batch_id WHERE cb.contact_id = c.contact_id AND b.created_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-     AND NOT EXISTS (SELECT 1 FROM community_logical_unit_attribute clua JOIN community_logical_unit_attribute_type cluat ON clua.logical_unit_attribute_type_id = cluat.logical_unit_attribute_type_id WHERE clua.logical_unit_id = c.object_id AND cluat.logical_unit_attribute_type = 'Legal Hold' AND clua.val_integer = 1)
-    ) as cutoff_id,
-    (SELECT COUNT(*) FROM contact c JOIN contact_type ct ON c.contact_type_id = ct.contact_type_id
-     WHERE (ct.contact_type = 'Closed' OR LEFT(c.contact_name, 2) = 'ZY')
-     AND c.last_updated_on < DATE_SUB(NOW(), INTERVAL 7 YEAR)
-     AND NOT EXISTS (SELECT 1 FROM tenant t WHERE t.object_id = c.contact_id AND t.object_type_id = 49 AND (t.to_date IS NULL OR t.to_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR)))
-     AND NOT EXISTS (SELECT 1 FROM contact_batch cb JOIN batch b ON cb.batch_id = b.batch_id WHERE cb.contact_id = c.contact_id AND b.created_date >= DATE_SUB(NOW(), INTERVAL 7 YEAR))
-     AND NOT EXISTS (SELECT 1 FROM community_logical_unit_attribute clua JOIN community_logical_unit_attribute_type cluat ON clua.logical_unit_attribute_type_id = cluat.logical_unit_attribute_type_id WHERE clua.logical_unit_id = c.object_id AND cluat.logical_unit_attribute_type = 'Legal Hold' AND clua.val_integer = 1)
-    ) as estimated_deletions,
-    'TBD' as percentage_of_table;
+    COALESCE(MAX(contact_id), 0) as cutoff_id,
+    COUNT(*) as estimated_deletions,
+    'TBD' as percentage_of_table
+FROM inactive_communities;
+
+COMMIT;
 
+DROP TEMPORARY TABLE IF EXISTS recent_active;
+DROP TEMPORARY TABLE IF EXISTS inactive_accounts;
+DROP TEMPORARY TABLE IF EXISTS inactive_communities;
+DROP TEMPORARY TABLE IF EXISTS active_tenant_communities;
+DROP TEMPORARY TABLE IF EXISTS recent_batch_communities;
+DROP TEMPORARY TABLE IF EXISTS legal_hold_units;
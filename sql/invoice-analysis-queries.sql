@@ -179,34 +179,33 @@ ORDER BY year DESC;
 -- =============================================================================
 
 -- 11. Estimate storage savings for different retention policies
--- Calculate potential space savings based on record distribution
+-- Calculate potential space savings based on record distribution.
+-- invoice_detail is scanned once for every policy's count, and the average
+-- record size is read from information_schema once, not once per policy.
+SELECT 
+    COUNT(*),
+    COALESCE(SUM(COALESCE(created_date, updated_date, invoice_date) < DATE_SUB(NOW(), INTERVAL 3 YEAR)), 0),
+    COALESCE(SUM(COALESCE(created_date, updated_date, invoice_date) < DATE_SUB(NOW(), INTERVAL 5 YEAR)), 0),
+    COALESCE(SUM(COALESCE(created_date, updated_date, invoice_date) < DATE_SUB(NOW(), INTERVAL 7 YEAR)), 0)
+INTO @total_records, @deletable_3y, @deletable_5y, @deletable_7y
+FROM invoice_detail;
+
+SELECT (data_length + index_length) / table_rows / 1024
+INTO @avg_record_size_kb
+FROM information_schema.tables 
+WHERE table_schema = 'nes' AND table_name = 'invoice_detail';
+
 SELECT 
     retention_policy,
     deletable_records,
-    ROUND(deletable_records * 100.0 / total_records, 2) as percentage_deletable,
-    ROUND(deletable_records * avg_record_size_kb / 1024, 2) as estimated_savings_mb
+    ROUND(deletable_records * 100.0 / @total_records, 2) as percentage_deletable,
+    ROUND(deletable_records * @avg_record_size_kb / 1024, 2) as estimated_savings_mb
 FROM (
-    SELECT 
-        '3 year retention' as retention_policy,
-        (SELECT COUNT(*) FROM invoice_detail WHERE COALESCE(created_date, updated_date, invoice_date) < DATE_SUB(NOW(), INTERVAL 3 YEAR)) as deletable_records,
-        (SELECT COUNT(*) FROM invoice_detail) as total_records,
-        (SELECT (data_length + index_length) / table_rows / 1024 FROM information_schema.tables WHERE table_schema = 'nes' AND table_name = 'invoice_detail') as avg_record_size_kb
-    
+    SELECT '3 year retention' as retention_policy, @deletable_3y as deletable_records
     UNION ALL
-    
-    SELECT 
-        '5 year retention' as retention_policy,
-        (SELECT COUNT(*) FROM invoice_detail WHERE COALESCE(created_date, updated_date, invoice_date) < DATE_SUB(NOW(), INTERVAL 5 YEAR)) as deletable_records,
-        (SELECT COUNT(*) FROM invoice_detail) as total_records,
-        (SELECT (data_length + index_length) / table_rows / 1024 FROM information_schema.tables WHERE table_schema = 'nes' AND table_name = 'invoice_detail') as avg_record_size_kb
-    
+    SELECT '5 year retention', @deletable_5y
     UNION ALL
-    
-    SELECT 
-        '7 year retention' as retention_policy,
-        (SELECT COUNT(*) FROM invoice_detail WHERE COALESCE(created_date, updated_date, invoice_date) < DATE_SUB(NOW(), INTERVAL 7 YEAR)) as deletable_records,
-        (SELECT COUNT(*) FROM invoice_detail) as total_records,
-        (SELECT (data_length + index_length) / table_rows / 1024 FROM information_schema.tables WHERE table_schema = 'nes' AND table_name = 'invoice_detail') as avg_record_size_kb
+    SELECT '7 year retention', @deletable_7y
 ) as analysis;
 
 -- =============================================================================
@@ -0,0 +1,86 @@
+"""Checks on batch_deleter.py's partition truncation"""
+
+import os
+import sys
+import threading
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from batch_deleter import BatchDeleter
+
+# Partitions p0..p2 cover reading_id 0-99, 100-199 and 200-299, 10 rows each
+PARTITIONS = [('p0', 100), ('p1', 200), ('p2', 300)]
+
+
+class FakeCursor:
+    """Answers the keep-row probe with no rows and every partition COUNT(*) with 10"""
+    def __init__(self, executed):
+        self.executed = executed
+
+    def execute(self, sql, params=None):
+        self.executed.append(' '.join(sql.split()))
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return (10,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self.executed)
+
+    def commit(self):
+        pass
+
+
+def make_deleter(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # setup_logging() opens batch_deletion.log in the cwd
+    deleter = BatchDeleter({}, {}, stop_event=threading.Event())
+    deleter.db = FakeConnection()
+    monkeypatch.setattr(deleter, 'get_reading_partitions', lambda: PARTITIONS)
+    monkeypatch.setattr(deleter, 'log_batch_deletion', lambda *args: None)
+    return deleter
+
+
+def truncated(deleter):
+    return [sql.split()[-1] for sql in deleter.db.executed if 'TRUNCATE PARTITION' in sql]
+
+
+def test_fresh_run_truncates_from_first_partition(monkeypatch, tmp_path):
+    deleter = make_deleter(monkeypatch, tmp_path)
+    deleted = deleter.truncate_reading_partitions(1, 299, datetime(2020, 1, 1), dry_run=False)
+    assert truncated(deleter) == ['p0', 'p1', 'p2']
+    assert deleted == 30
+
+
+def test_resumed_run_skips_processed_partitions(monkeypatch, tmp_path):
+    # Last logged batch ended at 99, the end of p0
+    deleter = make_deleter(monkeypatch, tmp_path)
+    deleted = deleter.truncate_reading_partitions(100, 299, datetime(2020, 1, 1), dry_run=False)
+    assert truncated(deleter) == ['p1', 'p2']
+    assert deleted == 20
+
+
+def test_resumed_run_stops_at_partly_processed_partition(monkeypatch, tmp_path):
+    # Last logged batch ended at 149, inside p1
+    deleter = make_deleter(monkeypatch, tmp_path)
+    deleted = deleter.truncate_reading_partitions(150, 299, datetime(2020, 1, 1), dry_run=False)
+    assert truncated(deleter) == []
+    assert deleted == 0
+
+
+def test_keep_row_probe_keeps_undated_readings(monkeypatch, tmp_path):
+    # READING_DELETE_SQL never deletes a NULL date_imported, so neither may TRUNCATE
+    deleter = make_deleter(monkeypatch, tmp_path)
+    deleter.truncate_reading_partitions(1, 299, datetime(2020, 1, 1), dry_run=True)
+    probes = [sql for sql in deleter.db.executed if 'LIMIT 1' in sql]
+    assert probes and all('r.date_imported IS NULL' in sql for sql in probes)
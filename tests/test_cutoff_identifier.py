@@ -0,0 +1,49 @@
+"""Checks on the SQL cutoff_identifier.py sends through prepared cursors and its report cache"""
+
+import os
+import re
+import sys
+
+from mysql.connector.cursor import RE_SQL_FIND_PARAM
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import cutoff_identifier
+from cutoff_identifier import CutoffIdentifier
+
+
+def prepared_queries():
+    """Every (name, sql, params) identify_reading_cutoff/identify_contact_cutoff prepare"""
+    identifier = CutoffIdentifier({})
+    return [
+        ('reading_count', *identifier.reading_count_query()),
+        ('reading_date_probe', *identifier.reading_date_probe_query()),
+        ('reading_probe', *identifier.reading_probe_query(1)),
+        ('contact_scan', *identifier.contact_scan_query([3, 7])),
+        ('contact_scan_no_closed_types', *identifier.contact_scan_query([])),
+        ('closed_cutoff', *identifier.closed_cutoff_query([3, 7])),
+        ('zy_cutoff', *identifier.zy_cutoff_query()),
+        ('contact_safety', *identifier.contact_safety_query(1)),
+    ]
+
+
+def test_prepared_queries_convert_every_placeholder():
+    for name, sql, params in prepared_queries():
+        # The same %s -> ? rewrite MySQLCursorPrepared.execute applies
+        converted = re.sub(RE_SQL_FIND_PARAM, b"?", sql.encode())
+        assert b"%s" not in converted, name
+        assert converted.count(b"?") == len(params), name
+
+
+def test_report_cache_is_keyed_on_id_ranges(monkeypatch, tmp_path):
+    monkeypatch.setattr(cutoff_identifier, 'REPORT_CACHE_DIR', str(tmp_path))
+    identifier = CutoffIdentifier({})
+    id_ranges = {'reading': [1, 5000], 'contact': [10, 900]}
+    identifier.store_cached_report({'generated_at': identifier.run_started.isoformat(),
+                                    'id_ranges': id_ranges})
+
+    assert identifier.load_cached_report(id_ranges)['id_ranges'] == id_ranges
+    # A new import (MAX) or a cleanup run (MIN) invalidates it
+    assert identifier.load_cached_report({'reading': [1, 5001], 'contact': [10, 900]}) is None
+    assert identifier.load_cached_report({'reading': [1, 5000], 'contact': [11, 900]}) is None
+    assert identifier.load_cached_report(None) is None
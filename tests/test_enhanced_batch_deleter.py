@@ -0,0 +1,48 @@
+"""Checks on enhanced_batch_deleter.py's direct FK multi-statement"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from enhanced_batch_deleter import EnhancedBatchDeleter
+
+
+class FakeMultiStatementCursor:
+    """Reports one rowcount per ;-separated statement, advanced by nextset()"""
+    def __init__(self):
+        self.calls = []
+        self.rowcounts = []
+
+    def execute(self, sql, params=None):
+        self.calls.append((sql, params))
+        statement_count = len(sql.split(';'))
+        self.rowcounts = list(range(1, statement_count + 1))
+        self.rowcount = self.rowcounts.pop(0)
+
+    def nextset(self):
+        if not self.rowcounts:
+            return None
+        self.rowcount = self.rowcounts.pop(0)
+        return True
+
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+
+def test_direct_dependencies_walk_every_result(monkeypatch):
+    monkeypatch.setattr(EnhancedBatchDeleter, 'setup_signal_handlers', lambda self: None)
+    deleter = EnhancedBatchDeleter({}, {})
+    cursor = FakeMultiStatementCursor()
+    deleter._local.session = (FakeConnection(), cursor, {})
+
+    totals = deleter.delete_direct_dependencies(['bank', 'subscription', 'tenant'], [5, 6])
+
+    # One positional (sql, params) execute per IN-list chunk, no extra keywords
+    assert len(cursor.calls) == 1
+    sql, params = cursor.calls[0]
+    assert sql.count('DELETE FROM') == 3
+    assert params == [5, 6] * 3
+    assert totals == [1, 2, 3]
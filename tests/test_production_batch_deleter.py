@@ -0,0 +1,98 @@
+"""Checks on production_batch_deleter.py's bulk-mode index handling and multi-statements"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from production_batch_deleter import (DIRECT_DEPENDENCY_TABLES, ProductionBatchDeleter,
+                                      secondary_index_definitions)
+
+CREATE_PHONE = """CREATE TABLE `phone` (
+  `phone_id` int NOT NULL AUTO_INCREMENT,
+  `object_type_id` int NOT NULL,
+  `object_id` int NOT NULL,
+  `number` varchar(32) DEFAULT NULL,
+  `created_on` datetime DEFAULT NULL,
+  PRIMARY KEY (`phone_id`),
+  UNIQUE KEY `uq_phone_number` (`number`),
+  KEY `idx_phone_object` (`object_type_id`,`object_id`),
+  KEY `idx_phone_number_prefix` (`number`(8)),
+  KEY `idx_phone_created_desc` (`created_on` DESC) /*!80000 INVISIBLE */,
+  KEY `idx_phone_lower_number` ((lower(`number`))) COMMENT 'search',
+  KEY `idx ``odd`` name` (`created_on`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8"""
+
+
+def test_secondary_index_definitions_are_exact():
+    definitions = secondary_index_definitions(CREATE_PHONE)
+    assert definitions == {
+        'idx_phone_object': "KEY `idx_phone_object` (`object_type_id`,`object_id`)",
+        'idx_phone_number_prefix': "KEY `idx_phone_number_prefix` (`number`(8))",
+        'idx_phone_created_desc': "KEY `idx_phone_created_desc` (`created_on` DESC) /*!80000 INVISIBLE */",
+        'idx_phone_lower_number': "KEY `idx_phone_lower_number` ((lower(`number`))) COMMENT 'search'",
+        'idx `odd` name': "KEY `idx ``odd`` name` (`created_on`)",
+    }
+
+
+class FakeMultiStatementCursor:
+    """Reports one rowcount per ;-separated statement, advanced by nextset()"""
+    def __init__(self, calls):
+        self.calls = calls
+        self.rowcounts = []
+
+    def execute(self, sql, params=None):
+        self.calls.append((sql, params))
+        self.rowcounts = list(range(1, len(sql.split(';')) + 1))
+        self.rowcount = self.rowcounts.pop(0)
+
+    def nextset(self):
+        if not self.rowcounts:
+            return None
+        self.rowcount = self.rowcounts.pop(0)
+        return True
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.calls = []
+
+    def cursor(self, **kwargs):
+        return FakeMultiStatementCursor(self.calls)
+
+    def rollback(self):
+        pass
+
+
+def make_deleter(monkeypatch):
+    monkeypatch.setattr(ProductionBatchDeleter, 'setup_signal_handlers', lambda self: None)
+    deleter = ProductionBatchDeleter({}, {})
+    deleter.db = FakeConnection()
+    return deleter
+
+
+def test_direct_dependencies_walk_every_result(monkeypatch):
+    deleter = make_deleter(monkeypatch)
+    deleted = deleter.delete_direct_dependencies([5, 6])
+
+    # One positional (sql, params) execute per IN-list chunk, no extra keywords
+    assert len(deleter.db.calls) == 1
+    sql, params = deleter.db.calls[0]
+    assert params == [5, 6] * len(DIRECT_DEPENDENCY_TABLES)
+    assert deleted == {table: i + 1 for i, table in enumerate(DIRECT_DEPENDENCY_TABLES)}
+
+
+def test_cascade_walks_every_result(monkeypatch):
+    deleter = make_deleter(monkeypatch)
+    monkeypatch.setattr(deleter, 'stage_ids', lambda ids: None)
+    deleted = deleter.delete_contact_batch_cascade({1: [5], 49: [6]}, [5, 6])
+
+    assert len(deleter.db.calls) == 1
+    sql, params = deleter.db.calls[0]
+    assert params == [1, 49] * 3 + [1]  # email skips communities only
+    assert list(deleted) == ['address', 'phone', 'note', 'email',
+                             *DIRECT_DEPENDENCY_TABLES, 'contact']
+    assert deleted['contact'] == len(deleted)